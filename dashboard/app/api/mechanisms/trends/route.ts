@@ -0,0 +1,93 @@
+/**
+ * GET /api/mechanisms/trends
+ *
+ * 메커니즘/Actor 트렌드 조회 API (mechanism_daily_stats 일별 버킷 병합)
+ */
+
+import { createClient } from '@supabase/supabase-js'
+import { NextRequest, NextResponse } from 'next/server'
+
+function getSupabaseClient() {
+  const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || process.env.SUPABASE_URL
+  const supabaseKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY || process.env.SUPABASE_ANON_KEY
+  if (!supabaseUrl || !supabaseKey) {
+    throw new Error('Supabase URL and ANON_KEY are required')
+  }
+  return createClient(supabaseUrl, supabaseKey)
+}
+
+export const dynamic = 'force-dynamic'
+
+export async function GET(request: NextRequest) {
+  const supabase = getSupabaseClient()
+  try {
+    const { searchParams } = request.nextUrl
+
+    // Query parameters
+    const parsedDays = parseInt(searchParams.get('days') || '30')
+    const days = Math.min(Number.isNaN(parsedDays) || parsedDays < 1 ? 30 : parsedDays, 365)
+
+    const start = new Date()
+    start.setUTCDate(start.getUTCDate() - (days - 1))
+
+    const { data, error } = await supabase
+      .from('mechanism_daily_stats')
+      .select('stat_date, perception_count, mechanism_counts, cooccurrence, actor_heavy_hitters')
+      .gte('stat_date', start.toISOString().slice(0, 10))
+      .order('stat_date', { ascending: true })
+
+    if (error) {
+      console.error('Supabase error:', error)
+      return NextResponse.json(
+        { error: 'Failed to fetch mechanism trends' },
+        { status: 500 }
+      )
+    }
+
+    // Merge daily buckets into window totals
+    const mechanismTotals: Record<string, number> = {}
+    const pairTotals: Record<string, number> = {}
+    const actorTotals: Record<string, number> = {}
+    let perceptionCount = 0
+
+    for (const row of data || []) {
+      perceptionCount += row.perception_count
+      for (const [mech, count] of Object.entries(row.mechanism_counts || {})) {
+        mechanismTotals[mech] = (mechanismTotals[mech] || 0) + (count as number)
+      }
+      for (const [pair, count] of Object.entries(row.cooccurrence || {})) {
+        pairTotals[pair] = (pairTotals[pair] || 0) + (count as number)
+      }
+      // Space-Saving counters: { actor: [count, error] }
+      for (const [actor, counter] of Object.entries(row.actor_heavy_hitters?.counters || {})) {
+        actorTotals[actor] = (actorTotals[actor] || 0) + (counter as number[])[0]
+      }
+    }
+
+    const sortDesc = (obj: Record<string, number>) =>
+      Object.entries(obj).sort((a, b) => b[1] - a[1])
+
+    return NextResponse.json({
+      days,
+      perception_count: perceptionCount,
+      daily: (data || []).map(row => ({
+        date: row.stat_date,
+        perception_count: row.perception_count,
+        mechanism_counts: row.mechanism_counts
+      })),
+      mechanism_counts: sortDesc(mechanismTotals).map(([mechanism, count]) => ({ mechanism, count })),
+      cooccurrence: sortDesc(pairTotals).map(([pair, count]) => {
+        const [mechanism_a, mechanism_b] = pair.split('|')
+        return { mechanism_a, mechanism_b, count }
+      }),
+      top_actors: sortDesc(actorTotals).slice(0, 20).map(([actor, count]) => ({ actor, count }))
+    })
+
+  } catch (error) {
+    console.error('API error:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
@@ -190,7 +190,8 @@ export default function WorldviewDetailPage() {
     )
   }
 
-  const frame: ParsedFrame = JSON.parse(worldview.frame)
+  // frame is jsonb (object); legacy rows may still be a JSON string
+  const frame: ParsedFrame = typeof worldview.frame === 'string' ? JSON.parse(worldview.frame) : (worldview.frame || {})
   const layeredPerceptions: LayeredPerception[] = worldview.layered_perceptions || []
   const contents: Content[] = worldview.contents || []
 
@@ -0,0 +1,310 @@
+"""
+ContentTriage - LLM 추출 전 로컬 triage
+
+수집된 모든 글이 Claude로 가지만 한 줄짜리 이미지 글, _fast_filter_claim이 주장을 전부 버리는 글은
+빈 perception만 남김 → 추출 전에 점수를 매겨 명백히 신호 없는 글은 빈 perception으로 바로 저장
+
+1. Heuristics (모델 없이도 동작): 본문/제목이 거의 없는 글, 자모/웃음만 있는 글
+2. Model (선택): scikit-learn pipeline (문자 n-gram hashing + 구조 특징 → LogisticRegression)
+   - 학습: scripts/train_triage_model.py (과거 perception이 비었는지 = 라벨)
+   - threshold는 학습 시 signal recall 기준으로 보정 (기본 98%: 신호 있는 글은 2% 이하만 건너뜀)
+   - CONTENT_TRIAGE_MODEL 경로에 파일이 없으면 heuristics만 사용
+
+Usage:
+    triage = ContentTriage()
+    to_extract, skipped = triage.split(contents)
+    perception = triage.empty_perception(skipped[0])
+"""
+
+import os
+import re
+import joblib
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import FeatureUnion, Pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
+from engines.utils.near_duplicate import normalize_body
+from engines.utils.supabase_client import get_supabase
+
+DEFAULT_MODEL_PATH = os.getenv('CONTENT_TRIAGE_MODEL', 'models/content_triage.joblib')
+
+# 특징은 본문 앞부분만 본다 (학습된 모델과 호환되도록 고정)
+MAX_BODY_CHARS = 2000
+
+# 정규화 후 제목+본문이 이보다 짧으면 모델 없이 건너뜀
+MIN_TEXT_CHARS = 12
+
+_JAMO = re.compile(r'[ㄱ-ㅎㅏ-ㅣ]')
+_HANGUL = re.compile(r'[가-힣]')
+_URL = re.compile(r'https?://\S+|www\.\S+')
+
+STRUCTURE_FEATURES = [
+    'log_body_chars', 'log_title_chars', 'lines', 'sentences',
+    'hangul_ratio', 'jamo_ratio', 'digit_ratio', 'urls', 'questions'
+]
+
+
+def content_text(content: Dict) -> str:
+    """Title + body as the extractor sees them"""
+    return f"{content.get('title') or ''}\n{(content.get('body') or '')[:MAX_BODY_CHARS]}"
+
+
+def structure_features(content: Dict) -> List[float]:
+    """Body length / structure features (STRUCTURE_FEATURES 순서)"""
+    title = content.get('title') or ''
+    raw = (content.get('body') or '')[:MAX_BODY_CHARS]
+    body = normalize_body(raw)
+    chars = max(len(body.replace(' ', '')), 1)
+
+    return [
+        float(np.log1p(len(body))),
+        float(np.log1p(len(normalize_body(title)))),
+        float(len([line for line in raw.splitlines() if line.strip()])),
+        float(len(re.findall(r'[.!?。]|다\s', raw))),
+        len(_HANGUL.findall(body)) / chars,
+        len(_JAMO.findall(body)) / chars,
+        sum(ch.isdigit() for ch in body) / chars,
+        float(len(_URL.findall(raw))),
+        float(raw.count('?'))
+    ]
+
+
+def heuristic_reason(content: Dict) -> Optional[str]:
+    """
+    Obvious no-signal posts (모델 없이 판정)
+
+    Returns:
+        건너뛸 이유 또는 None
+    """
+    title = normalize_body(content.get('title') or '')
+    body = normalize_body(content.get('body') or '')
+    text = f"{title} {body}".strip()
+
+    if len(text.replace(' ', '')) < MIN_TEXT_CHARS:
+        return 'too_short'
+
+    letters = len(_HANGUL.findall(text)) + len(re.findall(r'[a-z]', text))
+
+    # ㅋㅋㅋ / ㅎㅎ / ㅇㅇ 위주의 글 (완성형 글자가 거의 없음)
+    if len(_JAMO.findall(text)) > 2 * letters:
+        return 'jamo_only'
+
+    if letters == 0:
+        return 'no_text'
+
+    return None
+
+
+def _texts(contents: List[Dict]) -> List[str]:
+    return [content_text(c) for c in contents]
+
+
+def _structure(contents: List[Dict]) -> np.ndarray:
+    return np.array([structure_features(c) for c in contents], dtype=np.float64)
+
+
+def build_pipeline(n_features: int = 2 ** 18, random_state: int = 42) -> Pipeline:
+    """Character n-gram hashing + structure features → logistic regression (joblib로 저장 가능)"""
+    return Pipeline([
+        ('features', FeatureUnion([
+            ('text', Pipeline([
+                ('select', FunctionTransformer(_texts)),
+                ('hash', HashingVectorizer(
+                    analyzer='char_wb', ngram_range=(2, 4), n_features=n_features,
+                    alternate_sign=False, norm='l2'
+                ))
+            ])),
+            ('structure', Pipeline([
+                ('select', FunctionTransformer(_structure)),
+                ('scale', StandardScaler())
+            ]))
+        ])),
+        ('classifier', LogisticRegression(C=1.0, class_weight='balanced', max_iter=1000, random_state=random_state))
+    ])
+
+
+def has_signal(perception: Dict) -> bool:
+    """Label: perception kept at least one explicit claim or deep belief"""
+    return bool(perception.get('explicit_claims') or perception.get('deep_beliefs'))
+
+
+def load_training_data(supabase=None, limit: Optional[int] = None, page_size: int = 1000) -> Tuple[List[Dict], np.ndarray]:
+    """
+    Historical contents labeled by whether extraction produced a perception
+
+    중복 복사본(copied_from)과 triage로 건너뛴 perception은 라벨이 LLM 결과가 아니므로 제외
+
+    Returns:
+        (contents [{'id', 'title', 'body'}], labels (1 = signal))
+    """
+    supabase = supabase or get_supabase()
+
+    perceptions = {}
+    offset = 0
+    while True:
+        rows = supabase.table('layered_perceptions')\
+            .select('content_id, explicit_claims, deep_beliefs, copied_from, filter_stats')\
+            .order('id')\
+            .range(offset, offset + page_size - 1)\
+            .execute().data or []
+
+        for row in rows:
+            if row.get('copied_from') or (row.get('filter_stats') or {}).get('triage'):
+                continue
+            perceptions[row['content_id']] = has_signal(row)
+
+        if len(rows) < page_size:
+            break
+        offset += page_size
+
+    contents = []
+    ids = list(perceptions)
+    if limit:
+        ids = ids[:limit]
+
+    for i in range(0, len(ids), 200):
+        result = supabase.table('contents').select('id, title, body').in_('id', ids[i:i+200]).execute()
+        contents.extend(result.data or [])
+
+    labels = np.array([int(perceptions[c['id']]) for c in contents], dtype=np.int64)
+    return contents, labels
+
+
+def recall_threshold(scores: np.ndarray, labels: np.ndarray, min_signal_recall: float) -> float:
+    """Highest threshold that still sends min_signal_recall of signal posts to extraction"""
+    signal = np.sort(scores[labels == 1])
+    if len(signal) == 0:
+        return 0.0
+    index = int(np.floor((1 - min_signal_recall) * len(signal)))
+    return float(signal[min(index, len(signal) - 1)])
+
+
+def train(
+    contents: List[Dict],
+    labels: np.ndarray,
+    min_signal_recall: float = 0.98,
+    test_size: float = 0.2,
+    random_state: int = 42
+) -> Tuple[Dict, Dict]:
+    """
+    Train the triage model and calibrate its threshold on a held-out split
+
+    Heuristics가 이미 건너뛰는 글은 학습에서 제외 (모델은 나머지 글만 판정)
+
+    Returns:
+        (bundle {'pipeline', 'threshold', 'metrics', 'trained_at'}, metrics)
+    """
+    keep = [i for i, c in enumerate(contents) if heuristic_reason(c) is None]
+    contents = [contents[i] for i in keep]
+    labels = labels[keep]
+
+    if len(set(labels.tolist())) < 2:
+        raise ValueError("Training data needs both signal and no-signal posts")
+
+    train_x, test_x, train_y, test_y = train_test_split(
+        contents, labels, test_size=test_size, stratify=labels, random_state=random_state
+    )
+
+    pipeline = build_pipeline(random_state=random_state)
+    pipeline.fit(train_x, train_y)
+
+    scores = pipeline.predict_proba(test_x)[:, 1]
+    threshold = recall_threshold(scores, test_y, min_signal_recall)
+    skipped = scores < threshold
+
+    metrics = {
+        'samples': len(contents),
+        'signal_rate': float(labels.mean()),
+        'roc_auc': float(roc_auc_score(test_y, scores)),
+        'threshold': threshold,
+        'skip_rate': float(skipped.mean()),
+        'signal_recall': float(1 - skipped[test_y == 1].mean()) if (test_y == 1).any() else 1.0,
+        'no_signal_caught': float(skipped[test_y == 0].mean()) if (test_y == 0).any() else 0.0
+    }
+
+    # 보정한 threshold로 전체 데이터 재학습
+    pipeline = build_pipeline(random_state=random_state)
+    pipeline.fit(contents, labels)
+
+    bundle = {
+        'pipeline': pipeline,
+        'threshold': threshold,
+        'metrics': metrics,
+        'trained_at': datetime.now(timezone.utc).isoformat()
+    }
+    return bundle, metrics
+
+
+class ContentTriage:
+    """Score posts before LLM extraction and route no-signal posts to an empty perception"""
+
+    def __init__(self, model_path: Optional[str] = DEFAULT_MODEL_PATH, threshold: Optional[float] = None):
+        """
+        Args:
+            model_path: joblib bundle (train_triage_model.py), 없으면 heuristics만 사용
+            threshold: 모델 점수 threshold (None이면 학습 시 보정한 값)
+        """
+        self.bundle = None
+        if model_path and os.path.exists(model_path):
+            self.bundle = joblib.load(model_path)
+
+        self.threshold = threshold
+        if threshold is None and self.bundle:
+            self.threshold = self.bundle['threshold']
+
+    @property
+    def has_model(self) -> bool:
+        return self.bundle is not None
+
+    def score(self, contents: List[Dict]) -> np.ndarray:
+        """
+        Probability that extraction produces a non-empty perception
+
+        Returns:
+            (n,) float, 모델이 없으면 1.0 (heuristics로만 판정)
+        """
+        if not contents or self.bundle is None:
+            return np.ones(len(contents))
+        return self.bundle['pipeline'].predict_proba(contents)[:, 1]
+
+    def split(self, contents: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Route contents: (LLM으로 보낼 글, 건너뛸 글)
+
+        건너뛸 글에는 '_triage': {'reason', 'score'}가 붙음 (empty_perception에서 사용)
+        """
+        to_extract, skipped, candidates = [], [], []
+
+        for content in contents:
+            reason = heuristic_reason(content)
+            if reason:
+                skipped.append({**content, '_triage': {'reason': reason, 'score': 0.0}})
+            else:
+                candidates.append(content)
+
+        scores = self.score(candidates)
+        for content, score in zip(candidates, scores):
+            if self.has_model and score < self.threshold:
+                skipped.append({**content, '_triage': {'reason': 'model', 'score': round(float(score), 4)}})
+            else:
+                to_extract.append(content)
+
+        return to_extract, skipped
+
+    @staticmethod
+    def empty_perception(content: Dict) -> Dict:
+        """Empty perception for a skipped post (LayeredPerceptionExtractorV2가 주장을 전부 거른 경우와 같은 형태)"""
+        return {
+            'content_id': content['id'],
+            'explicit_claims': [],
+            'implicit_assumptions': [],
+            'reasoning_gaps': [],
+            'deep_beliefs': [],
+            'worldview_hints': '',
+            'filter_stats': {'total': 0, 'kept': 0, 'filtered': 0, 'triage': content.get('_triage')}
+        }
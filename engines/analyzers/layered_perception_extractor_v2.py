@@ -16,6 +16,8 @@ import asyncio
 from typing import Dict, List, Tuple
 from uuid import UUID
 from engines.utils.supabase_client import get_supabase
+from engines.utils.claim_filter import filter_claim, split_claims
+from engines.utils.prompt_body import prepare_content
 
 client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
 
@@ -27,80 +29,8 @@ class LayeredPerceptionExtractorV2:
         self.supabase = get_supabase()
 
     def _fast_filter_claim(self, claim_text: str) -> Tuple[bool, str]:
-        """Filter low-quality explicit claims"""
-        # Handle both string and dict formats
-        if isinstance(claim_text, dict):
-            text = claim_text.get('predicate', '')
-            if not text and 'subject' in claim_text:
-                text = f"{claim_text.get('subject', '')} {claim_text.get('predicate', '')}"
-        else:
-            text = claim_text
-
-        text_clean = str(text).strip()
-
-        # 1. 길이 체크
-        if len(text_clean) < 10:
-            return (False, "길이 < 10")
-
-        # 2. 지시대명사로 시작
-        pronouns_start = [
-            '이는 ', '이는,', '이것은 ', '이것이 ', '그것은 ', '그것이 ',
-            '여기는 ', '거기는 ', '저기는 '
-        ]
-        for p in pronouns_start:
-            if text_clean.startswith(p):
-                return (False, "지시대명사 시작")
-
-        if text_clean.startswith('이 ') or text_clean.startswith('그 ') or text_clean.startswith('저 '):
-            if not any(text_clean.startswith(p) for p in ['이 사건', '이 사람', '이 일', '그 사건', '그 사람']):
-                return (False, "지시대명사 시작")
-
-        # 3. 막연한 주어
-        vague_subjects = [
-            '우리가 ', '우리는 ', '이들은 ', '이들이 ', '그들은 ', '그들이 ',
-            '엄마들이 ', '좌파들이 ', '보수들이 ', '사람들이 '
-        ]
-        for s in vague_subjects:
-            if text_clean.startswith(s):
-                return (False, "막연한 주어")
-
-        # 4. 당위문
-        normative = ['해야 한다', '해야한다', '하자', '드리자', '말아야', '되어야']
-        for n in normative:
-            if n in text_clean:
-                return (False, "당위문")
-
-        # 5. 막연한 평가
-        vague_eval = ['웃기다', '다행', '부당', '적절', '나쁜', '좋은',
-                      '이상하다', '복잡하다', '어렵다', '쉽다']
-
-        concrete_subjects = ['민주당', '국민의힘', '윤석열', '이재명',
-                            '경찰', '검찰', '법원', '정부', '국회',
-                            '대통령', '의원', '장관', '판사', '검사']
-
-        has_concrete_subject = any(subj in text_clean for subj in concrete_subjects)
-
-        if not has_concrete_subject:
-            for v in vague_eval:
-                if v in text_clean:
-                    return (False, "막연한 평가")
-
-        # 6. 불완전한 문장
-        endings = ['다.', '다,', '다"', '다\'', '다!', '다?',
-                   '까.', '까,', '까?', '냐.', '냐,', '냐?',
-                   '요.', '요,', '요!', '음.', '음,']
-
-        has_ending = any(text_clean.endswith(end) for end in endings)
-
-        if not has_ending and not text_clean.endswith('다'):
-            return (False, "불완전한 문장")
-
-        # 7. 자음 이니셜
-        korean_consonants = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
-        if any(c in korean_consonants for c in text_clean[:3]):
-            return (False, "자음 이니셜")
-
-        return (True, "")
+        """Filter low-quality explicit claims (shared rules: engines.utils.claim_filter)"""
+        return filter_claim(claim_text)
 
     async def extract(self, content: Dict) -> Dict:
         """
@@ -113,11 +43,12 @@ class LayeredPerceptionExtractorV2:
             Perception dict with filtered data + stats
         """
         # ========== Stage 1: Extract explicit claims ==========
+        prepared = prepare_content(content)
         prompt_stage1 = f"""
 다음은 DC Gallery 정치 갤러리의 글입니다:
 
-제목: {content['title']}
-내용: {content['body'][:2000]}
+제목: {prepared['title']}
+내용: {prepared['body']}
 
 이 글의 **표면층 (Explicit Layer)**만 추출하세요.
 글에서 직접 말하고 있는 명시적 주장들을 추출하세요.
@@ -160,16 +91,11 @@ JSON 형식:
 
         # ========== Filter explicit claims ==========
         all_claims = result_stage1.get('explicit_claims', [])
-        filtered_claims = []
         filter_stats = {'total': len(all_claims), 'kept': 0, 'filtered': 0}
 
-        for claim in all_claims:
-            should_keep, reason = self._fast_filter_claim(claim)
-            if should_keep:
-                filtered_claims.append(claim)
-                filter_stats['kept'] += 1
-            else:
-                filter_stats['filtered'] += 1
+        filtered_claims, rejected = split_claims(all_claims)
+        filter_stats['kept'] = len(filtered_claims)
+        filter_stats['filtered'] = len(rejected)
 
         # If no claims left after filtering, return empty perception
         if len(filtered_claims) == 0:
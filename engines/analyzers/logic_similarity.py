@@ -0,0 +1,68 @@
+"""
+LogicSimilarity - char n-gram TF-IDF 기반 logic 유사도
+
+공백 토큰 Jaccard는 한국어(교착어)에서 거의 항상 0
+("조작했다" ≠ "조작한다") → 문자 2-3gram TF-IDF 코사인 유사도로 대체
+
+세계관 logic_pattern(trigger + conclusion)을 한 번 벡터화해 두고,
+perception logic chain 행렬과의 희소 행렬 곱 한 번으로 전체 점수를 계산
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from engines.analyzers.worldview_frame import WorldviewFrame
+
+
+def perception_logic_text(perception: Dict) -> str:
+    """Logic chain joined with spaces"""
+    chain = perception.get('logic_chain') or []
+    if isinstance(chain, list):
+        return ' '.join(str(step) for step in chain)
+    return str(chain)
+
+
+class LogicSimilarity:
+    """Sparse char n-gram TF-IDF similarity between logic chains and worldview logic patterns"""
+
+    def __init__(
+        self,
+        frames: List[WorldviewFrame],
+        corpus: Optional[List[str]] = None,
+        ngram_range: tuple = (2, 3)
+    ):
+        """
+        Args:
+            frames: 세계관 frames (행렬 열 순서)
+            corpus: IDF 학습에 추가할 perception logic 텍스트 (없으면 세계관 텍스트만)
+            ngram_range: 문자 n-gram 범위
+        """
+        self.size = len(frames)
+        texts = [frame.logic_text.strip() if frame.logic_pattern else '' for frame in frames]
+
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=ngram_range, sublinear_tf=True)
+        self.worldview_matrix = None
+
+        fit_texts = [t for t in texts + (corpus or []) if t.strip()]
+        if fit_texts:
+            self.vectorizer.fit(fit_texts)
+            # (n_worldviews, vocab), L2 정규화 → 내적 = 코사인
+            self.worldview_matrix = self.vectorizer.transform(texts).T.tocsr()
+
+    def score_matrix(self, perceptions: List[Dict]) -> sparse.csr_matrix:
+        """
+        Logic scores for every (perception, worldview) pair
+
+        Returns:
+            (len(perceptions), len(frames)) 희소 행렬, 값은 0-1 코사인 유사도
+        """
+        if self.worldview_matrix is None or not perceptions:
+            return sparse.csr_matrix((len(perceptions), self.size))
+
+        texts = [perception_logic_text(p) for p in perceptions]
+        return (self.vectorizer.transform(texts) @ self.worldview_matrix).tocsr()
+
+    def scores(self, perception: Dict) -> np.ndarray:
+        """Logic scores of one perception against every worldview (len(frames),)"""
+        return self.score_matrix([perception]).toarray().ravel()
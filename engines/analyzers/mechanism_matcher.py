@@ -8,18 +8,37 @@ Perception을 Worldview에 연결
 - Logic pattern 일치 (20%)
 
 기존 임베딩 기반 매칭보다 정확하고 해석 가능
+
+embedding_top_k를 주면 2단계 매칭:
+1. WorldviewEmbeddingIndex로 perception별 top-k 세계관만 후보로 선택
+2. 위 규칙 기반 점수로 top-k만 재정렬
+
+계층 세계관(403): 상위 세계관을 먼저 점수 계산하고, parent_threshold 이상인
+상위 세계관의 하위 세계관만 점수 계산 (하위 frame은 상위 메커니즘/logic 상속)
 """
 
-import json
-from typing import Dict, List, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 from engines.utils.supabase_client import get_supabase
+from engines.analyzers.worldview_frame import WorldviewFrame
+from engines.analyzers.logic_similarity import LogicSimilarity, perception_logic_text
+from engines.analyzers.worldview_index import WorldviewIndex, SIMILAR_ACTOR_PAIRS
+from engines.analyzers.worldview_embeddings import WorldviewEmbeddingIndex
 
 
 class MechanismMatcher:
     """Match perceptions to worldviews based on reasoning mechanisms"""
 
-    def __init__(self):
+    def __init__(self, embedding_top_k: Optional[int] = None, parent_threshold: Optional[float] = None):
+        """
+        Args:
+            embedding_top_k: 임베딩 검색으로 perception당 k개 세계관만 점수 계산 (None이면 전체)
+            parent_threshold: 상위 세계관 점수가 이 이상일 때만 하위 세계관으로 내려감 (None이면 매칭 threshold)
+        """
         self.supabase = get_supabase()
+        self.parent_threshold = parent_threshold
+        self.embedding_top_k = embedding_top_k
+        self.embeddings = WorldviewEmbeddingIndex() if embedding_top_k else None
 
     async def match_all_perceptions(self, threshold: float = 0.4) -> int:
         """
@@ -38,7 +57,7 @@ class MechanismMatcher:
 
         # 1. Load all perceptions with reasoning structures
         perceptions = self.supabase.table('layered_perceptions')\
-            .select('id, content_id, mechanisms, actor, logic_chain, consistency_pattern')\
+            .select('id, content_id, mechanisms, actor, logic_chain, consistency_pattern, deep_beliefs')\
             .not_.is_('mechanisms', 'null')\
             .execute().data
 
@@ -48,12 +67,24 @@ class MechanismMatcher:
 
         # 2. Load all active worldviews
         worldviews = self.supabase.table('worldviews')\
-            .select('id, title, frame')\
+            .select('id, title, frame, last_updated, parent_worldview_id')\
             .neq('archived', True)\
             .execute().data
 
         print(f"✅ {len(worldviews)}개 worldview 로드")
 
+        # Parse frames once (children inherit parent features) and index them
+        index = WorldviewIndex.from_rows(
+            worldviews,
+            logic_corpus=[perception_logic_text(p) for p in perceptions]
+        )
+
+        # All logic scores from one sparse product (perceptions × worldviews)
+        logic_matrix = index.logic.score_matrix(perceptions)
+
+        # Stage 1: embedding top-k candidates (optional)
+        embedding_candidates = self._embedding_candidates(perceptions, worldviews)
+
         # 3. Clear existing links (for re-matching)
         print("\n기존 links 삭제 중...")
         self.supabase.table('perception_worldview_links').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
@@ -64,7 +95,10 @@ class MechanismMatcher:
         links_created = 0
 
         for i, perception in enumerate(perceptions):
-            matches = await self._find_matches(perception, worldviews, threshold)
+            logic_scores = logic_matrix.getrow(i).toarray().ravel()
+            matches = await self._find_matches(
+                perception, index, threshold, logic_scores, embedding_candidates[i]
+            )
 
             for match in matches:
                 await self._create_link(
@@ -99,7 +133,7 @@ class MechanismMatcher:
 
         # Load perception
         perception = self.supabase.table('layered_perceptions')\
-            .select('id, content_id, mechanisms, actor, logic_chain, consistency_pattern')\
+            .select('id, content_id, mechanisms, actor, logic_chain, consistency_pattern, deep_beliefs')\
             .eq('id', perception_id)\
             .execute().data
 
@@ -110,12 +144,14 @@ class MechanismMatcher:
 
         # Load worldviews
         worldviews = self.supabase.table('worldviews')\
-            .select('id, title, frame')\
+            .select('id, title, frame, last_updated, parent_worldview_id')\
             .neq('archived', True)\
             .execute().data
 
         # Find matches
-        matches = await self._find_matches(perception, worldviews, threshold)
+        index = WorldviewIndex.from_rows(worldviews)
+        embedding_candidates = self._embedding_candidates([perception], worldviews)
+        matches = await self._find_matches(perception, index, threshold, allowed=embedding_candidates[0])
 
         # Create links
         matched_worldview_ids = []
@@ -129,14 +165,53 @@ class MechanismMatcher:
 
         return matched_worldview_ids
 
-    async def _find_matches(self, perception: Dict, worldviews: List[Dict], threshold: float) -> List[Dict]:
+    def match_recent_perceptions(self, minutes: int = 10, threshold: float = 0.4) -> List[Dict]:
+        """
+        Match recently created perceptions inside Postgres (match_recent_perceptions RPC)
+
+        Actor + Mechanism IoU만으로 점수 계산 (Logic 20% 제외 → Python 점수의 하한),
+        top-3 링크를 DB에서 바로 생성. perception/worldview를 가져오지 않음
+        하위 세계관은 상위 frame을 상속하고 상위 점수가 parent_threshold 이상일 때만 매칭 (_find_matches와 동일)
+        (logic 없이 순위 / 상위 게이트를 판정하므로 링크가 match_all_perceptions의 top-3와 다를 수 있음)
+
+        Args:
+            minutes: 최근 N분 내 생성된 perception
+            threshold: Minimum score to create a link
+
+        Returns:
+            Created links [{'perception_id', 'worldview_id', 'relevance_score'}]
+        """
+
+        result = self.supabase.rpc('match_recent_perceptions', {
+            'minutes_window': minutes,
+            'min_score': threshold,
+            'max_links': 3,
+            'parent_threshold': self.parent_threshold
+        }).execute()
+
+        return result.data or []
+
+    async def _find_matches(
+        self,
+        perception: Dict,
+        index: WorldviewIndex,
+        threshold: float,
+        logic_scores: Optional[np.ndarray] = None,
+        allowed: Optional[Set[int]] = None
+    ) -> List[Dict]:
         """
         Find matching worldviews for a perception
 
+        Only worldviews sharing a mechanism or actor keyword are scored
+        (others cannot reach the threshold). With a worldview hierarchy,
+        children are scored only under parents scoring >= parent_threshold
+
         Args:
             perception: Perception dict
-            worldviews: List of worldview dicts
+            index: Indexed worldview frames
             threshold: Minimum score
+            logic_scores: 이 perception의 세계관별 logic 점수 (없으면 index.logic으로 계산)
+            allowed: 임베딩 top-k 세계관 위치 (None이면 제한 없음)
 
         Returns:
             List of matches with scores
@@ -144,23 +219,73 @@ class MechanismMatcher:
 
         matches = []
 
-        for wv in worldviews:
-            score = self._calculate_match_score(perception, wv)
+        # One automaton scan gives the actor score for every worldview
+        actor_scores = index.actor_scores(perception)
+
+        if logic_scores is None:
+            logic_scores = index.logic.scores(perception)
+
+        def score_at(i: int) -> float:
+            actor_score = actor_scores.get(i, 0.0) if actor_scores is not None else None
+            return self._calculate_match_score(perception, index.frames[i], actor_score, float(logic_scores[i]))
+
+        positions = [
+            i for i, _ in index.candidates(perception, threshold, actor_scores)
+            if allowed is None or i in allowed
+        ]
+
+        scores: Dict[int, float] = {}
+        if index.is_hierarchical:
+            # Coarse-to-fine: score the few parents first, then only the children
+            # of parents above parent_threshold (empty parent frames always descend)
+            candidate_set = set(positions)
+            scores = {i: score_at(i) for i in index.roots}
+            positions = [i for i in index.roots if i in candidate_set]
+
+            parent_threshold = threshold if self.parent_threshold is None else self.parent_threshold
+            for parent in index.roots:
+                if scores[parent] >= parent_threshold or index.frames[parent].is_empty:
+                    positions.extend(c for c in index.children.get(parent, []) if c in candidate_set)
+
+        for i in positions:
+            score = scores[i] if i in scores else score_at(i)
 
             if score >= threshold:
+                frame = index.frames[i]
                 matches.append({
-                    'worldview_id': wv['id'],
-                    'worldview_title': wv['title'],
+                    'worldview_id': frame.id,
+                    'worldview_title': frame.title,
                     'score': score
                 })
 
-        # Sort by score (descending)
-        matches.sort(key=lambda x: x['score'], reverse=True)
+        # Sort by score (descending), ties by worldview id (match_recent_perceptions RPC와 같은 순서)
+        matches.sort(key=lambda x: (-x['score'], str(x['worldview_id'])))
 
         # Return top 3 matches
         return matches[:3]
 
-    def _calculate_match_score(self, perception: Dict, worldview: Dict) -> float:
+    def _embedding_candidates(self, perceptions: List[Dict], worldviews: List[Dict]) -> List[Optional[Set[int]]]:
+        """
+        Stage 1: top-k worldview positions per perception by embedding similarity
+
+        Returns:
+            perception별 허용 세계관 위치 집합 (임베딩 비활성/텍스트 없음 → None)
+        """
+        if not self.embeddings:
+            return [None] * len(perceptions)
+
+        print(f"\n임베딩 후보 선별 (top-{self.embedding_top_k})...")
+        results = self.embeddings.build(worldviews).search(perceptions, self.embedding_top_k)
+
+        return [set(r) if r is not None else None for r in results]
+
+    def _calculate_match_score(
+        self,
+        perception: Dict,
+        frame: WorldviewFrame,
+        actor_score: Optional[float] = None,
+        logic_score: Optional[float] = None
+    ) -> float:
         """
         Calculate match score between perception and worldview
 
@@ -168,25 +293,28 @@ class MechanismMatcher:
         - 일반: Actor 50%, Mechanism 30%, Logic 20%
         - 극단적 사건: Actor 30%, Mechanism 50%, Logic 20% (Mechanism 중심)
 
+        Args:
+            actor_score: WorldviewIndex.actor_scores()로 미리 계산한 Actor 점수 (없으면 쌍별 계산)
+            logic_score: LogicSimilarity로 미리 계산한 Logic 점수 (없으면 쌍별 계산)
+
         Returns:
             Score between 0 and 1
         """
 
-        # Parse worldview frame
-        try:
-            frame = json.loads(worldview.get('frame', '{}'))
-        except:
-            # Old format worldview
+        # Old format worldview (nothing to match on)
+        if frame.is_empty:
             return 0.0
 
         # 1. Actor matching
-        actor_score = self._match_actor(perception, frame)
+        if actor_score is None:
+            actor_score = self._match_actor(perception, frame)
 
         # 2. Mechanism matching
         mechanism_score = self._match_mechanisms(perception, frame)
 
         # 3. Logic pattern matching
-        logic_score = self._match_logic_pattern(perception, frame)
+        if logic_score is None:
+            logic_score = self._match_logic_pattern(perception, frame)
 
         # Adaptive weighting (Claude 실험 기반)
         # 메커니즘이 많을수록 Mechanism 중심 가중치 사용
@@ -200,7 +328,7 @@ class MechanismMatcher:
 
         return total_score
 
-    def _match_actor(self, perception: Dict, frame: Dict) -> float:
+    def _match_actor(self, perception: Dict, frame: WorldviewFrame) -> float:
         """
         Match actor field
 
@@ -209,23 +337,14 @@ class MechanismMatcher:
         """
 
         perception_actor = perception.get('actor', {}).get('subject', '')
-
-        # Handle both dict and string format for worldview actor
-        worldview_actor_data = frame.get('actor', '')
-        if isinstance(worldview_actor_data, dict):
-            worldview_actor = worldview_actor_data.get('subject', '')
-        else:
-            worldview_actor = worldview_actor_data
+        worldview_actor = frame.actor_subject
 
         if not perception_actor or not worldview_actor:
             return 0.0
 
-        # Extract keywords from worldview actor
+        # Worldview actor keywords are pre-split
         # e.g., "중국/좌파 세력" → ["중국", "좌파", "세력"]
-        actor_keywords = []
-        for part in worldview_actor.replace('/', ' ').replace('(', ' ').replace(')', ' ').replace('·', ' ').replace(',', ' ').split():
-            if part.strip():
-                actor_keywords.append(part.strip())
+        actor_keywords = frame.actor_keywords
 
         # Check if any keyword is in perception actor
         for keyword in actor_keywords:
@@ -233,23 +352,14 @@ class MechanismMatcher:
                 return 1.0
 
         # Partial match for similar terms
-        similar_pairs = [
-            ('민주', '민주당'),
-            ('좌파', '진보'),
-            ('중국', '중국계'),
-            ('경찰', '공권력'),
-            ('정부', '정권'),
-            ('언론', '미디어')
-        ]
-
-        for term1, term2 in similar_pairs:
+        for term1, term2 in SIMILAR_ACTOR_PAIRS:
             if (term1 in perception_actor and term2 in worldview_actor) or \
                (term2 in perception_actor and term1 in worldview_actor):
                 return 0.8
 
         return 0.0
 
-    def _match_mechanisms(self, perception: Dict, frame: Dict) -> float:
+    def _match_mechanisms(self, perception: Dict, frame: WorldviewFrame) -> float:
         """
         Match mechanisms
 
@@ -258,7 +368,7 @@ class MechanismMatcher:
         """
 
         perception_mechs = set(perception.get('mechanisms', []))
-        worldview_mechs = set(frame.get('core_mechanisms', []))
+        worldview_mechs = frame.mechanisms
 
         if not perception_mechs or not worldview_mechs:
             return 0.0
@@ -269,38 +379,21 @@ class MechanismMatcher:
 
         return len(intersection) / len(union) if union else 0.0
 
-    def _match_logic_pattern(self, perception: Dict, frame: Dict) -> float:
+    def _match_logic_pattern(self, perception: Dict, frame: WorldviewFrame) -> float:
         """
-        Match logic pattern
+        Match logic pattern (single pair)
+
+        Char n-gram TF-IDF cosine, same as WorldviewIndex.logic
+        (공백 토큰 Jaccard는 "조작했다"/"조작한다"처럼 어미만 달라도 0)
 
         Returns:
             Score based on logic chain similarity (0-1)
         """
 
-        perception_chain = perception.get('logic_chain', [])
-        worldview_pattern = frame.get('logic_pattern', {})
-
-        if not perception_chain or not worldview_pattern:
-            return 0.0
-
-        # Convert to text for matching
-        perception_text = ' '.join(perception_chain)
-        worldview_text = (
-            worldview_pattern.get('trigger', '') + ' ' +
-            worldview_pattern.get('conclusion', '')
-        )
-
-        # Simple keyword overlap
-        perception_keywords = set(perception_text.split())
-        worldview_keywords = set(worldview_text.split())
-
-        if not perception_keywords or not worldview_keywords:
+        if not perception.get('logic_chain') or not frame.logic_pattern:
             return 0.0
 
-        intersection = perception_keywords & worldview_keywords
-        union = perception_keywords | worldview_keywords
-
-        return len(intersection) / len(union) if union else 0.0
+        return float(LogicSimilarity([frame]).scores(perception)[0])
 
     async def _create_link(self, perception_id: str, worldview_id: str, score: float):
         """Create perception_worldview_link"""
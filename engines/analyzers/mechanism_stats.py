@@ -0,0 +1,265 @@
+"""
+MechanismStatsStore - 증분 메커니즘/Actor 통계
+
+Perception이 저장될 때마다 일별 버킷(mechanism_daily_stats)을 갱신:
+- 메커니즘 빈도
+- 메커니즘 × 메커니즘 공출현 행렬
+- Actor 빈도 (Count-Min sketch + Space-Saving top-k)
+
+Rolling window 조회는 일별 행 병합만 하므로 perception 수와 무관 (window 일수에만 비례)
+get_mechanism_statistics RPC와 같은 기준: created_at 날짜, archived perception 제외
+→ perception을 아카이브/삭제한 뒤에는 refresh_days()로 해당 날짜 버킷을 다시 계산
+기록은 배치 증분을 increment_mechanism_daily_stats RPC로 보내 DB에서 한 문장으로 병합 (migration 521)
+→ 여러 워커가 동시에 기록해도 카운트 유실 없음
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from engines.utils.supabase_client import get_supabase
+from engines.utils.sketches import CountMinSketch, SpaceSaving
+
+
+def actor_subject(actor) -> str:
+    """Normalize actor.subject (string / list / missing) to a single key"""
+    if not isinstance(actor, dict):
+        return 'Unknown'
+    subj = actor.get('subject', 'Unknown')
+    if isinstance(subj, list):
+        return ', '.join(str(s) for s in subj)
+    if not isinstance(subj, str):
+        return str(subj)
+    return subj or 'Unknown'
+
+
+def created_day(perception: Dict) -> Optional[date]:
+    """Bucket date of a perception (created_at 날짜, 없으면 None)"""
+    if not perception.get('created_at'):
+        return None
+    return datetime.fromisoformat(str(perception['created_at']).replace('Z', '+00:00')).date()
+
+
+class MechanismStatsStore:
+    """Streaming per-day mechanism / actor statistics backed by mechanism_daily_stats"""
+
+    def __init__(self, actor_k: int = 50, sketch_width: int = 512, sketch_depth: int = 4):
+        self.supabase = get_supabase()
+        self.actor_k = actor_k
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+
+    def record(self, perception: Dict, day: Optional[date] = None):
+        """
+        Add one saved perception to its day bucket
+
+        Args:
+            perception: dict with mechanisms, actor
+            day: 버킷 날짜 (기본 오늘, UTC)
+        """
+        self.record_many([perception], day=day)
+
+    def record_many(self, perceptions: List[Dict], day: Optional[date] = None) -> int:
+        """
+        Add perceptions to day buckets (one increment RPC per day)
+
+        day가 없으면 perception의 created_at 날짜, 그것도 없으면 오늘
+        archived perception은 건너뜀 (get_mechanism_statistics와 같은 기준)
+
+        Returns:
+            Number of perceptions recorded
+        """
+        today = datetime.now(timezone.utc).date()
+        by_day: Dict[date, List[Dict]] = {}
+
+        for p in perceptions:
+            if not p.get('mechanisms') or p.get('archived'):
+                continue
+            by_day.setdefault(day or created_day(p) or today, []).append(p)
+
+        for bucket, items in by_day.items():
+            delta = self._empty_day()
+            for p in items:
+                self._apply(delta, p)
+            self._increment_day(bucket, delta)
+
+        return sum(len(items) for items in by_day.values())
+
+    def window(self, days: int = 7, end: Optional[date] = None) -> Dict:
+        """
+        Rolling window statistics (end 포함 최근 days일)
+
+        Returns:
+            {
+                'perception_count': int,
+                'mechanism_counts': [[mechanism, count], ...],
+                'actor_counts': [[actor, estimated_count], ...],
+                'cooccurrence': [[mechanism_a, mechanism_b, count], ...],
+                'daily': [{'date': str, 'perception_count': int, 'mechanism_counts': {...}}, ...]
+            }
+
+            get_mechanism_statistics RPC와 같은 형태 (+ daily)
+        """
+        end = end or datetime.now(timezone.utc).date()
+        start = end - timedelta(days=days - 1)
+
+        rows = self.supabase.table('mechanism_daily_stats')\
+            .select('*')\
+            .gte('stat_date', start.isoformat())\
+            .lte('stat_date', end.isoformat())\
+            .order('stat_date')\
+            .execute().data
+
+        total = 0
+        mechanism_counts: Dict[str, int] = {}
+        pair_counts: Dict[str, int] = {}
+        sketch = CountMinSketch(width=self.sketch_width, depth=self.sketch_depth)
+        heavy = SpaceSaving(k=self.actor_k)
+        daily = []
+
+        for row in rows:
+            total += row['perception_count']
+            for mech, count in row['mechanism_counts'].items():
+                mechanism_counts[mech] = mechanism_counts.get(mech, 0) + count
+            for pair, count in row['cooccurrence'].items():
+                pair_counts[pair] = pair_counts.get(pair, 0) + count
+            sketch.merge(CountMinSketch.from_dict(row['actor_sketch'], self.sketch_width, self.sketch_depth))
+            heavy.merge(SpaceSaving.from_dict(row['actor_heavy_hitters'], self.actor_k))
+
+            daily.append({
+                'date': row['stat_date'],
+                'perception_count': row['perception_count'],
+                'mechanism_counts': row['mechanism_counts']
+            })
+
+        # Heavy hitter 후보의 빈도는 병합된 Count-Min으로 추정
+        actor_counts = sorted(
+            ((actor, sketch.estimate(actor)) for actor in heavy.candidates()),
+            key=lambda x: x[1],
+            reverse=True
+        )
+
+        return {
+            'perception_count': total,
+            'mechanism_counts': [list(x) for x in sorted(mechanism_counts.items(), key=lambda x: x[1], reverse=True)],
+            'actor_counts': [list(x) for x in actor_counts[:30]],
+            'cooccurrence': [
+                pair.split('|') + [count]
+                for pair, count in sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)
+            ],
+            'daily': daily
+        }
+
+    def has_window(self, days: int) -> bool:
+        """Whether the store has buckets covering the whole window"""
+        start = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+        earliest = self.supabase.table('mechanism_daily_stats')\
+            .select('stat_date')\
+            .order('stat_date')\
+            .limit(1)\
+            .execute().data
+
+        return bool(earliest) and earliest[0]['stat_date'] <= start.isoformat()
+
+    def rebuild(self, days: int = 90, page_size: int = 1000) -> int:
+        """
+        Rebuild buckets from existing perceptions (초기 backfill / 재계산)
+
+        Returns:
+            Number of perceptions recorded
+        """
+        start = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+        self.supabase.table('mechanism_daily_stats')\
+            .delete()\
+            .gte('stat_date', start.isoformat())\
+            .execute()
+
+        return self._record_range(start, None, page_size)
+
+    def refresh_days(self, days: Iterable[date], page_size: int = 1000) -> int:
+        """
+        Recompute the given day buckets from the perceptions still active
+
+        perception 아카이브/삭제 후 호출 (빠진 perception의 created_at 날짜들)
+        저장소의 가장 이른 버킷보다 오래된 날짜는 건너뜀 → has_window() 판단이 바뀌지 않음
+
+        Returns:
+            Number of perceptions recorded
+        """
+        earliest = self.supabase.table('mechanism_daily_stats')\
+            .select('stat_date')\
+            .order('stat_date')\
+            .limit(1)\
+            .execute().data
+        if not earliest:
+            return 0
+
+        recorded = 0
+        for day in sorted(d for d in set(days) if d.isoformat() >= earliest[0]['stat_date']):
+            self.supabase.table('mechanism_daily_stats')\
+                .delete()\
+                .eq('stat_date', day.isoformat())\
+                .execute()
+            recorded += self._record_range(day, day + timedelta(days=1), page_size)
+
+        return recorded
+
+    # ------------------------------------------------------------------
+
+    def _record_range(self, start: date, end: Optional[date], page_size: int) -> int:
+        """Record active perceptions created in [start, end) (end None: 현재까지)"""
+        recorded = 0
+        offset = 0
+        while True:
+            query = self.supabase.table('layered_perceptions')\
+                .select('id, mechanisms, actor, created_at')\
+                .not_.is_('archived', 'true')\
+                .gte('created_at', start.isoformat())
+            if end is not None:
+                query = query.lt('created_at', end.isoformat())
+
+            rows = query.order('created_at')\
+                .range(offset, offset + page_size - 1)\
+                .execute().data
+
+            recorded += self.record_many(rows)
+
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        return recorded
+
+    def _empty_day(self) -> Dict:
+        return {
+            'perception_count': 0,
+            'mechanism_counts': {},
+            'cooccurrence': {},
+            'actor_sketch': CountMinSketch(width=self.sketch_width, depth=self.sketch_depth),
+            'actor_heavy_hitters': SpaceSaving(k=self.actor_k)
+        }
+
+    def _apply(self, row: Dict, perception: Dict):
+        mechs = sorted(set(perception.get('mechanisms') or []))
+
+        row['perception_count'] += 1
+        for i, mech in enumerate(mechs):
+            row['mechanism_counts'][mech] = row['mechanism_counts'].get(mech, 0) + 1
+            for other in mechs[i + 1:]:
+                key = f"{mech}|{other}"
+                row['cooccurrence'][key] = row['cooccurrence'].get(key, 0) + 1
+
+        subject = actor_subject(perception.get('actor'))
+        row['actor_sketch'].add(subject)
+        row['actor_heavy_hitters'].add(subject)
+
+    def _increment_day(self, day: date, delta: Dict):
+        """Merge a batch delta into the day row in the DB (sketch 원소별 합, top-k는 SpaceSaving.merge와 같은 규칙)"""
+        self.supabase.rpc('increment_mechanism_daily_stats', {
+            'stat_day': day.isoformat(),
+            'add_perceptions': delta['perception_count'],
+            'add_mechanisms': delta['mechanism_counts'],
+            'add_cooccurrence': delta['cooccurrence'],
+            'add_actor_sketch': delta['actor_sketch'].to_dict(),
+            'add_actor_heavy_hitters': delta['actor_heavy_hitters'].to_dict()
+        }).execute()
@@ -10,14 +10,22 @@ Patterns are added, reinforced, weakened, and removed organically.
 """
 
 import os
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-from sentence_transformers import SentenceTransformer
 from engines.utils.supabase_client import get_supabase
+from engines.utils.claim_filter import filter_claim
+from engines.utils.embedding_providers import EmbeddingProvider, get_provider, register_model
 
-# Initialize embedding model (multilingual, 1024 dimensions)
-# Using paraphrase-multilingual-mpnet-base-v2 for Korean support
-embedding_model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
+# Embeddings are stored as halfvec (migration 517/518) and kept as float16 in Python
+# 패턴 임베딩 모델은 PATTERN_EMBEDDING_PROVIDER (embedding_providers), 벡터마다 embedding_model fingerprint 저장
+EMBEDDING_DTYPE = np.float16
+
+# embedding_models에 등록한 fingerprint (프로세스당 1번)
+_registered_models = set()
+
+# Default projection: everything except the embedding (1.5KB/row, only needed for vector search)
+PATTERN_COLUMNS = 'id, worldview_id, layer, text, strength, status, first_seen, last_seen, appearance_count, created_at, updated_at'
 
 
 class PatternManager:
@@ -33,8 +41,17 @@ class PatternManager:
     - cleanup_dead_patterns(): Remove dead patterns
     """
 
-    def __init__(self):
+    def __init__(self, provider: Optional[str] = None):
+        """
+        Args:
+            provider: embedding_providers 이름 (None이면 PATTERN_EMBEDDING_PROVIDER)
+        """
         self.supabase = get_supabase()
+        self.provider: EmbeddingProvider = get_provider(provider)
+
+        if self.provider.fingerprint not in _registered_models:
+            register_model(self.supabase, self.provider)
+            _registered_models.add(self.provider.fingerprint)
 
         # Layer-specific thresholds
         self.SIMILARITY_THRESHOLDS = {
@@ -145,9 +162,10 @@ class PatternManager:
             {
                 'target_worldview_id': worldview_id,
                 'target_layer': layer,
-                'target_embedding': embedding,
+                'target_embedding': embedding.tolist(),
                 'max_distance': max_distance,
-                'limit_count': 1
+                'limit_count': 1,
+                'target_model': self.provider.fingerprint
             }
         ).execute()
 
@@ -209,7 +227,8 @@ class PatternManager:
             'worldview_id': worldview_id,
             'layer': layer,
             'text': text,
-            'embedding': embedding,
+            'embedding': embedding.tolist(),
+            'embedding_model': self.provider.fingerprint,
             'strength': 1.0,
             'status': 'active',
             'first_seen': datetime.now().isoformat(),
@@ -242,7 +261,7 @@ class PatternManager:
         }
 
         for layer in ['surface', 'implicit', 'deep']:
-            query = self.supabase.table('worldview_patterns').select('*').eq('layer', layer).in_('status', ['active', 'fading'])
+            query = self.supabase.table('worldview_patterns').select('id, status, strength, last_seen').eq('layer', layer).in_('status', ['active', 'fading'])
 
             if worldview_id:
                 query = query.eq('worldview_id', worldview_id)
@@ -325,7 +344,7 @@ class PatternManager:
         Returns:
             List of active patterns, sorted by strength descending
         """
-        query = self.supabase.table('worldview_patterns').select('*').eq('worldview_id', worldview_id).in_('status', ['active', 'fading']).gte('strength', min_strength)
+        query = self.supabase.table('worldview_patterns').select(PATTERN_COLUMNS).eq('worldview_id', worldview_id).in_('status', ['active', 'fading']).gte('strength', min_strength)
 
         if layer:
             query = query.eq('layer', layer)
@@ -335,15 +354,15 @@ class PatternManager:
         return result.data if result.data else []
 
 
-    def _get_embedding(self, text: str) -> List[float]:
+    def _get_embedding(self, text: str) -> np.ndarray:
         """
-        Get sentence embedding for text
+        Get embedding for text from self.provider
 
-        Uses paraphrase-multilingual-mpnet-base-v2 (768 dimensions)
-        Supports Korean language
+        Default: paraphrase-multilingual-mpnet-base-v2 (768 dimensions, Korean support)
+        Returned as float16 (halfvec 컬럼과 같은 정밀도)
         """
-        embedding = embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        embedding = self.provider.encode([text])[0]
+        return embedding.astype(EMBEDDING_DTYPE)
 
 
     def _fast_filter_surface(self, text: str) -> Tuple[bool, str]:
@@ -353,84 +372,12 @@ class PatternManager:
         Rule-based filtering (no cost, instant):
         - Filters ~17% of bad patterns
         - Remaining ~17% need Claude validation (Phase 2)
+        - Shared precompiled rules (engines.utils.claim_filter)
 
         Returns:
             (should_keep, reason_if_filtered)
         """
-        text_clean = text.strip()
-
-        # 1. 길이 체크
-        if len(text_clean) < 10:
-            return (False, "길이 < 10")
-
-        # 2. 지시대명사로 시작
-        pronouns_start = [
-            '이는 ', '이는,', '이것은 ', '이것이 ', '그것은 ', '그것이 ',
-            '여기는 ', '거기는 ', '저기는 '
-        ]
-        for p in pronouns_start:
-            if text_clean.startswith(p):
-                return (False, "지시대명사 시작")
-
-        # 지시대명사 단독 (끝에 조사)
-        if text_clean.startswith('이 ') or text_clean.startswith('그 ') or text_clean.startswith('저 '):
-            # 단, "이 사건", "이 사람" 같은 경우는 허용
-            if not any(text_clean.startswith(p) for p in ['이 사건', '이 사람', '이 일', '그 사건', '그 사람']):
-                return (False, "지시대명사 시작")
-
-        # 3. 대명사/막연한 주어로 시작
-        vague_subjects = [
-            '우리가 ', '우리는 ', '이들은 ', '이들이 ', '그들은 ', '그들이 ',
-            '엄마들이 ', '좌파들이 ', '보수들이 ', '사람들이 '
-        ]
-        for s in vague_subjects:
-            if text_clean.startswith(s):
-                return (False, "막연한 주어")
-
-        # 4. 당위문/규범문
-        normative = ['해야 한다', '해야한다', '하자', '드리자', '말아야', '되어야']
-        for n in normative:
-            if n in text_clean:
-                return (False, "당위문")
-
-        # 5. 막연한 평가/감정 (구체적 주어 없으면 제거)
-        vague_eval = ['웃기다', '다행', '부당', '적절', '나쁜', '좋은',
-                      '이상하다', '복잡하다', '어렵다', '쉽다']
-
-        # 구체적 주어 체크
-        concrete_subjects = ['민주당', '국민의힘', '윤석열', '이재명',
-                            '경찰', '검찰', '법원', '정부', '국회',
-                            '대통령', '의원', '장관', '판사', '검사']
-
-        has_concrete_subject = any(subj in text_clean for subj in concrete_subjects)
-
-        if not has_concrete_subject:
-            for v in vague_eval:
-                if v in text_clean:
-                    return (False, "막연한 평가")
-
-        # 6. 불완전한 문장 (서술어 없음)
-        # 한국어 종결어미 체크
-        endings = ['다.', '다,', '다"', '다\'', '다!', '다?',
-                   '까.', '까,', '까?',
-                   '냐.', '냐,', '냐?',
-                   '요.', '요,', '요!',
-                   '음.', '음,']
-
-        # 문장 끝에 종결어미가 있는지 체크
-        has_ending = any(text_clean.endswith(end) for end in endings)
-
-        # 또는 '다'로 끝나는지 (마침표 없어도)
-        if not has_ending and not text_clean.endswith('다'):
-            return (False, "불완전한 문장")
-
-        # 7. 특수문자만 있는 이니셜 (ㅉ, ㅁㅈ 등)
-        # 한글 자음만 있는 패턴
-        korean_consonants = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
-        if any(c in korean_consonants for c in text_clean[:3]):
-            return (False, "자음 이니셜")
-
-        return (True, "")
+        return filter_claim(text)
 
 
     def cleanup_low_quality_patterns(
@@ -459,7 +406,7 @@ class PatternManager:
         import json
 
         # Get weak surface patterns
-        weak_patterns = self.supabase.table('worldview_patterns').select('*').eq('worldview_id', worldview_id).eq('layer', 'surface').lt('strength', strength_threshold).in_('status', ['active', 'fading']).execute().data
+        weak_patterns = self.supabase.table('worldview_patterns').select('id, text').eq('worldview_id', worldview_id).eq('layer', 'surface').lt('strength', strength_threshold).in_('status', ['active', 'fading']).execute().data
 
         if not weak_patterns:
             return {'checked': 0, 'removed': 0}
@@ -541,9 +488,10 @@ class PatternManager:
 # Helper function to create RPC function in Supabase
 def create_similarity_search_function():
     """
-    SQL function for vector similarity search
+    SQL function for vector similarity search (original 1536-dim version)
 
-    Run this once in Supabase SQL editor:
+    Superseded by supabase/migrations/518_embedding_model_fingerprint.sql
+    (model-aware, any dimension) - kept for reference only, do not run.
     """
     sql = """
     CREATE OR REPLACE FUNCTION find_similar_patterns(
@@ -0,0 +1,275 @@
+"""
+PerceptionClusterer - 세계관 통합 전 로컬 클러스터링
+
+Active window 전체 perception을 특징 벡터로 변환해 클러스터링:
+- 메커니즘 one-hot (5개 메커니즘)
+- Actor 토큰 (subject/purpose/methods, hashing)
+- Logic chain 임베딩 (다국어 mpnet, sentence_encoder)
+  → EmbeddingStore(memmap)에 perception id별로 저장, logic chain이 바뀌지 않았으면 다시 계산하지 않음
+
+LLM은 클러스터(centroid 통계 + 대표 perception)에 이름/설명만 붙이므로
+프롬프트 크기가 perception 수와 무관 (대표는 층화 샘플에 속한 멤버를 우선)
+"""
+
+import os
+import hashlib
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+from sklearn.cluster import HDBSCAN, MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import normalize
+from engines.utils.supabase_client import get_supabase
+from engines.analyzers.mechanism_stats import actor_subject
+from engines.utils.sentence_encoder import get_encoder
+from engines.utils.embedding_store import EmbeddingStore
+
+DEFAULT_CACHE_PATH = os.getenv('PERCEPTION_EMBEDDING_CACHE', 'embedding_cache/perceptions')
+
+MECHANISMS = ['즉시_단정', '역사_투사', '필연적_인과', '네트워크_추론', '표면_부정']
+
+
+def _default_encode(texts: List[str]) -> np.ndarray:
+    return get_encoder().encode(texts, convert_to_numpy=True, normalize_embeddings=True, batch_size=64)
+
+
+def actor_text(actor) -> str:
+    """Actor subject/purpose/methods as one whitespace-tokenizable string"""
+    if not isinstance(actor, dict):
+        return ''
+    methods = actor.get('methods') or []
+    if not isinstance(methods, list):
+        methods = [str(methods)]
+    return ' '.join([actor_subject(actor), str(actor.get('purpose') or '')] + [str(m) for m in methods])
+
+
+def logic_text(perception: Dict) -> str:
+    """Logic chain joined into one sentence"""
+    chain = perception.get('logic_chain') or []
+    if isinstance(chain, list):
+        return ' → '.join(str(step) for step in chain[:5])
+    return str(chain)
+
+
+class PerceptionClusterer:
+    """Cluster perceptions on mechanism / actor / logic-chain features"""
+
+    def __init__(
+        self,
+        encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+        method: str = 'kmeans',
+        k_range: range = range(5, 11),
+        weights: Optional[Dict[str, float]] = None,
+        actor_features: int = 256,
+        random_state: int = 42,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH
+    ):
+        """
+        Args:
+            encode: texts → (n, dim) 임베딩 (기본: 다국어 mpnet, 첫 호출 때 로드)
+            method: 'kmeans' (MiniBatchKMeans, k는 silhouette로 선택) 또는 'hdbscan'
+            k_range: kmeans 후보 클러스터 수 (기본 5-10, 세계관 수 범위)
+            weights: 특징 블록 가중치 {'mechanism', 'actor', 'logic'}
+            actor_features: Actor 토큰 hashing 차원
+            cache_path: logic chain 임베딩 저장소 디렉토리 (EmbeddingStore), None이면 캐시하지 않음
+        """
+        self.supabase = get_supabase()
+        self.encode = encode or _default_encode
+        self.method = method
+        self.k_range = k_range
+        self.weights = weights or {'mechanism': 1.0, 'actor': 0.7, 'logic': 1.0}
+        self.random_state = random_state
+        self.cache_path = cache_path
+        self.actor_vectorizer = HashingVectorizer(
+            n_features=actor_features,
+            token_pattern=r'[^\s,/]+',
+            alternate_sign=False,
+            norm='l2'
+        )
+
+    def load_window(self, days: int = 90, page_size: int = 1000) -> List[Dict]:
+        """
+        Load every perception with mechanisms in the active window
+
+        window 기준은 layered_perceptions.created_at (get_mechanism_statistics /
+        sample_perceptions_stratified RPC, MechanismStatsStore와 같은 기준)
+
+        Returns:
+            List of perception dicts (id, mechanisms, actor, logic_chain, created_at)
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+        perceptions = []
+        offset = 0
+        while True:
+            rows = self.supabase.table('layered_perceptions')\
+                .select('id, mechanisms, actor, logic_chain, created_at')\
+                .not_.is_('mechanisms', 'null')\
+                .gte('created_at', since)\
+                .order('created_at')\
+                .range(offset, offset + page_size - 1)\
+                .execute().data
+
+            perceptions.extend(p for p in rows if p.get('mechanisms'))
+
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        return perceptions
+
+    def features(self, perceptions: List[Dict]) -> np.ndarray:
+        """
+        Feature matrix (n, 5 + actor_features + embedding_dim)
+
+        각 블록을 L2 정규화 후 가중치 적용 → 블록 간 스케일 균형
+        """
+        mechanism_block = np.zeros((len(perceptions), len(MECHANISMS)), dtype=np.float32)
+        for i, p in enumerate(perceptions):
+            for mech in p.get('mechanisms') or []:
+                if mech in MECHANISMS:
+                    mechanism_block[i, MECHANISMS.index(mech)] = 1.0
+        mechanism_block = normalize(mechanism_block)
+
+        actor_block = self.actor_vectorizer.transform(
+            [actor_text(p.get('actor')) for p in perceptions]
+        ).toarray().astype(np.float32)
+
+        logic_block = normalize(np.asarray(self.logic_embeddings(perceptions), dtype=np.float32))
+
+        return np.hstack([
+            self.weights['mechanism'] * mechanism_block,
+            self.weights['actor'] * actor_block,
+            self.weights['logic'] * logic_block
+        ])
+
+    def logic_embeddings(self, perceptions: List[Dict]) -> np.ndarray:
+        """
+        Logic chain embeddings (cache hit if the logic chain text is unchanged)
+
+        stamp = logic_text의 md5 → 새 perception (또는 logic chain이 바뀐 perception)만 인코딩
+
+        Returns:
+            (n, dim) 임베딩, perceptions 순서
+        """
+        texts = [logic_text(p) for p in perceptions]
+        if not self.cache_path:
+            return self.encode(texts)
+
+        ids = [p['id'] for p in perceptions]
+        stamps = [hashlib.md5(t.encode('utf-8')).hexdigest() for t in texts]
+        store = EmbeddingStore(self.cache_path)
+
+        stale = [i for i in range(len(ids)) if store.stamp(ids[i]) != stamps[i]]
+        if stale:
+            vectors = self.encode([texts[i] for i in stale])
+            store.add([ids[i] for i in stale], vectors, [stamps[i] for i in stale])
+
+        print(f"  Logic chain 임베딩: {len(ids) - len(stale)}개 캐시, {len(stale)}개 새로 계산")
+
+        # window 밖으로 나간 perception / 이전 행이 살아있는 행보다 많으면 정리
+        if store.total_rows > 2 * len(ids):
+            store.compact(ids)
+
+        return store.get(ids)
+
+    def cluster(
+        self,
+        perceptions: List[Dict],
+        representatives: int = 5,
+        preferred_ids: Optional[Set[str]] = None
+    ) -> List[Dict]:
+        """
+        Cluster perceptions and summarize each cluster
+
+        Args:
+            perceptions: perception dicts (mechanisms, actor, logic_chain)
+            representatives: 클러스터당 대표 perception 수 (centroid에 가장 가까운 순)
+            preferred_ids: 대표로 먼저 고를 perception id (층화 샘플) - 클러스터 안에서
+                           centroid 거리 순으로 우선 선택, 부족하면 나머지 멤버로 채움
+
+        Returns:
+            크기 내림차순 클러스터 요약
+            [
+                {
+                    'cluster_id': int,
+                    'size': int,
+                    'share': float,
+                    'top_mechanisms': [[mechanism, count], ...],
+                    'top_actors': [[actor, count], ...],
+                    'representatives': [{'mechanisms', 'actor', 'logic_chain'}, ...],
+                    'perception_ids': [...]
+                },
+                ...
+            ]
+        """
+        if len(perceptions) <= self.k_range.start:
+            return []
+
+        X = self.features(perceptions)
+        labels = self._fit(X)
+
+        clusters = []
+        for label in sorted(set(labels)):
+            if label < 0:
+                continue  # HDBSCAN noise
+
+            idx = np.where(labels == label)[0]
+            centroid = X[idx].mean(axis=0)
+            ranked = idx[np.argsort(np.linalg.norm(X[idx] - centroid, axis=1), kind='stable')]
+            if preferred_ids:
+                ranked = sorted(ranked, key=lambda i: perceptions[i].get('id') not in preferred_ids)
+            nearest = ranked[:representatives]
+
+            members = [perceptions[i] for i in idx]
+            clusters.append({
+                'cluster_id': int(label),
+                'size': len(idx),
+                'share': round(len(idx) / len(perceptions), 4),
+                'top_mechanisms': self._top_counts(m for p in members for m in set(p.get('mechanisms') or [])),
+                'top_actors': self._top_counts((actor_subject(p.get('actor')) for p in members), limit=5),
+                'representatives': [
+                    {
+                        'mechanisms': perceptions[i].get('mechanisms', []),
+                        'actor': perceptions[i].get('actor', {}),
+                        'logic_chain': (perceptions[i].get('logic_chain') or [])[:3]
+                    }
+                    for i in nearest
+                ],
+                'perception_ids': [p['id'] for p in members]
+            })
+
+        clusters.sort(key=lambda c: c['size'], reverse=True)
+        return clusters
+
+    def _fit(self, X: np.ndarray) -> np.ndarray:
+        if self.method == 'hdbscan':
+            min_size = max(5, len(X) // 50)
+            return HDBSCAN(min_cluster_size=min_size).fit_predict(X)
+
+        # k 선택: 후보 k 중 silhouette 최대 (큰 데이터는 샘플로 평가)
+        best_labels, best_score = None, -1.0
+        sample_size = min(len(X), 2000)
+        for k in self.k_range:
+            if k >= len(X):
+                break
+            labels = MiniBatchKMeans(
+                n_clusters=k,
+                random_state=self.random_state,
+                batch_size=1024,
+                n_init=3
+            ).fit_predict(X)
+            score = silhouette_score(X, labels, sample_size=sample_size, random_state=self.random_state)
+            if score > best_score:
+                best_labels, best_score = labels, score
+
+        return best_labels
+
+    @staticmethod
+    def _top_counts(items, limit: int = None) -> List[List]:
+        counts = {}
+        for item in items:
+            counts[item] = counts.get(item, 0) + 1
+        ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        return [list(x) for x in ranked[:limit]]
@@ -17,6 +17,8 @@ import asyncio
 from typing import Dict, List
 from uuid import UUID
 from engines.utils.supabase_client import get_supabase
+from engines.analyzers.mechanism_stats import MechanismStatsStore
+from engines.utils.prompt_body import prepare_content
 
 client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
 
@@ -26,6 +28,7 @@ class ReasoningStructureExtractor:
 
     def __init__(self):
         self.supabase = get_supabase()
+        self.stats_store = MechanismStatsStore()
 
     async def extract(self, content: Dict) -> UUID:
         """
@@ -38,11 +41,13 @@ class ReasoningStructureExtractor:
             UUID of created/updated layered_perception
         """
 
+        prepared = prepare_content(content)
+
         prompt = f"""
 다음 담론을 단계별로 분석하세요:
 
-제목: {content['title']}
-내용: {content['body'][:2000]}
+제목: {prepared['title']}
+내용: {prepared['body']}
 
 ## Step 1: 추론 흐름 파악
 
@@ -157,7 +162,7 @@ JSON 형식:
 
         # Check if perception already exists
         existing = self.supabase.table('layered_perceptions')\
-            .select('id')\
+            .select('id, mechanisms, created_at')\
             .eq('content_id', content_id)\
             .execute().data
 
@@ -187,7 +192,8 @@ JSON 형식:
                 .update(perception_data)\
                 .eq('id', existing[0]['id'])\
                 .execute()
-            return UUID(existing[0]['id'])
+            perception_id = UUID(existing[0]['id'])
+            created_at = existing[0].get('created_at')
         else:
             # Insert new
             result = self.supabase.table('layered_perceptions')\
@@ -195,10 +201,21 @@ JSON 형식:
                 .execute()
 
             if result.data:
-                return UUID(result.data[0]['id'])
+                perception_id = UUID(result.data[0]['id'])
+                created_at = result.data[0].get('created_at')
             else:
                 raise Exception("Failed to save layered perception")
 
+        # 증분 통계 갱신 (처음 메커니즘이 기록된 perception만 → 재추출 시 중복 집계 방지)
+        # created_at 날짜 버킷 → rebuild()와 같은 기준
+        if not (existing and existing[0].get('mechanisms')):
+            try:
+                self.stats_store.record({**perception_data, 'created_at': created_at})
+            except Exception as e:
+                print(f"  ⚠️  통계 갱신 실패: {e}")
+
+        return perception_id
+
     async def extract_batch(self, contents: List[Dict], batch_size: int = 5) -> List[UUID]:
         """
         Extract reasoning structures from multiple contents in parallel
@@ -0,0 +1,128 @@
+"""
+WorldviewDiffer - 임베딩 기반 세계관 diff
+
+기존 세계관과 새로 추출된 세계관을 결정적으로 비교:
+1. 제목 + frame 요약을 임베딩
+2. 코사인 유사도 행렬에서 최적 1:1 대응 (Hungarian, linear_sum_assignment)
+3. 임계값으로 분류
+   - stable: 거의 같은 세계관
+   - evolved: 같은 세계관이 변화
+   - ambiguous: 판단 애매 → LLM이 쌍 단위로만 판정
+   - 대응 없음 → new / disappeared
+
+제목 문자열 일치에 의존하지 않으므로 제목이 바뀐 세계관도 id로 추적됨
+"""
+
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from scipy.optimize import linear_sum_assignment
+from engines.utils.sentence_encoder import get_encoder
+from engines.analyzers.worldview_frame import WorldviewFrame
+from engines.utils.embedding_store import cosine_similarity
+
+
+def frame_text(worldview: Dict) -> str:
+    """Flatten actor / mechanisms / logic pattern into one sentence for embedding"""
+    frame = worldview if isinstance(worldview, WorldviewFrame) else WorldviewFrame.from_row(worldview)
+    actor = frame.actor
+
+    parts = [
+        f"{actor['subject']}: {actor['purpose']}" if actor['subject'] else '',
+        ', '.join(str(m) for m in actor['methods']),
+        ', '.join(sorted(frame.mechanisms)),
+        f"{frame.logic_pattern.get('trigger', '')} → {frame.logic_pattern.get('conclusion', '')}" if frame.logic_pattern else ''
+    ]
+
+    return ' / '.join(p for p in parts if p.strip()) or frame.title
+
+
+def _default_encode(texts: List[str]) -> np.ndarray:
+    # 다국어 mpnet (sentence_encoder, 첫 호출 때 로드 / 프로세스당 1개)
+    return get_encoder().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+class WorldviewDiffer:
+    """Deterministic old → new worldview diff via embedding similarity + optimal assignment"""
+
+    def __init__(
+        self,
+        encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+        stable_threshold: float = 0.85,
+        evolved_threshold: float = 0.70,
+        ambiguous_threshold: float = 0.55,
+        title_weight: float = 0.5
+    ):
+        """
+        Args:
+            encode: texts → (n, dim) 임베딩 (기본: 다국어 mpnet, 첫 호출 때 로드)
+            stable_threshold: 이상이면 유지
+            evolved_threshold: 이상이면 진화
+            ambiguous_threshold: 이상이면 LLM 판정 대상, 미만이면 다른 세계관
+            title_weight: 제목 유사도 가중치 (나머지는 frame 유사도)
+        """
+        self.encode = encode or _default_encode
+        self.stable_threshold = stable_threshold
+        self.evolved_threshold = evolved_threshold
+        self.ambiguous_threshold = ambiguous_threshold
+        self.title_weight = title_weight
+
+    def similarity_matrix(self, existing: List[Dict], new: List[Dict]) -> np.ndarray:
+        """
+        Weighted cosine similarity (len(existing), len(new))
+        """
+        if not existing or not new:
+            return np.zeros((len(existing), len(new)))
+
+        titles = [wv.get('title', '') for wv in existing + new]
+        frames = [frame_text(wv) for wv in existing + new]
+
+        title_vecs = self.encode(titles)
+        frame_vecs = self.encode(frames)
+
+        n_old = len(existing)
+        title_sim = cosine_similarity(title_vecs[:n_old], title_vecs[n_old:])
+        frame_sim = cosine_similarity(frame_vecs[:n_old], frame_vecs[n_old:])
+
+        return self.title_weight * title_sim + (1 - self.title_weight) * frame_sim
+
+    def diff(self, existing: List[Dict], new: List[Dict]) -> Dict:
+        """
+        Classify existing/new worldview pairs
+
+        Returns:
+            {
+                'stable': [{'old': wv, 'new': wv, 'similarity': float}, ...],
+                'evolved': [...],
+                'ambiguous': [...],
+                'new': [wv, ...],
+                'disappeared': [wv, ...]
+            }
+        """
+        result = {'stable': [], 'evolved': [], 'ambiguous': [], 'new': [], 'disappeared': []}
+
+        sim = self.similarity_matrix(existing, new)
+        matched_old, matched_new = set(), set()
+
+        if sim.size:
+            rows, cols = linear_sum_assignment(sim, maximize=True)
+            for i, j in zip(rows, cols):
+                score = float(sim[i, j])
+                if score < self.ambiguous_threshold:
+                    continue
+
+                pair = {'old': existing[i], 'new': new[j], 'similarity': round(score, 4)}
+                if score >= self.stable_threshold:
+                    result['stable'].append(pair)
+                elif score >= self.evolved_threshold:
+                    result['evolved'].append(pair)
+                else:
+                    result['ambiguous'].append(pair)
+
+                matched_old.add(i)
+                matched_new.add(j)
+
+        result['disappeared'] = [wv for i, wv in enumerate(existing) if i not in matched_old]
+        result['new'] = [wv for j, wv in enumerate(new) if j not in matched_new]
+
+        return result
+
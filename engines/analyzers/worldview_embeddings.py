@@ -0,0 +1,130 @@
+"""
+WorldviewEmbeddingIndex - 임베딩 기반 세계관 후보 선별 (MechanismMatcher 1단계)
+
+HybridPerceptionMatcher(_deprecated)에서 확인한 임베딩 검색의 장점만 가져와서:
+1. 세계관 frame 텍스트 임베딩 (sentence_encoder 다국어 mpnet)
+   → EmbeddingStore(memmap)에 id별로 저장, worldviews.last_updated가 바뀐 세계관만 다시 계산
+2. perception logic chain + deep beliefs 임베딩으로 top-k 세계관 검색 (cosine top_k)
+3. top-k만 기존 Actor/Mechanism/Logic 점수로 재정렬 (MechanismMatcher)
+
+사용 예시:
+    index = WorldviewEmbeddingIndex().build(worldviews)
+    candidates = index.search(perceptions, k=10)  # [[worldview 위치, ...], ...]
+"""
+
+import os
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from engines.utils.sentence_encoder import get_encoder
+from engines.analyzers.worldview_differ import frame_text
+from engines.utils.embedding_store import EmbeddingStore, top_k
+
+DEFAULT_CACHE_PATH = os.getenv('WORLDVIEW_EMBEDDING_CACHE', 'embedding_cache/worldviews')
+
+
+def perception_text(perception: Dict) -> str:
+    """Logic chain + deep beliefs (매칭용 perception 텍스트)"""
+    parts = []
+    for field in ('logic_chain', 'deep_beliefs'):
+        value = perception.get(field) or []
+        if isinstance(value, list):
+            parts.extend(str(v) for v in value)
+        else:
+            parts.append(str(value))
+    return ' '.join(p for p in parts if p.strip())
+
+
+def worldview_text(worldview: Dict) -> str:
+    """Title + flattened frame"""
+    return f"{worldview.get('title', '')} / {frame_text(worldview)}"
+
+
+def _default_encode(texts: List[str]) -> np.ndarray:
+    return get_encoder().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+class WorldviewEmbeddingIndex:
+    """Cached worldview embeddings + top-k cosine search"""
+
+    def __init__(
+        self,
+        encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH
+    ):
+        """
+        Args:
+            encode: texts → (n, dim) 임베딩 (기본: 다국어 mpnet, 첫 호출 때 로드)
+            cache_path: 세계관 임베딩 저장소 디렉토리 (EmbeddingStore), None이면 캐시하지 않음
+        """
+        self.encode = encode or _default_encode
+        self.cache_path = cache_path
+        self.matrix = None
+        self.size = 0
+
+    def build(self, worldviews: List[Dict]) -> 'WorldviewEmbeddingIndex':
+        """
+        Embed worldviews (cache hit if last_updated is unchanged) and build the search matrix
+
+        Args:
+            worldviews: worldviews rows (id, title, frame, last_updated), 검색 결과 위치 = 이 순서
+
+        Returns:
+            self
+        """
+        stamps = [str(wv.get('last_updated')) for wv in worldviews]
+        store = EmbeddingStore(self.cache_path) if self.cache_path else None
+
+        stale = [
+            i for i, wv in enumerate(worldviews)
+            if store is None or store.stamp(wv['id']) != stamps[i]
+        ]
+
+        vectors = None
+        if stale:
+            vectors = self.encode([worldview_text(worldviews[i]) for i in stale])
+            if store is not None:
+                store.add([worldviews[i]['id'] for i in stale], vectors, [stamps[i] for i in stale])
+
+        print(f"  세계관 임베딩: {len(worldviews) - len(stale)}개 캐시, {len(stale)}개 새로 계산")
+
+        self.size = len(worldviews)
+        if not worldviews:
+            self.matrix = None
+            return self
+
+        if store is None:
+            self.matrix = np.asarray(vectors)
+            return self
+
+        # 갱신/보관(archived)된 세계관의 이전 행이 살아있는 행보다 많으면 정리
+        current = [wv['id'] for wv in worldviews]
+        if store.total_rows > 2 * len(current):
+            store.compact(current)
+
+        self.matrix = store.get(current)
+        return self
+
+    def search(self, perceptions: List[Dict], k: int = 10) -> List[Optional[List[int]]]:
+        """
+        Top-k worldview positions for each perception
+
+        Returns:
+            perception별 worldview 위치 리스트 (유사도 내림차순),
+            텍스트가 없는 perception은 None (후보를 좁히지 않음)
+        """
+        results: List[Optional[List[int]]] = [None] * len(perceptions)
+        if self.matrix is None:
+            return results
+
+        texts = [perception_text(p) for p in perceptions]
+        positions = [i for i, text in enumerate(texts) if text]
+        if not positions:
+            return results
+
+        queries = self.encode([texts[i] for i in positions])
+        _, neighbors = top_k(queries, self.matrix, k)
+
+        for i, row in zip(positions, neighbors):
+            results[i] = [int(j) for j in row if j >= 0]
+
+        return results
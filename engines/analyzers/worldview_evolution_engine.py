@@ -14,9 +14,12 @@ from anthropic import Anthropic
 import os
 import json
 import asyncio
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from engines.utils.supabase_client import get_supabase
+from engines.analyzers.mechanism_stats import MechanismStatsStore, actor_subject
+from engines.analyzers.worldview_differ import WorldviewDiffer, frame_text
+from engines.analyzers.perception_clusterer import PerceptionClusterer
 
 client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
 
@@ -24,15 +27,24 @@ client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
 class WorldviewEvolutionEngine:
     """Evolving worldview system that adapts to discourse changes"""
 
-    def __init__(self):
+    def __init__(self, window_days: int = 90, sample_seed: Optional[float] = None):
+        """
+        Args:
+            window_days: 통계 집계 기간 (active window, 기본 90일)
+            sample_seed: 층화 샘플링 seed (-1 ~ 1, 지정하면 같은 샘플 재현)
+        """
         self.supabase = get_supabase()
+        self.window_days = window_days
+        self.sample_seed = sample_seed
+        self.differ = WorldviewDiffer()
+        self.clusterer = PerceptionClusterer()
 
     async def run_evolution_cycle(self, sample_size: int = 200) -> Dict:
         """
         Run a complete evolution cycle
 
         Args:
-            sample_size: Number of recent perceptions to analyze
+            sample_size: Number of perceptions to sample from the window
 
         Returns:
             Evolution report with changes detected
@@ -44,7 +56,7 @@ class WorldviewEvolutionEngine:
 
         # 1. Load recent perceptions
         perceptions = await self._load_recent_perceptions(sample_size)
-        print(f"\n✅ 최근 {len(perceptions)}개 perception 로드")
+        print(f"\n✅ {len(perceptions)}개 perception 샘플 로드 (최근 {self.window_days}일 층화)")
 
         # 2. Extract new worldviews from current data
         new_worldviews = await self._consolidate_worldviews(perceptions)
@@ -75,7 +87,27 @@ class WorldviewEvolutionEngine:
         return report
 
     async def _load_recent_perceptions(self, limit: int) -> List[Dict]:
-        """Load most recent perceptions with reasoning structures"""
+        """
+        Load a representative sample of perceptions with reasoning structures
+
+        sample_perceptions_stratified RPC: window 안에서 날짜별 균등 + 메커니즘 균형 샘플
+        (RPC 실패 시 최신 limit개)
+
+        클러스터링은 window 전체로 하고, 이 샘플은 클러스터 대표 perception으로 우선 사용
+        → 하루치 폭주 글이 LLM에 보이는 대표를 독점하지 않음
+        """
+
+        try:
+            result = self.supabase.rpc('sample_perceptions_stratified', {
+                'sample_size': limit,
+                'days_window': self.window_days,
+                'seed': self.sample_seed
+            }).execute()
+
+            if result.data:
+                return result.data
+        except Exception as e:
+            print(f"  ⚠️  층화 샘플링 RPC 실패, 최신 perception 사용: {e}")
 
         perceptions = self.supabase.table('layered_perceptions')\
             .select('id, content_id, mechanisms, actor, logic_chain, consistency_pattern, deep_beliefs, implicit_assumptions, created_at')\
@@ -91,7 +123,9 @@ class WorldviewEvolutionEngine:
 
     async def _consolidate_worldviews(self, perceptions: List[Dict]) -> List[Dict]:
         """
-        Use GPT-5 to consolidate perceptions into 5-10 core worldviews
+        Consolidate perceptions into 5-10 core worldviews
+
+        Active window 전체를 로컬 클러스터링한 뒤 Claude는 클러스터에 이름/설명만 부여
 
         Args:
             perceptions: List of perception dicts with reasoning structures
@@ -100,46 +134,34 @@ class WorldviewEvolutionEngine:
             List of worldview dicts
         """
 
-        # Prepare statistics
-        mechanism_counts = {}
-        actor_counts = {}
-        logic_chain_samples = []
-
-        for p in perceptions[:200]:
-            # Mechanisms
-            for mech in p.get('mechanisms', []):
-                mechanism_counts[mech] = mechanism_counts.get(mech, 0) + 1
-
-            # Actors
-            actor = p.get('actor', {})
-            if isinstance(actor, dict):
-                subj = actor.get('subject', 'Unknown')
-                if isinstance(subj, list):
-                    subj = ', '.join(str(s) for s in subj)
-                elif not isinstance(subj, str):
-                    subj = str(subj)
-                actor_counts[subj] = actor_counts.get(subj, 0) + 1
-
-            # Logic chain samples
-            logic = p.get('logic_chain', [])
-            if logic and len(logic) > 0:
-                logic_chain_samples.append(logic[0])
-
-        # Top stats
-        top_mechs = sorted(mechanism_counts.items(), key=lambda x: x[1], reverse=True)
-        top_actors = sorted(actor_counts.items(), key=lambda x: x[1], reverse=True)
-
-        # Sample data (simplified)
-        sample_data = []
-        for p in perceptions[:5]:
-            sample_data.append({
-                'mechanisms': p.get('mechanisms', []),
-                'actor': p.get('actor', {}),
-                'logic_chain': p.get('logic_chain', [])[:3] if p.get('logic_chain') else []
-            })
+        # Corpus-wide statistics (RPC, fallback: loaded sample)
+        stats = await self._load_corpus_statistics(perceptions)
+        top_mechs = stats['mechanism_counts']
+        top_actors = stats['actor_counts']
+        top_pairs = stats['cooccurrence']
+
+        # Local clustering over the whole window (LLM only names clusters)
+        clusters = await self._cluster_window(perceptions)
+
+        # 클러스터가 없으면 (perception 부족 / 전부 noise) 근거 없는 세계관을 만들지 않도록 중단
+        if not clusters:
+            print("\n⚠️  클러스터 없음 → 세계관 추출 건너뜀")
+            return []
+
+        cluster_summaries = [
+            {
+                'cluster_id': c['cluster_id'],
+                'size': c['size'],
+                'share': c['share'],
+                'top_mechanisms': c['top_mechanisms'],
+                'top_actors': c['top_actors'],
+                'representatives': c['representatives']
+            }
+            for c in clusters
+        ]
 
         prompt = f"""
-{len(perceptions)}개 담론 통계 분석:
+{stats['perception_count']}개 담론 통계 분석:
 
 ## 메커니즘 빈도
 {json.dumps(top_mechs, ensure_ascii=False, indent=2)}
@@ -147,11 +169,12 @@ class WorldviewEvolutionEngine:
 ## Actor 빈도
 {json.dumps(top_actors, ensure_ascii=False, indent=2)}
 
-## Logic Chain 시작점 샘플 (10개)
-{json.dumps(logic_chain_samples[:10], ensure_ascii=False, indent=2)}
+## 메커니즘 공출현 (함께 나타난 perception 수)
+{json.dumps(top_pairs, ensure_ascii=False, indent=2)}
 
-전체 데이터 샘플:
-{json.dumps(sample_data, ensure_ascii=False, indent=2)}
+## Perception 클러스터 ({len(clusters)}개, 메커니즘/Actor/Logic chain 특징으로 사전 군집화)
+각 클러스터: 크기, 비율, 주요 메커니즘/Actor, centroid에 가장 가까운 대표 perception
+{json.dumps(cluster_summaries, ensure_ascii=False, indent=2)}
 
 ---
 
@@ -159,15 +182,17 @@ class WorldviewEvolutionEngine:
 
 ### 분석 기준
 
-1. **유의미한 공출현**: 어떤 메커니즘들이 자주 함께 나타나는가?
-2. **지배적 Actor**: 가장 자주 언급되는 Actor는?
-3. **공통 Logic 패턴**: Logic Chain 시작점의 공통점은?
+1. **클러스터 = 세계관 후보**: 각 클러스터의 대표 perception이 공유하는 시각은?
+2. **유의미한 공출현**: 어떤 메커니즘들이 자주 함께 나타나는가?
+3. **지배적 Actor**: 클러스터마다 지배적인 Actor는?
 
 ### 세계관 정의
 
-위 통계를 바탕으로 **5-10개의 핵심 세계관**을 정의하세요.
+**클러스터마다 하나의 세계관**으로 이름과 설명을 붙이세요.
+같은 시각의 클러스터는 합치고, 해석이 불가능한 클러스터는 건너뛰어도 됩니다.
+사용한 클러스터는 cluster_ids에 적으세요.
 
-⚠️ 주의: 단순 빈도가 아닌 **의미있는 조합**을 찾으세요.
+⚠️ 주의: 클러스터 구성에 근거하세요. 없는 세계관을 새로 만들지 마세요.
 
 ## 🎯 세계관 제목 작성 원칙 (매우 중요!)
 
@@ -205,6 +230,7 @@ JSON 형식:
         "skipped_verification": "생략",
         "conclusion": "결론"
       }},
+      "cluster_ids": [0],
       "statistical_basis": {{
         "top_mechanisms": ["메커니즘들"],
         "top_actor": "Actor",
@@ -231,23 +257,17 @@ JSON 형식:
             )
         )
 
-        response_text = response.content[0].text
-
-        # Parse JSON
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            json_str = response_text[json_start:json_end].strip()
-        elif "{" in response_text:
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            json_str = response_text[json_start:json_end]
-        else:
-            json_str = response_text
-
-        result = json.loads(json_str)
+        result = self._parse_json_response(response.content[0].text)
         worldviews = result.get('worldviews', [])
 
+        # 클러스터 크기를 실제 근거 수로 사용
+        sizes = {c['cluster_id']: c['size'] for c in clusters}
+        for wv in worldviews:
+            covered = sum(sizes.get(cid, 0) for cid in wv.get('cluster_ids') or [])
+            if covered:
+                wv.setdefault('statistical_basis', {})['occurrence_count'] = covered
+                wv['estimated_coverage_pct'] = round(100 * covered / max(sum(sizes.values()), 1), 1)
+
         # Print summary
         for i, wv in enumerate(worldviews, 1):
             print(f"  {i}. {wv['title']}")
@@ -255,11 +275,112 @@ JSON 형식:
 
         return worldviews
 
+    async def _cluster_window(self, perceptions: List[Dict]) -> List[Dict]:
+        """
+        Cluster every perception in the active window (fallback: loaded sample)
+
+        대표 perception은 층화 샘플에 속한 클러스터 멤버를 우선 선택
+
+        Returns:
+            PerceptionClusterer.cluster() 결과
+        """
+        loop = asyncio.get_event_loop()
+
+        try:
+            window = await loop.run_in_executor(None, self.clusterer.load_window, self.window_days)
+        except Exception as e:
+            print(f"  ⚠️  window 로드 실패, 샘플로 클러스터링: {e}")
+            window = perceptions
+
+        print(f"\n🔍 {len(window)}개 perception 클러스터링 중...")
+        sample_ids = {p['id'] for p in perceptions if p.get('id')}
+        clusters = await loop.run_in_executor(
+            None,
+            lambda: self.clusterer.cluster(window or perceptions, preferred_ids=sample_ids)
+        )
+
+        for c in clusters:
+            print(f"  #{c['cluster_id']}: {c['size']}개 ({c['share']:.1%}) - {c['top_mechanisms'][:2]}")
+
+        return clusters
+
+    async def _load_corpus_statistics(self, perceptions: List[Dict]) -> Dict:
+        """
+        Active window 전체의 메커니즘/Actor/공출현 통계
+
+        1. 증분 통계 저장소 (mechanism_daily_stats, window 전체를 커버할 때)
+        2. get_mechanism_statistics RPC
+        1과 2는 같은 집계 (created_at window, archived perception 제외) - 아카이브/삭제 시
+        MechanismStatsStore.refresh_days()/rebuild()로 버킷을 다시 계산하므로 서로 대체 가능
+        (Actor 빈도만 1은 Count-Min 추정치)
+        3. 로드된 perception 샘플로 계산
+
+        Returns:
+            {
+                'perception_count': int,
+                'mechanism_counts': [[mechanism, count], ...],
+                'actor_counts': [[actor, count], ...],
+                'cooccurrence': [[mechanism_a, mechanism_b, count], ...]
+            }
+        """
+        try:
+            store = MechanismStatsStore()
+            if store.has_window(self.window_days):
+                return store.window(self.window_days)
+        except Exception as e:
+            print(f"  ⚠️  증분 통계 조회 실패: {e}")
+
+        try:
+            result = self.supabase.rpc('get_mechanism_statistics', {
+                'days_window': self.window_days
+            }).execute()
+
+            if result.data and result.data.get('perception_count'):
+                return result.data
+        except Exception as e:
+            print(f"  ⚠️  통계 RPC 실패, 샘플로 계산: {e}")
+
+        return self._compute_sample_statistics(perceptions)
+
+    def _compute_sample_statistics(self, perceptions: List[Dict]) -> Dict:
+        """Compute the same statistics as get_mechanism_statistics from a sample"""
+
+        mechanism_counts = {}
+        actor_counts = {}
+        pair_counts = {}
+
+        for p in perceptions:
+            # Mechanisms (+ co-occurrence pairs)
+            mechs = sorted(set(p.get('mechanisms', [])))
+            for i, mech in enumerate(mechs):
+                mechanism_counts[mech] = mechanism_counts.get(mech, 0) + 1
+                for other in mechs[i + 1:]:
+                    pair_counts[(mech, other)] = pair_counts.get((mech, other), 0) + 1
+
+            # Actors
+            if isinstance(p.get('actor'), dict):
+                subj = actor_subject(p['actor'])
+                actor_counts[subj] = actor_counts.get(subj, 0) + 1
+
+        return {
+            'perception_count': len(perceptions),
+            'mechanism_counts': [list(x) for x in sorted(mechanism_counts.items(), key=lambda x: x[1], reverse=True)],
+            'actor_counts': [list(x) for x in sorted(actor_counts.items(), key=lambda x: x[1], reverse=True)[:30]],
+            'cooccurrence': [[a, b, c] for (a, b), c in sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)]
+        }
+
     async def _load_existing_worldviews(self) -> List[Dict]:
-        """Load existing worldviews from database"""
+        """
+        Load existing top-level worldviews from database
+
+        하위 세계관(level 2, parent_worldview_id)은 새로 추출한 5-10개 세계관과 1:1 대응이 안 되므로
+        diff 대상에서 제외 → 매 사이클 disappeared로 아카이브되지 않음
+        """
 
         worldviews = self.supabase.table('worldviews')\
             .select('*')\
+            .neq('archived', True)\
+            .is_('parent_worldview_id', 'null')\
             .execute().data
 
         return worldviews
@@ -268,6 +389,9 @@ JSON 형식:
         """
         Detect changes between existing and new worldviews
 
+        임베딩 유사도 + 최적 대응(WorldviewDiffer)으로 결정적으로 분류하고,
+        애매한 쌍만 Claude로 판정
+
         Returns:
             Dict with change details
         """
@@ -276,73 +400,147 @@ JSON 형식:
         print("변화 감지")
         print("="*80)
 
-        # Parse existing worldview structures
-        existing_parsed = []
-        for wv in existing:
-            try:
-                frame = json.loads(wv.get('frame', '{}'))
-                existing_parsed.append({
-                    'id': wv['id'],
-                    'title': wv['title'],
-                    'frame': frame
-                })
-            except:
-                # Old format worldview - treat as legacy
-                existing_parsed.append({
-                    'id': wv['id'],
-                    'title': wv['title'],
-                    'frame': {}
-                })
-
-        # Compare using GPT-5
-        comparison_prompt = f"""
-기존 세계관 ({len(existing_parsed)}개):
-{json.dumps([{'title': e['title']} for e in existing_parsed], ensure_ascii=False, indent=2)}
-
-새 세계관 ({len(new)}개):
-{json.dumps([{'title': w['title'], 'actor': w['actor']} for w in new], ensure_ascii=False, indent=2)}
-
-이 두 세계관 목록을 비교하고 변화를 분석해주세요:
-
-1. **새로 등장한 세계관** (기존에 없던 것)
-2. **사라진 세계관** (새 목록에 없는 것)
-3. **변화한 세계관** (비슷하지만 내용이 달라진 것)
-4. **유지된 세계관** (거의 같은 것)
+        # 추출 결과가 비면 기존 세계관이 전부 disappeared로 분류되어 아카이브됨 → 변화 없음으로 처리
+        if not new:
+            print(f"\n⚠️  추출된 세계관 없음 → 기존 {len(existing)}개 유지")
+            return {
+                'new_worldviews': [],
+                'disappeared_worldviews': [],
+                'evolved_worldviews': [],
+                'stable_worldviews': [wv['title'] for wv in existing],
+                'new_worldview_objects': [],
+                'disappeared_worldview_ids': [],
+                'evolved_worldview_objects': [],
+                'ambiguous_count': 0,
+                'significant': False,
+                'summary': f"추출된 세계관 없음 (기존 {len(existing)}개 유지, 변화 적용 안 함)"
+            }
+
+        diff = self.differ.diff(existing, new)
+
+        stable = diff['stable']
+        evolved = diff['evolved']
+        new_objects = diff['new']
+        disappeared = diff['disappeared']
+
+        # 애매한 쌍만 LLM 판정
+        if diff['ambiguous']:
+            verdicts = await self._adjudicate_pairs(diff['ambiguous'])
+            for pair, verdict in zip(diff['ambiguous'], verdicts):
+                if verdict['verdict'] == 'same':
+                    stable.append(pair)
+                elif verdict['verdict'] == 'evolved':
+                    pair['change_description'] = verdict.get('change_description', '')
+                    evolved.append(pair)
+                else:
+                    new_objects.append(pair['new'])
+                    disappeared.append(pair['old'])
+
+        changes = {
+            'new_worldviews': [wv['title'] for wv in new_objects],
+            'disappeared_worldviews': [wv['title'] for wv in disappeared],
+            'evolved_worldviews': [
+                {
+                    'old_id': pair['old']['id'],
+                    'old_title': pair['old']['title'],
+                    'new_title': pair['new']['title'],
+                    'similarity': pair['similarity'],
+                    'change_description': pair.get('change_description', '')
+                }
+                for pair in evolved
+            ],
+            'stable_worldviews': [pair['old']['title'] for pair in stable],
+            'new_worldview_objects': new_objects,
+            'disappeared_worldview_ids': [wv['id'] for wv in disappeared],
+            'evolved_worldview_objects': [
+                {'id': pair['old']['id'], 'version': pair['old'].get('version') or 1, 'worldview': pair['new']}
+                for pair in evolved
+            ],
+            'ambiguous_count': len(diff['ambiguous'])
+        }
+        changes['significant'] = bool(new_objects or disappeared or evolved)
+        changes['summary'] = (
+            f"신규 {len(new_objects)}, 소멸 {len(disappeared)}, "
+            f"진화 {len(evolved)}, 유지 {len(stable)} (LLM 판정 {len(diff['ambiguous'])}쌍)"
+        )
+
+        # Print summary
+        print(f"\n신규: {len(changes['new_worldviews'])}개")
+        print(f"소멸: {len(changes['disappeared_worldviews'])}개")
+        print(f"진화: {len(changes['evolved_worldviews'])}개")
+        print(f"유지: {len(changes['stable_worldviews'])}개")
+        print(f"\n요약: {changes['summary']}")
+
+        return changes
+
+    async def _adjudicate_pairs(self, pairs: List[Dict]) -> List[Dict]:
+        """
+        Ask Claude whether ambiguous (old, new) pairs are the same worldview
+
+        Returns:
+            pairs와 같은 순서의 [{'verdict': 'same'|'evolved'|'different', 'change_description': str}, ...]
+        """
+
+        items = [
+            {
+                'index': i,
+                'old': {'title': pair['old']['title'], 'frame': frame_text(pair['old'])},
+                'new': {'title': pair['new']['title'], 'frame': frame_text(pair['new'])}
+            }
+            for i, pair in enumerate(pairs)
+        ]
+
+        prompt = f"""
+다음은 기존 세계관과 새로 추출된 세계관의 후보 쌍입니다 (임베딩 유사도가 애매한 쌍만).
+
+{json.dumps(items, ensure_ascii=False, indent=2)}
+
+각 쌍에 대해 판정하세요:
+- "same": 같은 세계관 (표현만 다름)
+- "evolved": 같은 세계관이 내용적으로 변화함
+- "different": 서로 다른 세계관
 
 JSON 형식:
 {{
-  "new_worldviews": ["새 세계관 title 1", ...],
-  "disappeared_worldviews": ["사라진 세계관 title 1", ...],
-  "evolved_worldviews": [
-    {{
-      "old_title": "기존 title",
-      "new_title": "새 title",
-      "change_description": "변화 설명"
-    }}
-  ],
-  "stable_worldviews": ["유지된 세계관 title 1", ...],
-  "significant": true,  // 유의미한 변화가 있는가?
-  "summary": "변화 요약 (1-2문장)"
+  "pairs": [
+    {{"index": 0, "verdict": "same|evolved|different", "change_description": "evolved일 때 변화 설명"}}
+  ]
 }}
 """
 
-        # Claude Sonnet 4.5
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                temperature=0,
-                messages=[
-                    {"role": "user", "content": comparison_prompt}
-                ]
+        try:
+            loop = asyncio.get_event_loop()
+            response = await loop.run_in_executor(
+                None,
+                lambda: client.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=2048,
+                    temperature=0,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
             )
-        )
 
-        response_text = response.content[0].text
+            result = self._parse_json_response(response.content[0].text)
+            by_index = {item['index']: item for item in result.get('pairs', [])}
+        except Exception as e:
+            print(f"  ⚠️  애매한 쌍 판정 실패, 임계값 기준으로 분류: {e}")
+            by_index = {}
+
+        verdicts = []
+        for i, pair in enumerate(pairs):
+            verdict = by_index.get(i)
+            if not verdict or verdict.get('verdict') not in ('same', 'evolved', 'different'):
+                # 판정 없으면 대응은 유지하고 진화로 취급
+                verdict = {'verdict': 'evolved', 'change_description': ''}
+            verdicts.append(verdict)
+
+        return verdicts
+
+    def _parse_json_response(self, response_text: str) -> Dict:
+        """Extract the JSON object from a Claude response (```json block or bare braces)"""
 
-        # Parse JSON
         if "```json" in response_text:
             json_start = response_text.find("```json") + 7
             json_end = response_text.find("```", json_start)
@@ -354,24 +552,7 @@ JSON 형식:
         else:
             json_str = response_text
 
-        changes = json.loads(json_str)
-
-        # Add actual worldview objects
-        changes['new_worldview_objects'] = [
-            wv for wv in new if wv['title'] in changes.get('new_worldviews', [])
-        ]
-        changes['disappeared_worldview_ids'] = [
-            wv['id'] for wv in existing_parsed if wv['title'] in changes.get('disappeared_worldviews', [])
-        ]
-
-        # Print summary
-        print(f"\n신규: {len(changes.get('new_worldviews', []))}개")
-        print(f"소멸: {len(changes.get('disappeared_worldviews', []))}개")
-        print(f"진화: {len(changes.get('evolved_worldviews', []))}개")
-        print(f"유지: {len(changes.get('stable_worldviews', []))}개")
-        print(f"\n요약: {changes.get('summary', '')}")
-
-        return changes
+        return json.loads(json_str)
 
     async def _apply_changes(self, changes: Dict):
         """
@@ -402,23 +583,25 @@ JSON 형식:
             await self._insert_worldview(wv_data)
             print(f"  ✨ 신규 생성: {wv_data['title']}")
 
-        # 3. Update evolved worldviews
-        # (For now, just create new versions - can be enhanced later)
+        # 3. Update evolved worldviews (same id, next version)
+        for evolved in changes.get('evolved_worldview_objects', []):
+            await self._update_worldview(evolved['id'], evolved['worldview'], evolved['version'] + 1)
+            print(f"  🔄 진화: {evolved['worldview']['title']} (v{evolved['version'] + 1})")
 
-        print(f"\n✅ {len(changes.get('new_worldview_objects', []))}개 신규, {len(changes.get('disappeared_worldview_ids', []))}개 아카이브")
+        print(f"\n✅ {len(changes.get('new_worldview_objects', []))}개 신규, {len(changes.get('evolved_worldview_objects', []))}개 진화, {len(changes.get('disappeared_worldview_ids', []))}개 아카이브")
 
     async def _insert_worldview(self, wv_data: Dict):
         """Insert a new worldview into database"""
 
         worldview = {
             'title': wv_data['title'],
-            'frame': json.dumps({
+            'frame': {
                 'actor': wv_data['actor'],
                 'core_mechanisms': wv_data['core_mechanisms'],
                 'logic_pattern': wv_data['logic_pattern'],
                 'examples': wv_data.get('examples', []),
                 'estimated_coverage_pct': wv_data.get('estimated_coverage_pct', 0)
-            }, ensure_ascii=False),
+            },
             'description': wv_data['logic_pattern']['trigger'] + ' → ' + wv_data['logic_pattern']['conclusion'],
             'core_subject': wv_data['actor'],
             'core_attributes': wv_data['core_mechanisms'],
@@ -431,6 +614,28 @@ JSON 형식:
 
         self.supabase.table('worldviews').insert(worldview).execute()
 
+    async def _update_worldview(self, worldview_id: str, wv_data: Dict, version: int):
+        """Overwrite an evolved worldview's title/frame, keeping its id and links"""
+
+        self.supabase.table('worldviews')\
+            .update({
+                'title': wv_data['title'],
+                'frame': {
+                    'actor': wv_data['actor'],
+                    'core_mechanisms': wv_data['core_mechanisms'],
+                    'logic_pattern': wv_data['logic_pattern'],
+                    'examples': wv_data.get('examples', []),
+                    'estimated_coverage_pct': wv_data.get('estimated_coverage_pct', 0)
+                },
+                'description': wv_data['logic_pattern']['trigger'] + ' → ' + wv_data['logic_pattern']['conclusion'],
+                'core_subject': wv_data['actor'],
+                'core_attributes': wv_data['core_mechanisms'],
+                'version': version,
+                'last_updated': datetime.now().isoformat()
+            })\
+            .eq('id', worldview_id)\
+            .execute()
+
     def _generate_report(self, changes: Dict) -> Dict:
         """Generate evolution report"""
 
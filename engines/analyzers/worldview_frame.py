@@ -0,0 +1,122 @@
+"""
+WorldviewFrame - 한 번 파싱해서 재사용하는 세계관 frame
+
+worldviews.frame (jsonb, 과거 데이터는 JSON 문자열)을 한 번만 파싱하고
+매칭에 필요한 형태로 미리 가공:
+- actor: dict / 문자열 형태를 {'subject', 'purpose', 'methods'}로 정규화
+- actor_keywords: "중국/좌파 세력" → ('중국', '좌파', '세력')
+- mechanisms: frozenset
+- logic_text: trigger + conclusion (LogicSimilarity 입력)
+- 하위 세계관(403 계층)은 frame이 {subject, action, object} → subject를 Actor로,
+  inherit(parent)로 상위 세계관의 메커니즘/logic을 물려받음
+
+MechanismMatcher, WorldviewEvolutionEngine, WorldviewDiffer가 같은 객체를 공유
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+_ACTOR_SEPARATORS = str.maketrans({'/': ' ', '(': ' ', ')': ' ', '·': ' ', ',': ' '})
+
+
+def parse_frame(value) -> Dict:
+    """
+    Parse a worldviews.frame value (dict, JSON string, or legacy text)
+
+    Returns:
+        Frame dict ({} if not a JSON object)
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
+def normalize_actor(actor) -> Dict:
+    """Normalize the dict-or-string actor forms to {'subject', 'purpose', 'methods'}"""
+    if isinstance(actor, dict):
+        subject = actor.get('subject', '')
+        if isinstance(subject, list):
+            subject = ', '.join(str(s) for s in subject)
+        methods = actor.get('methods') or []
+        return {
+            'subject': str(subject or ''),
+            'purpose': str(actor.get('purpose') or ''),
+            'methods': methods if isinstance(methods, list) else [str(methods)]
+        }
+    return {'subject': str(actor or ''), 'purpose': '', 'methods': []}
+
+
+def split_actor_keywords(subject: str) -> Tuple[str, ...]:
+    """Split an actor subject into keywords ("중국/좌파 세력" → 중국, 좌파, 세력)"""
+    return tuple(part for part in subject.translate(_ACTOR_SEPARATORS).split() if part)
+
+
+@dataclass(slots=True)
+class WorldviewFrame:
+    """Pre-processed worldview frame for matching and diffing"""
+
+    id: str
+    title: str
+    actor: Dict
+    mechanisms: FrozenSet[str]
+    logic_pattern: Dict
+    actor_keywords: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        self.actor_keywords = split_actor_keywords(self.actor['subject'])
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'WorldviewFrame':
+        """
+        Build from a worldviews row ({'id', 'title', 'frame'})
+        or an LLM worldview dict (actor / core_mechanisms / logic_pattern at top level)
+        """
+        if 'frame' in row:
+            frame = parse_frame(row.get('frame'))
+        else:
+            frame = row
+
+        logic = frame.get('logic_pattern')
+
+        return cls(
+            id=row.get('id'),
+            title=row.get('title', ''),
+            # 하위 세계관 frame: {'subject', 'action', 'object'}
+            actor=normalize_actor(frame.get('actor') or frame.get('subject')),
+            mechanisms=frozenset(frame.get('core_mechanisms') or []),
+            logic_pattern=logic if isinstance(logic, dict) else {}
+        )
+
+    def inherit(self, parent: 'WorldviewFrame') -> 'WorldviewFrame':
+        """
+        Child frame completed with its parent's features
+
+        메커니즘은 합집합, Actor/logic은 자신에게 없을 때만 상위 것을 사용
+        """
+        return WorldviewFrame(
+            id=self.id,
+            title=self.title,
+            actor=self.actor if self.actor_subject else parent.actor,
+            mechanisms=self.mechanisms | parent.mechanisms,
+            logic_pattern=self.logic_pattern or parent.logic_pattern
+        )
+
+    @property
+    def actor_subject(self) -> str:
+        return self.actor['subject']
+
+    @property
+    def logic_text(self) -> str:
+        return f"{self.logic_pattern.get('trigger', '')} {self.logic_pattern.get('conclusion', '')}"
+
+    @property
+    def is_empty(self) -> bool:
+        """Legacy / unparseable frame (nothing to match on)"""
+        return not (self.actor_subject or self.mechanisms or self.logic_pattern)
@@ -0,0 +1,171 @@
+"""
+WorldviewIndex - 메커니즘/Actor 키워드 → 세계관 역색인
+
+MechanismMatcher의 후보 생성 단계:
+perception과 메커니즘 또는 Actor 키워드(similar_pairs 확장 포함)를 하나라도 공유하는
+세계관만 점수 계산 → 매칭 비용이 실제 겹침 수에 비례
+
+Actor 키워드/유사어는 Aho-Corasick automaton 하나로 묶어
+perception Actor 문자열을 한 번 훑으면 모든 세계관의 Actor 점수(1.0/0.8)가 나옴
+
+Logic 점수만으로 threshold를 넘을 수 있는 경우(threshold ≤ logic 가중치)는
+전체 세계관을 후보로 반환하므로 결과는 전수 비교와 동일
+
+Logic 점수는 LogicSimilarity(char n-gram TF-IDF)로 세계관 행렬을 한 번 만들어 둠
+
+계층(403 parent_worldview_id): from_rows()로 만들면 하위 세계관은 상위 frame을
+상속한 frame으로 한 번만 가공되고, roots / children으로 상위 → 하위 탐색 가능
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from engines.analyzers.worldview_frame import WorldviewFrame
+from engines.analyzers.logic_similarity import LogicSimilarity
+from engines.utils.aho_corasick import AhoCorasick
+
+# Actor 유사어 쌍: perception 쪽에 한 term, 세계관 Actor에 다른 term이 있으면 0.8
+SIMILAR_ACTOR_PAIRS = [
+    ('민주', '민주당'),
+    ('좌파', '진보'),
+    ('중국', '중국계'),
+    ('경찰', '공권력'),
+    ('정부', '정권'),
+    ('언론', '미디어')
+]
+
+# Actor/Mechanism 점수 없이 logic 점수만으로 얻을 수 있는 최대 점수
+MAX_LOGIC_ONLY_SCORE = 0.2
+
+
+class WorldviewIndex:
+    """Inverted index from mechanisms and actor keywords to worldview frames"""
+
+    def __init__(
+        self,
+        frames: List[WorldviewFrame],
+        logic_corpus: Optional[List[str]] = None,
+        parents: Optional[List[Optional[int]]] = None
+    ):
+        """
+        Args:
+            frames: 세계관 frames
+            logic_corpus: Logic TF-IDF IDF 학습에 추가할 perception logic 텍스트
+            parents: frame별 상위 세계관 위치 (None이면 최상위), 없으면 평면 구조
+        """
+        self.frames = frames
+
+        # 계층: 최상위 위치 → 하위 위치 목록
+        self.roots: List[int] = []
+        self.children: Dict[int, List[int]] = {}
+        for i, parent in enumerate(parents or [None] * len(frames)):
+            if parent is None:
+                self.roots.append(i)
+            else:
+                self.children.setdefault(parent, []).append(i)
+
+        self.by_mechanism: Dict[str, Set[int]] = {}
+
+        # Actor 패턴 → {frame index: score}
+        #   세계관 키워드 → 1.0
+        #   유사어 term1 → term2를 Actor에 포함한 세계관 0.8 (양방향)
+        self.by_actor_pattern: Dict[str, Dict[int, float]] = {}
+
+        for i, frame in enumerate(frames):
+            if frame.is_empty:
+                continue
+
+            for mech in frame.mechanisms:
+                self.by_mechanism.setdefault(mech, set()).add(i)
+
+            if not frame.actor_subject:
+                continue
+
+            for keyword in frame.actor_keywords:
+                self.by_actor_pattern.setdefault(keyword, {})[i] = 1.0
+
+            # similar_pairs는 세계관 Actor 전체 문자열에 대한 부분 문자열 검사
+            for term1, term2 in SIMILAR_ACTOR_PAIRS:
+                for found, partner in ((term2, term1), (term1, term2)):
+                    if found in frame.actor_subject:
+                        scores = self.by_actor_pattern.setdefault(partner, {})
+                        scores[i] = max(scores.get(i, 0.0), 0.8)
+
+        self.actor_automaton = AhoCorasick(self.by_actor_pattern.keys())
+        self.logic = LogicSimilarity(frames, logic_corpus)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict], logic_corpus: Optional[List[str]] = None) -> 'WorldviewIndex':
+        """
+        Build from worldviews rows (id, title, frame, parent_worldview_id)
+
+        하위 세계관 frame은 상위 frame을 상속(WorldviewFrame.inherit)해 한 번만 계산.
+        상위가 목록에 없는(보관된) 하위 세계관은 최상위로 취급
+        """
+        frames = [WorldviewFrame.from_row(row) for row in rows]
+        position = {row['id']: i for i, row in enumerate(rows)}
+
+        parents: List[Optional[int]] = []
+        for i, row in enumerate(rows):
+            parent = position.get(row.get('parent_worldview_id'))
+            if parent is not None and parent != i and rows[parent].get('parent_worldview_id') is None:
+                frames[i] = frames[i].inherit(frames[parent])
+            else:
+                parent = None
+            parents.append(parent)
+
+        return cls(frames, logic_corpus, parents)
+
+    @property
+    def is_hierarchical(self) -> bool:
+        return bool(self.children)
+
+    def actor_scores(self, perception: Dict) -> Optional[Dict[int, float]]:
+        """
+        Actor scores for every worldview from one scan of the perception actor
+
+        Returns:
+            {frame index: 1.0 | 0.8} (없는 index는 0.0),
+            perception Actor가 문자열이 아니면 None (쌍별 계산 필요)
+        """
+        perception_actor = (perception.get('actor') or {}).get('subject', '')
+        if not perception_actor:
+            return {}
+        if not isinstance(perception_actor, str):
+            return None
+
+        scores: Dict[int, float] = {}
+        for pattern in self.actor_automaton.find(perception_actor):
+            for i, score in self.by_actor_pattern[pattern].items():
+                if score > scores.get(i, 0.0):
+                    scores[i] = score
+
+        return scores
+
+    def candidates(
+        self,
+        perception: Dict,
+        threshold: float = 0.0,
+        actor_scores: Optional[Dict[int, float]] = None
+    ) -> List[Tuple[int, WorldviewFrame]]:
+        """
+        Worldviews sharing at least one mechanism or actor keyword with the perception
+
+        Args:
+            perception: Perception dict (mechanisms, actor)
+            threshold: 매칭 threshold (logic 점수만으로 넘을 수 있으면 전체 반환)
+            actor_scores: actor_scores() 결과 (None이면 여기서 계산)
+
+        Returns:
+            (frame index, frame) 후보 (원래 순서 유지)
+        """
+        if actor_scores is None:
+            actor_scores = self.actor_scores(perception)
+
+        # Logic 점수만으로 넘을 수 있거나 비정형 Actor → 전수 비교
+        if threshold <= MAX_LOGIC_ONLY_SCORE or actor_scores is None:
+            return [(i, frame) for i, frame in enumerate(self.frames) if not frame.is_empty]
+
+        hits: Set[int] = set(actor_scores)
+        for mech in set(perception.get('mechanisms') or []):
+            hits |= self.by_mechanism.get(mech, set())
+
+        return [(i, self.frames[i]) for i in sorted(hits)]
@@ -3,8 +3,10 @@ Archiving Module - 3개월 데이터 보관 전략
 
 Contents:
 - ContentArchiver: 90일 아카이빙 시스템
+- ColdStorageExporter / ColdStorageReader: 삭제 전 Parquet 압축 보관
 """
 
 from .content_archiver import ContentArchiver
+from .cold_storage import ColdStorageExporter, ColdStorageReader
 
-__all__ = ['ContentArchiver']
+__all__ = ['ContentArchiver', 'ColdStorageExporter', 'ColdStorageReader']
@@ -0,0 +1,276 @@
+"""
+ColdStorage - 아카이브 데이터 압축 보관 (Parquet/zstd)
+
+hard delete 전에 contents / layered_perceptions를 월별 파티션 Parquet 파일로 내보냄
+- 로컬 디스크 또는 S3 호환 object storage (pyarrow.fs URI)
+- 파티션: <root>/<table>/month=YYYY-MM/part-*.parquet (published_at 기준)
+- Reader는 memory-map으로 읽어 오프라인 연구(_archive/validation_scripts 등)에 사용
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.fs as pafs
+
+
+def cold_storage_uri(root_uri: Optional[str] = None) -> Optional[str]:
+    """
+    Cold storage 위치 (로컬 경로 또는 s3://bucket/prefix)
+
+    root_uri가 없으면 COLD_STORAGE_URI, 둘 다 없으면 None
+    (기본 로컬 경로 없음 → CI처럼 디스크가 사라지는 환경에서 내보낸 뒤 삭제하는 일 방지)
+    """
+    return root_uri or os.getenv('COLD_STORAGE_URI') or None
+
+
+CONTENTS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('source_type', pa.string()),
+    ('source_url', pa.string()),
+    ('source_id', pa.string()),
+    ('title', pa.string()),
+    ('body', pa.string()),
+    ('metadata', pa.string()),  # JSON
+    ('base_credibility', pa.float64()),
+    ('published_at', pa.timestamp('us', tz='UTC')),
+    ('collected_at', pa.timestamp('us', tz='UTC')),
+    ('created_at', pa.timestamp('us', tz='UTC')),
+    ('archived_at', pa.timestamp('us', tz='UTC')),
+    # 519 near-duplicate (MinHash LSH)
+    ('minhash', pa.list_(pa.int32())),
+    ('minhash_bands', pa.list_(pa.int64())),
+    ('duplicate_of', pa.string()),
+    ('duplicate_similarity', pa.float64()),
+])
+
+PERCEPTIONS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('content_id', pa.string()),
+    ('explicit_claims', pa.string()),  # JSON
+    ('implicit_assumptions', pa.string()),  # JSON
+    ('reasoning_gaps', pa.string()),  # JSON
+    ('deep_beliefs', pa.list_(pa.string())),
+    ('worldview_hints', pa.string()),
+    ('mechanisms', pa.list_(pa.string())),
+    ('skipped_steps', pa.list_(pa.string())),
+    ('actor', pa.string()),  # JSON
+    ('logic_chain', pa.list_(pa.string())),
+    ('consistency_pattern', pa.string()),
+    ('created_at', pa.timestamp('us', tz='UTC')),
+    ('copied_from', pa.string()),  # 519: 원본 perception에서 복사
+    ('filter_stats', pa.string()),  # JSON, 520: "triage" 키 = LLM 없이 건너뜀
+])
+
+SCHEMAS = {
+    'contents': CONTENTS_SCHEMA,
+    'layered_perceptions': PERCEPTIONS_SCHEMA,
+}
+
+# JSON 문자열로 직렬화되는 컬럼 (스키마가 행마다 달라서)
+JSON_COLUMNS = {
+    'contents': ['metadata'],
+    'layered_perceptions': ['explicit_claims', 'implicit_assumptions', 'reasoning_gaps', 'actor', 'filter_stats'],
+}
+
+
+def _resolve_filesystem(root_uri: str):
+    """URI → (FileSystem, root path). 스킴 없는 경로는 로컬 디스크"""
+    if '://' in root_uri:
+        return pafs.FileSystem.from_uri(root_uri)
+    return pafs.LocalFileSystem(), os.path.abspath(root_uri)
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _month_of(value) -> str:
+    ts = _parse_timestamp(value)
+    return ts.strftime('%Y-%m') if ts else 'unknown'
+
+
+class ColdStorageExporter:
+    """
+    아카이브 데이터를 Parquet(zstd)로 내보내기
+
+    Perceptions는 해당 content의 month 파티션에 함께 저장되므로
+    같은 파티션 안에서 content_id로 조인 가능
+    """
+
+    def __init__(self, root_uri: Optional[str] = None, compression_level: int = 9):
+        """
+        Args:
+            root_uri: 저장 위치 (기본 COLD_STORAGE_URI, 둘 다 없으면 ValueError)
+            compression_level: zstd 압축 레벨
+        """
+        self.root_uri = cold_storage_uri(root_uri)
+        if not self.root_uri:
+            raise ValueError("Cold storage location not configured (set COLD_STORAGE_URI)")
+        self.filesystem, self.root = _resolve_filesystem(self.root_uri)
+        self.compression_level = compression_level
+
+    def export(self, contents: List[Dict], perceptions: List[Dict]) -> Dict:
+        """
+        Contents와 관련 perceptions를 월별 파티션으로 내보냄
+
+        Args:
+            contents: contents 행 (select('*') 결과)
+            perceptions: layered_perceptions 행
+
+        Returns:
+            {
+                'contents_exported': int,
+                'perceptions_exported': int,
+                'files': List[str]
+            }
+        """
+        content_months = {c['id']: _month_of(c.get('published_at')) for c in contents}
+
+        contents_by_month: Dict[str, List[Dict]] = {}
+        for c in contents:
+            contents_by_month.setdefault(content_months[c['id']], []).append(c)
+
+        perceptions_by_month: Dict[str, List[Dict]] = {}
+        for p in perceptions:
+            month = content_months.get(p.get('content_id'), _month_of(p.get('created_at')))
+            perceptions_by_month.setdefault(month, []).append(p)
+
+        files = []
+        for month, rows in contents_by_month.items():
+            files.append(self._write_partition('contents', month, rows))
+        for month, rows in perceptions_by_month.items():
+            files.append(self._write_partition('layered_perceptions', month, rows))
+
+        return {
+            'contents_exported': len(contents),
+            'perceptions_exported': len(perceptions),
+            'files': files
+        }
+
+    def _write_partition(self, table_name: str, month: str, rows: List[Dict]) -> str:
+        """한 month 파티션에 새 part 파일 작성 (append-only)"""
+        table = self._to_arrow(table_name, rows)
+
+        partition_dir = f"{self.root}/{table_name}/month={month}"
+        self.filesystem.create_dir(partition_dir, recursive=True)
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+        path = f"{partition_dir}/part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+
+        pq.write_table(
+            table,
+            path,
+            filesystem=self.filesystem,
+            compression='zstd',
+            compression_level=self.compression_level
+        )
+        return path
+
+    def _to_arrow(self, table_name: str, rows: List[Dict]) -> pa.Table:
+        schema = SCHEMAS[table_name]
+        json_columns = JSON_COLUMNS[table_name]
+
+        columns = {}
+        for field in schema:
+            values = [row.get(field.name) for row in rows]
+
+            if field.name in json_columns:
+                values = [json.dumps(v, ensure_ascii=False) if v is not None else None for v in values]
+            elif pa.types.is_timestamp(field.type):
+                values = [_parse_timestamp(v) for v in values]
+            elif pa.types.is_list(field.type):
+                values = [list(v) if v else [] for v in values]
+
+            columns[field.name] = pa.array(values, type=field.type)
+
+        return pa.table(columns, schema=schema)
+
+
+class ColdStorageReader:
+    """
+    Cold storage 읽기 (오프라인 연구용)
+
+    로컬 파일은 memory-map으로 열어 필요한 컬럼만 페이지 인
+    """
+
+    def __init__(self, root_uri: Optional[str] = None):
+        self.root_uri = cold_storage_uri(root_uri)
+        if not self.root_uri:
+            raise ValueError("Cold storage location not configured (set COLD_STORAGE_URI)")
+        self.filesystem, self.root = _resolve_filesystem(self.root_uri)
+
+    def months(self, table_name: str = 'contents') -> List[str]:
+        """저장된 month 파티션 목록 (YYYY-MM)"""
+        selector = pafs.FileSelector(f"{self.root}/{table_name}", allow_not_found=True)
+        months = [
+            info.base_name.split('=', 1)[1]
+            for info in self.filesystem.get_file_info(selector)
+            if info.type == pafs.FileType.Directory and info.base_name.startswith('month=')
+        ]
+        return sorted(months)
+
+    def read(
+        self,
+        table_name: str,
+        months: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Arrow Table로 읽기
+
+        Args:
+            table_name: 'contents' 또는 'layered_perceptions'
+            months: 읽을 month 목록 (None = 전체)
+            columns: 읽을 컬럼 (None = 전체)
+
+        Returns:
+            pyarrow.Table (month 파티션 컬럼 포함)
+            (컬럼 추가 전에 내보낸 파일의 새 컬럼은 null)
+        """
+        filters = [('month', 'in', months)] if months else None
+
+        # 파일마다 스키마가 다를 수 있으므로 (컬럼 추가) 첫 파일 대신 현재 스키마로 읽음
+        schema = SCHEMAS[table_name].append(pa.field('month', pa.string()))
+
+        return pq.read_table(
+            f"{self.root}/{table_name}",
+            filesystem=self.filesystem,
+            columns=columns,
+            filters=filters,
+            schema=schema,
+            partitioning='hive',
+            memory_map=True
+        )
+
+    def iter_rows(
+        self,
+        table_name: str,
+        months: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict]:
+        """
+        Supabase 조회 결과와 같은 dict 형태로 순회 (JSON 컬럼 복원)
+        """
+        table = self.read(table_name, months=months, columns=columns)
+        json_columns = [c for c in JSON_COLUMNS[table_name] if c in table.column_names]
+
+        for batch in table.to_batches(max_chunksize=batch_size):
+            for row in batch.to_pylist():
+                for col in json_columns:
+                    if row[col] is not None:
+                        row[col] = json.loads(row[col])
+                yield row
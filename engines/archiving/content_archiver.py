@@ -2,11 +2,14 @@
 ContentArchiver - 3개월 데이터 보관 시스템
 
 90일 이상 contents를 자동으로 아카이브하여 DB 크기 관리 및 비용 절감
+perception 아카이브/복구 후 mechanism_daily_stats 버킷도 다시 계산 (archived 제외 기준 유지)
 """
 
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from engines.utils.supabase_client import get_supabase
+from engines.archiving.cold_storage import ColdStorageExporter
+from engines.analyzers.mechanism_stats import MechanismStatsStore, created_day
 
 
 class ContentArchiver:
@@ -61,6 +64,9 @@ class ContentArchiver:
 
         if result.data and len(result.data) > 0:
             row = result.data[0]
+            if row['perception_count']:
+                # 아카이브된 perception의 created_at은 알 수 없으므로 window 전체 재계산
+                MechanismStatsStore().rebuild(days=self.days_threshold)
             return {
                 'contents_archived': row['archived_count'],
                 'perceptions_archived': row['perception_count'],
@@ -89,6 +95,13 @@ class ContentArchiver:
             'content_id_param': content_id
         }).execute()
 
+        if result.data:
+            perceptions = self.supabase.table('layered_perceptions')\
+                .select('created_at')\
+                .eq('content_id', content_id)\
+                .execute().data
+            MechanismStatsStore().refresh_days(d for d in map(created_day, perceptions) if d)
+
         return result.data if result.data else False
 
     def restore_period(self, start_date: str, end_date: str) -> int:
@@ -192,24 +205,73 @@ class ContentArchiver:
         result = query.execute()
         return result.data if result.data else []
 
-    def hard_delete_old_archives(self, days_threshold: int = 365) -> int:
+    def export_to_cold_storage(
+        self,
+        contents: List[Dict],
+        exporter: Optional[ColdStorageExporter] = None
+    ) -> Dict:
+        """
+        Contents와 관련 perceptions를 cold storage (Parquet/zstd)로 내보내기
+
+        Args:
+            contents: 내보낼 contents 행 (select('*') 결과)
+            exporter: 사용할 exporter (기본 COLD_STORAGE_URI)
+
+        Returns:
+            {
+                'contents_exported': int,
+                'perceptions_exported': int,
+                'files': List[str]
+            }
+        """
+        exporter = exporter or ColdStorageExporter()
+
+        content_ids = [c['id'] for c in contents]
+        perceptions = []
+        for i in range(0, len(content_ids), 200):
+            chunk = content_ids[i:i + 200]
+            perceptions.extend(
+                self.supabase.table('layered_perceptions').select('*').in_('content_id', chunk).execute().data
+            )
+
+        return exporter.export(contents, perceptions)
+
+    def hard_delete_old_archives(
+        self,
+        days_threshold: int = 365,
+        export: bool = True,
+        exporter: Optional[ColdStorageExporter] = None
+    ) -> int:
         """
         오래된 아카이브를 완전 삭제 (주의!)
 
+        삭제 전에 cold storage로 내보내며, 내보내기 실패 시 삭제하지 않음
+        (exporter도 COLD_STORAGE_URI도 없으면 ValueError → 삭제하지 않음)
+
         Args:
             days_threshold: 아카이브된 지 며칠 이상 된 것을 삭제할지
+            export: False면 내보내기 없이 삭제
+            exporter: 사용할 exporter (기본 COLD_STORAGE_URI)
 
         Returns:
             삭제된 contents 수
         """
         threshold_date = datetime.now() - timedelta(days=days_threshold)
 
+        # 저장 위치가 없으면 조회 전에 중단
+        if export:
+            exporter = exporter or ColdStorageExporter()
+
         # 먼저 삭제 대상 조회
-        contents = self.supabase.table('contents').select('id').eq('archived', True).lt('archived_at', threshold_date.isoformat()).execute().data
+        contents = self.supabase.table('contents').select('*' if export else 'id').eq('archived', True).lt('archived_at', threshold_date.isoformat()).execute().data
 
         if not contents:
             return 0
 
+        # Cold storage 내보내기 (예외 발생 시 삭제 중단)
+        if export:
+            self.export_to_cold_storage(contents, exporter)
+
         content_ids = [c['id'] for c in contents]
 
         # Layered perceptions 먼저 삭제 (foreign key)
@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 from engines.adapters.base_adapter import BaseAdapter
 from engines.adapters.dc_gallery_adapter import DCGalleryAdapter
 from engines.utils.supabase_client import get_supabase
+from engines.utils.near_duplicate import NearDuplicateDetector
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class ContentCollector:
 
     def __init__(self):
         self.supabase = get_supabase()
+        self.duplicates = NearDuplicateDetector()
 
         # Register adapters
         self.adapters: Dict[str, BaseAdapter] = {
@@ -147,6 +149,8 @@ class ContentCollector:
         """
         Save content to database
 
+        기존 글과 거의 같은 body면 duplicate_of를 기록 (process_new_contents가 LLM 대신 원본 perception 복사)
+
         Returns:
             UUID of created content
         """
@@ -163,5 +167,12 @@ class ContentCollector:
             'is_active': True
         }
 
+        try:
+            data.update(self.duplicates.fields(body))
+            if data.get('duplicate_of'):
+                logger.info(f"Near-duplicate of {data['duplicate_of']} ({data['duplicate_similarity']:.2f}): {url}")
+        except Exception as e:
+            logger.warning(f"Near-duplicate check failed: {e}")
+
         result = self.supabase.table('contents').insert(data).execute()
         return result.data[0]['id']
\ No newline at end of file
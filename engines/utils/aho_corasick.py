@@ -0,0 +1,93 @@
+"""
+Aho-Corasick multi-pattern matcher
+
+패턴 집합으로 automaton을 한 번 만들고, 텍스트를 한 번 훑어 포함된 모든 패턴을 찾음
+(텍스트 길이 + 매치 수에 비례, 패턴 수와 무관)
+
+사용 예시:
+    ac = AhoCorasick(['중국', '좌파', '민주당'])
+    ac.find('중국계 좌파 단체')  # {'중국', '좌파'}
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """Character-level Aho-Corasick automaton over a fixed pattern set"""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        self._built = False
+
+        for pattern in patterns:
+            self.add(pattern)
+        self.build()
+
+    def add(self, pattern: str):
+        """Add a pattern (call build() again before matching)"""
+        if not pattern:
+            return
+
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+
+        if pattern not in self._out[state]:
+            self._out[state].append(pattern)
+        self._built = False
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+
+                for pattern in self._out[self._fail[nxt]]:
+                    if pattern not in self._out[nxt]:
+                        self._out[nxt].append(pattern)
+
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (end_index, pattern) for every occurrence in text
+
+        end_index는 매치 마지막 문자 다음 위치 (text[end - len(pattern):end] == pattern)
+        """
+        if not self._built:
+            self.build()
+
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+
+            for pattern in self._out[state]:
+                yield i + 1, pattern
+
+    def find(self, text: str) -> Set[str]:
+        """Distinct patterns contained in text"""
+        return {pattern for _, pattern in self.iter_matches(text)}
@@ -0,0 +1,157 @@
+"""
+Claim Fast Filter - 표면층 주장 규칙 기반 필터 (공용)
+
+LayeredPerceptionExtractor(V2)._fast_filter_claim, PatternManager._fast_filter_surface가
+같은 규칙을 공유. 규칙 클래스마다 모듈 로드 시 한 번 컴파일한 정규식 하나로 검사:
+
+1. 길이 < 10
+2. 지시대명사 시작 ("이는 ", "이 " ... 단, "이 사건", "그 사람" 등은 허용)
+3. 막연한 주어 시작 ("우리는 ", "사람들이 " ...)
+4. 당위문 ("해야 한다", "하자" ...)
+5. 막연한 평가 (구체적 주어가 없을 때만)
+6. 불완전한 문장 (종결어미 없음)
+7. 자음 이니셜 (앞 3글자에 ㅉ, ㅁㅈ 등)
+
+사용 예시:
+    keep, reason = filter_claim("민주당이 통신사를 협박해 개인정보를 취득했다")
+    kept, rejected = split_claims(claims)  # rejected: [(claim, reason), ...]
+"""
+
+import re
+from typing import Dict, List, Tuple, Union
+
+MIN_LENGTH = 10
+
+PRONOUN_STARTS = [
+    '이는 ', '이는,', '이것은 ', '이것이 ', '그것은 ', '그것이 ',
+    '여기는 ', '거기는 ', '저기는 '
+]
+
+# "이 ", "그 ", "저 " 단독 지시대명사 (뒤에 오는 허용 명사 제외)
+PRONOUN_ALLOWED = {
+    '이': ['사건', '사람', '일'],
+    '그': ['사건', '사람'],
+    '저': []
+}
+
+VAGUE_SUBJECTS = [
+    '우리가 ', '우리는 ', '이들은 ', '이들이 ', '그들은 ', '그들이 ',
+    '엄마들이 ', '좌파들이 ', '보수들이 ', '사람들이 '
+]
+
+NORMATIVE = ['해야 한다', '해야한다', '하자', '드리자', '말아야', '되어야']
+
+VAGUE_EVAL = ['웃기다', '다행', '부당', '적절', '나쁜', '좋은',
+              '이상하다', '복잡하다', '어렵다', '쉽다']
+
+CONCRETE_SUBJECTS = ['민주당', '국민의힘', '윤석열', '이재명',
+                     '경찰', '검찰', '법원', '정부', '국회',
+                     '대통령', '의원', '장관', '판사', '검사']
+
+# 종결어미: '다'(+ 문장부호), '까', '냐', '요', '음' + 문장부호
+ENDINGS = ['다.', '다,', '다"', '다\'', '다!', '다?',
+           '까.', '까,', '까?',
+           '냐.', '냐,', '냐?',
+           '요.', '요,', '요!',
+           '음.', '음,',
+           '다']
+
+KOREAN_CONSONANTS = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+
+def _alternation(words: List[str]) -> str:
+    # 긴 것부터 (겹치는 접두어는 가장 긴 것이 먼저 매치)
+    return '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+def _pronoun_pattern() -> str:
+    singles = []
+    for pronoun, allowed in PRONOUN_ALLOWED.items():
+        if allowed:
+            singles.append(f"{pronoun} (?!{_alternation(allowed)})")
+        else:
+            singles.append(f"{pronoun} ")
+    return f"(?:{_alternation(PRONOUN_STARTS)}|{'|'.join(singles)})"
+
+
+_PRONOUN_START = re.compile(_pronoun_pattern())
+_VAGUE_SUBJECT = re.compile(_alternation(VAGUE_SUBJECTS))
+_NORMATIVE = re.compile(_alternation(NORMATIVE))
+_VAGUE_EVAL = re.compile(_alternation(VAGUE_EVAL))
+_CONCRETE_SUBJECT = re.compile(_alternation(CONCRETE_SUBJECTS))
+_ENDING = re.compile(f"(?:{_alternation(ENDINGS)})\\Z")
+_CONSONANT = re.compile(f"[{KOREAN_CONSONANTS}]")
+
+
+def claim_text(claim: Union[str, Dict]) -> str:
+    """
+    Text of a claim (string, or dict with subject/predicate)
+
+    dict는 predicate 우선, 없으면 "subject predicate"
+    """
+    if isinstance(claim, dict):
+        text = claim.get('predicate', '')
+        if not text and 'subject' in claim:
+            text = f"{claim.get('subject', '')} {claim.get('predicate', '')}"
+        return str(text).strip()
+    return str(claim).strip()
+
+
+def filter_claim(claim: Union[str, Dict]) -> Tuple[bool, str]:
+    """
+    Filter one low-quality claim
+
+    Returns:
+        (should_keep, reason_if_filtered)
+    """
+    text = claim_text(claim)
+
+    if len(text) < MIN_LENGTH:
+        return (False, "길이 < 10")
+
+    if _PRONOUN_START.match(text):
+        return (False, "지시대명사 시작")
+
+    if _VAGUE_SUBJECT.match(text):
+        return (False, "막연한 주어")
+
+    if _NORMATIVE.search(text):
+        return (False, "당위문")
+
+    if _VAGUE_EVAL.search(text) and not _CONCRETE_SUBJECT.search(text):
+        return (False, "막연한 평가")
+
+    if not _ENDING.search(text):
+        return (False, "불완전한 문장")
+
+    if _CONSONANT.search(text, 0, 3):
+        return (False, "자음 이니셜")
+
+    return (True, "")
+
+
+def filter_claims(claims: List[Union[str, Dict]]) -> List[Tuple[bool, str]]:
+    """
+    Filter a batch of claims
+
+    Returns:
+        claims와 같은 순서의 [(should_keep, reason_if_filtered), ...]
+    """
+    return [filter_claim(claim) for claim in claims]
+
+
+def split_claims(claims: List[Union[str, Dict]]) -> Tuple[List, List[Tuple[Union[str, Dict], str]]]:
+    """
+    Split claims into kept and rejected
+
+    Returns:
+        (kept_claims, [(rejected_claim, reason), ...])
+    """
+    kept, rejected = [], []
+    for claim in claims:
+        should_keep, reason = filter_claim(claim)
+        if should_keep:
+            kept.append(claim)
+        else:
+            rejected.append((claim, reason))
+    return kept, rejected
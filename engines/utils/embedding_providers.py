@@ -0,0 +1,152 @@
+"""
+Embedding Providers - 임베딩 모델 등록부
+
+모델마다 차원이 다르고 (mpnet 768 / OpenAI 1536), 모델을 바꿀 때마다 컬럼과 SQL 함수를 다시 썼던 문제 →
+벡터를 만든 모델을 fingerprint(provider:model:dimension)로 벡터 옆에 저장 (migration 518)
+
+- EmbeddingProvider: name / model / dimension / fingerprint + encode(texts) → (n, dim) 정규화 float32
+- PROVIDERS: 이름 → provider 생성 함수 (register_provider로 추가)
+- get_provider(): PATTERN_EMBEDDING_PROVIDER (기본 mpnet-multilingual), 프로세스당 1개
+- register_model(): embedding_models 테이블에 fingerprint/dimension 등록 (FK 대상)
+
+모델 교체 순서 (서비스 중단 없음):
+    1. python3 scripts/reembed_patterns.py --provider openai-3-small      # embedding_next 채우기
+    2. 워커를 PATTERN_EMBEDDING_PROVIDER=openai-3-small로 재시작           # 새 패턴은 새 모델로 저장/검색
+    3. python3 scripts/reembed_patterns.py --provider openai-3-small --promote
+
+Usage:
+    provider = get_provider()
+    vectors = provider.encode(["정부가 부동산 대책을 발표했다"])
+    provider.fingerprint  # 'sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768'
+"""
+
+import os
+import asyncio
+import threading
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from engines.utils.sentence_encoder import MODEL_NAME, get_encoder
+
+DEFAULT_PROVIDER = os.getenv('PATTERN_EMBEDDING_PROVIDER', 'mpnet-multilingual')
+
+
+class EmbeddingProvider:
+    """Batch text encoder with a declared dimension and model fingerprint"""
+
+    name: str = ''
+
+    def __init__(self, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+
+    @property
+    def fingerprint(self) -> str:
+        """provider:model:dimension - 저장된 벡터와 쿼리 벡터가 같은 공간인지 판별하는 키"""
+        return f"{self.name}:{self.model}:{self.dimension}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts
+
+        Returns:
+            (len(texts), dimension) L2 정규화 float32
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        vectors = np.asarray(self._encode(list(texts)), dtype=np.float32)
+        if vectors.shape != (len(texts), self.dimension):
+            raise ValueError(f"{self.fingerprint} returned shape {vectors.shape}, expected ({len(texts)}, {self.dimension})")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerProvider(EmbeddingProvider):
+    """Local sentence-transformers model (or the shared embedding service)"""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model: str = MODEL_NAME, dimension: int = 768, backend: Optional[str] = None):
+        super().__init__(model, dimension)
+        self.backend = backend
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # get_encoder()는 PATTERN_EMBEDDING_BACKEND / EMBEDDING_SERVICE_SOCKET을 따르고 프로세스당 1번만 로드
+        return get_encoder(self.backend).encode(texts, batch_size=32, convert_to_numpy=True)
+
+
+class OpenAIProvider(EmbeddingProvider):
+    """OpenAI embeddings API via EmbeddingGenerator (batching, rate limit, cache)"""
+
+    name = 'openai'
+
+    def __init__(self, model: str = 'text-embedding-3-small', dimension: int = 1536):
+        super().__init__(model, dimension)
+        self._generator = None
+        # AsyncOpenAI의 httpx 연결 풀 / rate limiter lock은 처음 사용한 event loop에 묶임
+        # → 호출마다 asyncio.run()으로 새 loop를 만들지 않고 provider 전용 loop 하나를 계속 사용
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            if self._generator is None:
+                from engines.utils.embedding_utils import EmbeddingGenerator
+                self._generator = EmbeddingGenerator(model=self.model, dimensions=self.dimension)
+
+            return np.array(self._loop.run_until_complete(self._generator.generate_batch(texts)))
+
+
+PROVIDERS: Dict[str, Callable[[], EmbeddingProvider]] = {
+    'mpnet-multilingual': lambda: SentenceTransformerProvider(),
+    'openai-3-small': lambda: OpenAIProvider('text-embedding-3-small', 1536),
+    # text-embedding-3-*는 차원 축소 지원 → 기존 768 컬럼 크기 그대로 OpenAI 사용
+    'openai-3-small-768': lambda: OpenAIProvider('text-embedding-3-small', 768),
+}
+
+_providers: Dict[str, EmbeddingProvider] = {}
+
+
+def register_provider(name: str, factory: Callable[[], EmbeddingProvider]):
+    """Add a provider to the registry (get_provider(name)로 사용)"""
+    PROVIDERS[name] = factory
+
+
+def get_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Get or create a provider by registry name
+
+    Args:
+        name: PROVIDERS 키 (None이면 PATTERN_EMBEDDING_PROVIDER)
+
+    Raises:
+        ValueError: 등록되지 않은 이름
+    """
+    name = name or DEFAULT_PROVIDER
+
+    if name not in _providers:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown embedding provider: {name} (expected one of {', '.join(PROVIDERS)})")
+        _providers[name] = PROVIDERS[name]()
+
+    return _providers[name]
+
+
+def register_model(supabase, provider: EmbeddingProvider):
+    """
+    Upsert the provider's fingerprint into embedding_models
+
+    worldview_patterns.embedding_model / embedding_next_model의 FK 대상이고,
+    find_similar_patterns가 쿼리 벡터 차원을 이 값과 비교
+    """
+    supabase.table('embedding_models').upsert({
+        'fingerprint': provider.fingerprint,
+        'dimension': provider.dimension
+    }, on_conflict='fingerprint').execute()
@@ -0,0 +1,283 @@
+"""
+Embedding Service - 워커들이 하나의 문장 임베딩 모델을 공유 (Unix socket)
+
+pattern_manager를 import하는 프로세스마다 모델을 따로 올리는 대신:
+- EmbeddingServer: 모델을 가진 단일 프로세스, 동시에 들어온 요청을 micro-batch로 묶어 한 번에 encode
+  (max_batch 문장이 모이거나 첫 요청 후 max_wait_ms가 지나면 실행)
+- EmbeddingClient: SentenceTransformer와 같은 encode() / get_sentence_embedding_dimension()
+  → sentence_encoder.get_encoder()가 모델 대신 반환
+
+프로토콜 (요청/응답 모두): 4바이트 big-endian 길이 + JSON 헤더 [+ 응답은 float32 벡터 bytes]
+    요청: {"op": "encode", "texts": [...], "id": 1} | {"op": "info", "id": 2}
+    응답: {"shape": [n, dim]} + n*dim*4 bytes | {"dim": 768, "batches": ..., "texts": ...} | {"error": "..."}
+          (응답 헤더에 요청의 "id"를 그대로 돌려줌 → 클라이언트가 다른 요청의 응답을 읽지 않았는지 확인)
+
+실행: python3 scripts/run_embedding_service.py
+"""
+
+import os
+import json
+import socket
+import struct
+import asyncio
+import threading
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+DEFAULT_SOCKET_PATH = os.getenv('EMBEDDING_SERVICE_SOCKET', '/tmp/moniterdc-embedding.sock')
+
+_HEADER = struct.Struct('>I')
+
+
+def _pack(header: Dict, payload: bytes = b'') -> bytes:
+    body = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    return _HEADER.pack(len(body)) + body + payload
+
+
+class EmbeddingServer:
+    """Single-model embedding server with dynamic micro-batching"""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        dim: int,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            encode: texts → (n, dim) 임베딩 (blocking, executor 스레드에서 실행)
+            dim: 임베딩 차원
+            socket_path: Unix socket 경로
+            max_batch: 한 번에 encode할 최대 문장 수
+            max_wait_ms: 첫 요청 이후 다른 요청을 기다리는 최대 시간
+        """
+        self.encode = encode
+        self.dim = dim
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.stats = {'requests': 0, 'texts': 0, 'batches': 0}
+
+    async def serve(self):
+        """Run until cancelled"""
+        self.queue = asyncio.Queue()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        batcher = asyncio.create_task(self._batch_loop())
+
+        print(f"  Embedding service: {self.socket_path} (dim {self.dim}, batch ≤ {self.max_batch}, wait ≤ {self.max_wait * 1000:.0f}ms)")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One connection, any number of sequential requests"""
+        try:
+            while True:
+                try:
+                    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                    request = json.loads(await reader.readexactly(length))
+                except asyncio.IncompleteReadError:
+                    break
+
+                header, payload = await self._respond(request)
+                if 'id' in request:
+                    header['id'] = request['id']
+                writer.write(_pack(header, payload))
+                await writer.drain()
+        except ConnectionError:
+            pass  # 클라이언트가 응답 전에 연결을 닫음 (timeout 등)
+        finally:
+            writer.close()
+
+    async def _respond(self, request: Dict) -> Tuple[Dict, bytes]:
+        op = request.get('op')
+
+        if op == 'info':
+            return {'dim': self.dim, **self.stats}, b''
+
+        if op != 'encode':
+            return {'error': f"unknown op: {op}"}, b''
+
+        texts = [str(t) for t in request.get('texts', [])]
+        if not texts:
+            return {'shape': [0, self.dim]}, b''
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+
+        try:
+            vectors = await future
+        except Exception as e:
+            return {'error': str(e)}, b''
+
+        return {'shape': list(vectors.shape)}, vectors.tobytes()
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            # 요청을 더 모음 (max_batch 또는 max_wait까지)
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+
+            try:
+                vectors = await loop.run_in_executor(None, self.encode, texts)
+                vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats['requests'] += len(pending)
+            self.stats['texts'] += len(texts)
+            self.stats['batches'] += 1
+
+            offset = 0
+            for request_texts, future in pending:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+
+class EmbeddingClient:
+    """Drop-in for SentenceTransformer.encode() backed by the embedding service"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._request_id = 0
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Same call shape as SentenceTransformer.encode (batch_size는 서버 micro-batch가 대신함)
+
+        Returns:
+            str 하나면 (dim,), 리스트면 (n, dim) float32
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        header, payload = self._request({'op': 'encode', 'texts': texts})
+        vectors = np.frombuffer(payload, dtype=np.float32).reshape(header['shape'])
+
+        if normalize_embeddings and len(vectors):
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = vectors / norms
+
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dim is None:
+            self._dim = self.info()['dim']
+        return self._dim
+
+    def info(self) -> Dict:
+        """Server dimension + batching counters"""
+        header, _ = self._request({'op': 'info'})
+        return header
+
+    def ping(self) -> bool:
+        try:
+            self.info()
+            return True
+        except OSError:
+            return False
+
+    def close(self):
+        with self._lock:
+            if self._sock:
+                self._sock.close()
+                self._sock = None
+
+    def _request(self, request: Dict) -> Tuple[Dict, bytes]:
+        with self._lock:
+            # 끊긴 연결(서버 재시작)은 한 번 다시 연결
+            for attempt in range(2):
+                self._request_id += 1
+                try:
+                    header, payload = self._exchange({**request, 'id': self._request_id})
+                    break
+                except BaseException as e:
+                    # timeout / 중단 등 어떤 예외든 응답이 소켓에 남아 있을 수 있음 → 연결 폐기
+                    if self._sock:
+                        self._sock.close()
+                    self._sock = None
+                    if attempt or not isinstance(e, ConnectionError):
+                        raise
+
+            if 'error' in header:
+                raise RuntimeError(f"Embedding service error: {header['error']}")
+
+            return header, payload
+
+    def _exchange(self, request: Dict) -> Tuple[Dict, bytes]:
+        """Send one request and read its full response (lock held)"""
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.socket_path)
+
+        self._sock.sendall(_pack(request))
+        (length,) = _HEADER.unpack(self._recv(_HEADER.size))
+        header = json.loads(self._recv(length))
+
+        if header.get('id') != request['id']:
+            raise ConnectionError(
+                f"Embedding service response id {header.get('id')} does not match request {request['id']}"
+            )
+
+        payload = b''
+        if 'shape' in header:
+            rows, dim = header['shape']
+            payload = self._recv(rows * dim * 4)
+
+        return header, payload
+
+    def _recv(self, size: int) -> bytes:
+        chunks, remaining = [], size
+        while remaining:
+            chunk = self._sock.recv(min(remaining, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Embedding service closed the connection")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
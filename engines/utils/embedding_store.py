@@ -0,0 +1,346 @@
+"""
+EmbeddingStore - 로컬 append-only 임베딩 저장소 (numpy memmap)
+
+엔티티(worldview, perception) 임베딩을 스크립트마다 다시 계산하거나 네트워크로 가져오지 않고
+로컬 연속 배열에서 바로 읽음:
+- vectors.f16: (n, dim) float16 행렬 (행 단위 append)
+- rows.tsv: 행 순서대로 "id<TAB>stamp" (stamp: 변경 감지용, 예: last_updated)
+- meta.json: dim, generation (compact()마다 증가, 세대 g > 0의 파일은 vectors.{g}.f16 / rows.{g}.tsv)
+같은 id를 다시 추가하면 새 행을 append하고 마지막 행이 유효 → compact()로 정리
+add()는 파일 잠금(flock) 안에서 다른 프로세스가 추가한 행을 먼저 읽고 append → 여러 워커가 같은 저장소 공유 가능
+compact()는 새 세대 파일을 쓴 뒤 meta.json을 rename으로 교체 → 다른 프로세스는 다음 잠금 구간에서
+세대가 바뀐 것을 보고 처음부터 다시 읽음 (이미 연 memmap은 이전 세대 파일을 그대로 읽음)
+
+matrix는 read-only memmap (zero-copy), cosine_similarity() / top_k()는 행렬을 배치로 나눠 계산
+
+Usage:
+    store = EmbeddingStore('embedding_cache/worldviews')
+    store.add(ids, vectors)
+    matrix = store.get(live_ids)    # matrix 전체가 아닌 id별 최신 행만 (대체된 행 / 중복 제외)
+    scores, rows = top_k(queries, matrix, k=10)
+    ids = [live_ids[r] for r in rows[0]]
+"""
+
+import os
+import json
+import fcntl
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DTYPE = np.float16
+
+
+class EmbeddingStore:
+    """Append-only float16 embedding matrix on disk + id → row index"""
+
+    def __init__(self, path: str, dim: Optional[int] = None):
+        """
+        Args:
+            path: 저장소 디렉토리 (없으면 생성)
+            dim: 임베딩 차원 (None이면 meta.json 또는 첫 add()에서 결정)
+        """
+        self.path = path
+        self.dim = dim
+        self.ids: List[str] = []
+        self.stamps: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = np.zeros((0, dim or 0), dtype=DTYPE)
+        self.generation = 0
+        self._rows_offset = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    def _data_paths(self, generation: int) -> Tuple[str, str]:
+        """(vectors, rows) file paths of a generation (0: 세대 도입 전 파일명)"""
+        suffix = f'.{generation}' if generation else ''
+        return (
+            os.path.join(self.path, f'vectors{suffix}.f16'),
+            os.path.join(self.path, f'rows{suffix}.tsv')
+        )
+
+    @property
+    def _vectors_path(self) -> str:
+        return self._data_paths(self.generation)[0]
+
+    @property
+    def _rows_path(self) -> str:
+        return self._data_paths(self.generation)[1]
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, 'meta.json')
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.rows
+
+    @property
+    def total_rows(self) -> int:
+        """Rows on disk, including superseded ones"""
+        return len(self.ids)
+
+    def stamp(self, entity_id: str) -> Optional[str]:
+        row = self.rows.get(entity_id)
+        return None if row is None else self.stamps[row]
+
+    def positions(self, entity_ids: Iterable[str]) -> np.ndarray:
+        """Matrix rows for the given ids (-1 if missing)"""
+        return np.array([self.rows.get(i, -1) for i in entity_ids], dtype=np.int64)
+
+    def get(self, entity_ids: List[str]) -> np.ndarray:
+        """
+        Vectors for the given ids (copy, 요청 순서)
+
+        Raises:
+            KeyError: 저장되지 않은 id
+        """
+        rows = self.positions(entity_ids)
+        missing = [i for i, r in zip(entity_ids, rows) if r < 0]
+        if missing:
+            raise KeyError(f"{len(missing)} ids not in embedding store (e.g. {missing[0]})")
+        return np.asarray(self.matrix[rows])
+
+    def add(self, entity_ids: List[str], vectors: np.ndarray, stamps: Optional[List[Optional[str]]] = None):
+        """
+        Append vectors (이미 있는 id는 새 행으로 대체)
+
+        Args:
+            entity_ids: id 리스트
+            vectors: (len(entity_ids), dim)
+            stamps: id별 변경 감지 값 (선택)
+        """
+        if not entity_ids:
+            return
+
+        vectors = np.asarray(vectors, dtype=DTYPE).reshape(len(entity_ids), -1)
+        stamps = stamps or [None] * len(entity_ids)
+
+        with self._locked():
+            self._refresh()
+
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._save_meta()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension mismatch: store {self.dim}, got {vectors.shape[1]}")
+
+            self._append(entity_ids, vectors, stamps)
+            self._map()
+
+    def compact(self, keep: Optional[Iterable[str]] = None):
+        """
+        Rewrite the store with one row per live id
+
+        다음 세대 파일에 쓰고 meta.json 교체로 전환 (같은 저장소를 연 다른 프로세스도 안전)
+
+        Args:
+            keep: 남길 id (None이면 전부), 나머지는 삭제
+        """
+        with self._locked():
+            self._refresh()
+            if self.dim is None:
+                return
+            self._map()
+
+            keep_ids = list(self.rows)
+            if keep is not None:
+                keep_set = set(keep)
+                keep_ids = [i for i in self.rows if i in keep_set]
+
+            vectors = self.get(keep_ids) if keep_ids else np.zeros((0, self.dim or 0), dtype=DTYPE)
+            stamps = [self.stamp(i) for i in keep_ids]
+
+            old_paths = self._data_paths(self.generation)
+            self._reset(self.generation + 1)
+            self.matrix = np.zeros((0, self.dim or 0), dtype=DTYPE)
+
+            # 중단된 이전 compact가 남긴 같은 세대 파일은 _append가 잘라내고 덮어씀
+            self._append(keep_ids, vectors, stamps, sync=True)
+            self._save_meta()
+
+            for path in old_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+            self._map()
+
+    def _append(self, entity_ids: List[str], vectors: np.ndarray, stamps: List[Optional[str]], sync: bool = False):
+        """Write rows (lock held, in-memory index up to date; sync: fsync before returning)"""
+        # 벡터 먼저 기록 → 중단되면 rows.tsv에 없는 꼬리 벡터가 남으므로 append 전에 잘라냄
+        row_bytes = (self.dim or 0) * np.dtype(DTYPE).itemsize
+        with open(self._vectors_path, 'ab') as f:
+            f.truncate(len(self.ids) * row_bytes)
+            f.write(np.ascontiguousarray(vectors).tobytes())
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        lines = ''.join(f"{entity_id}\t{'' if stamp is None else stamp}\n" for entity_id, stamp in zip(entity_ids, stamps))
+        with open(self._rows_path, 'ab') as f:
+            f.truncate(self._rows_offset)
+            f.write(lines.encode('utf-8'))
+            self._rows_offset = f.tell()
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        for entity_id, stamp in zip(entity_ids, stamps):
+            self.rows[entity_id] = len(self.ids)
+            self.ids.append(entity_id)
+            self.stamps.append(None if stamp is None else str(stamp))
+
+    def _reset(self, generation: int):
+        """Forget the in-memory index (다음 _refresh()가 generation 파일을 처음부터 읽음)"""
+        self.generation = generation
+        self.ids, self.stamps, self.rows = [], [], {}
+        self._rows_offset = 0
+
+    def _refresh(self):
+        """
+        Read rows appended since the last load (by this or another process)
+
+        다른 프로세스가 compact()해서 세대가 바뀌었거나 rows 파일이 읽은 위치보다 짧으면
+        (이전 인덱스가 더 이상 파일과 맞지 않음) 처음부터 다시 읽음
+        """
+        meta = self._read_meta()
+        if meta is not None:
+            self.dim = self.dim or meta['dim']
+            if meta.get('generation', 0) != self.generation:
+                self._reset(meta.get('generation', 0))
+
+        if self.dim is None or not os.path.exists(self._rows_path):
+            if self.ids:
+                self._reset(self.generation)
+            return
+
+        if os.path.getsize(self._rows_path) < self._rows_offset:
+            self._reset(self.generation)
+
+        row_bytes = self.dim * np.dtype(DTYPE).itemsize
+        stored_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+
+        with open(self._rows_path, 'rb') as f:
+            f.seek(self._rows_offset)
+            for line in f:
+                # 벡터가 없는 행, 기록 중인 마지막 줄은 건너뜀
+                if len(self.ids) >= stored_rows or not line.endswith(b'\n'):
+                    break
+                entity_id, stamp = line.decode('utf-8').rstrip('\n').split('\t', 1)
+                self.rows[entity_id] = len(self.ids)
+                self.ids.append(entity_id)
+                self.stamps.append(stamp or None)
+                self._rows_offset += len(line)
+
+    def _load(self):
+        with self._locked():
+            meta = self._read_meta()
+            if meta is not None:
+                if self.dim is not None and self.dim != meta['dim']:
+                    raise ValueError(f"Embedding dimension mismatch: store {meta['dim']}, requested {self.dim}")
+            elif self.dim is not None:
+                self._save_meta()
+
+            self._refresh()
+            self._map()
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.path, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _map(self):
+        if not self.ids:
+            self.matrix = np.zeros((0, self.dim or 0), dtype=DTYPE)
+            return
+        self.matrix = np.memmap(self._vectors_path, dtype=DTYPE, mode='r', shape=(len(self.ids), self.dim))
+
+    def _read_meta(self) -> Optional[Dict]:
+        if not os.path.exists(self._meta_path):
+            return None
+        with open(self._meta_path) as f:
+            return json.load(f)
+
+    def _save_meta(self):
+        """Replace meta.json atomically (compact()의 세대 전환 시점)"""
+        tmp_path = self._meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'dim': self.dim, 'generation': self.generation}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._meta_path)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (float32, zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def cosine_similarity(queries: np.ndarray, matrix: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+    """
+    Cosine similarity of every query against every matrix row
+
+    Args:
+        queries: (q, dim)
+        matrix: (n, dim), float16 memmap 가능 (batch_size 행씩 float32로 변환)
+
+    Returns:
+        (q, n) float32
+    """
+    queries = normalize(queries)
+    result = np.empty((len(queries), len(matrix)), dtype=np.float32)
+
+    for start in range(0, len(matrix), batch_size):
+        block = normalize(matrix[start:start + batch_size])
+        result[:, start:start + len(block)] = queries @ block.T
+
+    return result
+
+
+def top_k(
+    queries: np.ndarray,
+    matrix: np.ndarray,
+    k: int = 10,
+    batch_size: int = 8192
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k most similar matrix rows per query (cosine)
+
+    행렬 전체 유사도를 만들지 않고 batch마다 top-k를 합침
+
+    Returns:
+        (scores, rows): 둘 다 (q, min(k, n)), 유사도 내림차순
+    """
+    queries = normalize(queries)
+    k = min(k, len(matrix))
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+
+    if k == 0:
+        return best_scores, best_rows
+
+    for start in range(0, len(matrix), batch_size):
+        block = normalize(matrix[start:start + batch_size])
+        scores = queries @ block.T
+        rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_rows = np.concatenate([best_rows, rows], axis=1)
+        keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+        best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
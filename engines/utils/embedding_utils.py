@@ -1,21 +1,97 @@
 """
 Embedding utilities using OpenAI
+
+generate_batch():
+1. 중복 텍스트 제거 + 로컬 캐시(EmbeddingStore, model/dimensions/text 해시 키) 조회
+2. 남은 텍스트를 tiktoken 토큰 수 기준으로 요청 단위 분할 (항목 수 / 요청당 토큰 예산)
+3. 요청을 동시에 실행 (동시 요청 수 + 분당 요청/토큰 rate limiter, 429/5xx는 tenacity 재시도)
+4. 입력 순서대로 결과 반환
 """
 
 import os
-from typing import List
-from openai import AsyncOpenAI
+import time
+import asyncio
+import hashlib
+import tiktoken
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
+from engines.utils.embedding_store import EmbeddingStore
 
 load_dotenv()
 
+DEFAULT_CACHE_PATH = os.getenv('OPENAI_EMBEDDING_CACHE', 'embedding_cache/openai')
+
+# text-embedding-3-*: 입력당 8191 토큰, 요청당 2048개 / 300k 토큰
+MAX_INPUT_TOKENS = 8191
+
+
+class AsyncRateLimiter:
+    """Sliding one-minute window over requests and tokens"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window: deque = deque()  # (timestamp, tokens)
+        self.tokens_in_window = 0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.window and now - self.window[0][0] >= 60:
+                    self.tokens_in_window -= self.window.popleft()[1]
+
+                # 한 요청이 분당 토큰 한도보다 크면 창이 빌 때까지만 대기
+                fits_tokens = self.tokens_in_window + tokens <= self.tokens_per_minute or not self.window
+                if len(self.window) < self.requests_per_minute and fits_tokens:
+                    self.window.append((now, tokens))
+                    self.tokens_in_window += tokens
+                    return
+
+                await asyncio.sleep(60 - (now - self.window[0][0]))
+
+
 class EmbeddingGenerator:
     """Generate embeddings using OpenAI"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        dimensions: int = 1536,
+        max_batch_items: int = 256,
+        max_batch_tokens: int = 100_000,
+        max_concurrency: int = 4,
+        requests_per_minute: int = 3000,
+        tokens_per_minute: int = 1_000_000,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH
+    ):
+        """
+        Args:
+            model: OpenAI 임베딩 모델
+            dimensions: 출력 차원 (text-embedding-3-*는 축소 가능)
+            max_batch_items: 요청당 최대 텍스트 수 (API 한도 2048)
+            max_batch_tokens: 요청당 최대 토큰 수 (API 한도 300k)
+            max_concurrency: 동시 요청 수
+            requests_per_minute: 분당 요청 한도 (계정 tier에 맞게)
+            tokens_per_minute: 분당 토큰 한도
+            cache_path: 임베딩 캐시 디렉토리 (EmbeddingStore), None이면 캐시하지 않음
+        """
         self.client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.model = "text-embedding-3-small"
-        self.dimensions = 1536
+        self.model = model
+        self.dimensions = dimensions
+
+        self.max_batch_items = max_batch_items
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = AsyncRateLimiter(requests_per_minute, tokens_per_minute)
+        self.encoding = tiktoken.encoding_for_model(self.model)
+        # 모델/차원별 디렉토리 (EmbeddingStore는 차원 고정)
+        self.cache = EmbeddingStore(os.path.join(cache_path, f"{model}-{dimensions}"), dim=dimensions) if cache_path else None
 
     async def generate(self, text: str) -> List[float]:
         """
@@ -25,33 +101,101 @@ class EmbeddingGenerator:
             text: Text to embed
 
         Returns:
-            List of floats (1536 dimensions)
+            List of floats (self.dimensions)
         """
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=text,
-            dimensions=self.dimensions
-        )
-
-        return response.data[0].embedding
+        return (await self.generate_batch([text]))[0]
 
     async def generate_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts
 
         Args:
-            texts: List of texts to embed
+            texts: List of texts to embed (중복 허용, 순서 유지)
+
+        Returns:
+            List of embeddings (texts와 같은 순서, 캐시 hit은 float16 정밀도)
+        """
+        unique = list(dict.fromkeys(texts))
+        keys = {text: self._cache_key(text) for text in unique}
+
+        vectors: Dict[str, List[float]] = {}
+        if self.cache is not None:
+            cached = [text for text in unique if keys[text] in self.cache]
+            if cached:
+                for text, vec in zip(cached, self.cache.get([keys[t] for t in cached]).astype(np.float32)):
+                    vectors[text] = vec.tolist()
+
+        missing = [text for text in unique if text not in vectors]
+        if missing:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            batches = self._split_batches(missing)
+            results = await asyncio.gather(*(self._embed_batch(batch, semaphore) for batch in batches))
+
+            for batch, embeddings in zip(batches, results):
+                for (text, _), embedding in zip(batch, embeddings):
+                    vectors[text] = embedding
+
+                if self.cache is not None:
+                    self.cache.add([keys[text] for text, _ in batch], np.array(embeddings))
+
+        return [vectors[text] for text in texts]
+
+    def _split_batches(self, texts: List[str]) -> List[List[tuple]]:
+        """
+        Group texts into requests by item count and token budget
 
         Returns:
-            List of embeddings
+            [[(text, token 수), ...], ...]
         """
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=texts,
-            dimensions=self.dimensions
-        )
+        batches, current, current_tokens = [], [], 0
+
+        for text in texts:
+            tokens = min(len(self.encoding.encode(text, disallowed_special=())), MAX_INPUT_TOKENS)
+
+            if current and (len(current) >= self.max_batch_items or current_tokens + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+
+            current.append((text, tokens))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    async def _embed_batch(self, batch: List[tuple], semaphore: asyncio.Semaphore) -> List[List[float]]:
+        inputs = [self._truncate(text, tokens) for text, tokens in batch]
+        total_tokens = sum(tokens for _, tokens in batch)
+
+        async with semaphore:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type((RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)),
+                wait=wait_random_exponential(multiplier=1, max=60),
+                stop=stop_after_attempt(6),
+                reraise=True
+            ):
+                with attempt:
+                    await self.rate_limiter.acquire(total_tokens)
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=inputs,
+                        dimensions=self.dimensions
+                    )
+
+        # 응답 순서는 index 기준으로 정렬
+        return [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+
+    def _truncate(self, text: str, tokens: int) -> str:
+        """API 입력 한도(8191 토큰)를 넘는 텍스트는 앞부분만 사용 (빈 문자열은 API가 거부)"""
+        if not text:
+            return ' '
+        if tokens < MAX_INPUT_TOKENS:
+            return text
+        return self.encoding.decode(self.encoding.encode(text, disallowed_special=())[:MAX_INPUT_TOKENS])
 
-        return [data.embedding for data in response.data]
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model}:{self.dimensions}:{text}".encode('utf-8')).hexdigest()
 
 # Global instance
 _embedding_generator = None
@@ -61,4 +205,4 @@ def get_embedding_generator() -> EmbeddingGenerator:
     global _embedding_generator
     if _embedding_generator is None:
         _embedding_generator = EmbeddingGenerator()
-    return _embedding_generator
\ No newline at end of file
+    return _embedding_generator
@@ -0,0 +1,360 @@
+"""
+LocalMirror - Supabase 테이블의 로컬 DuckDB 미러 (incremental sync)
+
+분석용 읽기 작업을 production DB 대신 로컬 컬럼 저장소에서 실행:
+- updated_at/created_at + id watermark로 변경분만 가져옴
+- 삭제된 행은 id 목록 비교로 정리 (reconcile): 전체 id를 훑으므로 매 sync가 아니라
+  LOCAL_MIRROR_RECONCILE_HOURS(기본 24시간)마다 테이블별로 한 번만
+- query() / query_arrow()로 SQL 분석, export_parquet()로 Parquet 내보내기
+
+Usage:
+    mirror = LocalMirror()
+    mirror.sync()
+    rows = mirror.query("SELECT m, count(*) FROM (SELECT unnest(mechanisms) AS m FROM layered_perceptions) GROUP BY m")
+"""
+
+import os
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import duckdb
+import pyarrow as pa
+from engines.utils.supabase_client import get_supabase
+
+DEFAULT_MIRROR_PATH = os.getenv('LOCAL_MIRROR_PATH', 'local_mirror/mirror.duckdb')
+
+# 삭제 정리(전체 id 조회) 주기
+DEFAULT_RECONCILE_HOURS = float(os.getenv('LOCAL_MIRROR_RECONCILE_HOURS', '24'))
+
+# table → columns (DuckDB type) + watermark column
+# 임베딩 컬럼은 제외 (벡터 작업은 embedding store 사용)
+MIRROR_TABLES = {
+    'contents': {
+        'watermark': 'updated_at',
+        'columns': {
+            'id': 'UUID',
+            'source_type': 'VARCHAR',
+            'source_url': 'VARCHAR',
+            'source_id': 'VARCHAR',
+            'title': 'VARCHAR',
+            'body': 'VARCHAR',
+            'metadata': 'JSON',
+            'base_credibility': 'DOUBLE',
+            'published_at': 'TIMESTAMPTZ',
+            'collected_at': 'TIMESTAMPTZ',
+            'archived': 'BOOLEAN',
+            'archived_at': 'TIMESTAMPTZ',
+            'created_at': 'TIMESTAMPTZ',
+            'updated_at': 'TIMESTAMPTZ',
+        }
+    },
+    'layered_perceptions': {
+        'watermark': 'updated_at',
+        'columns': {
+            'id': 'UUID',
+            'content_id': 'UUID',
+            'explicit_claims': 'JSON',
+            'implicit_assumptions': 'JSON',
+            'reasoning_gaps': 'JSON',
+            'deep_beliefs': 'VARCHAR[]',
+            'worldview_hints': 'VARCHAR',
+            'mechanisms': 'VARCHAR[]',
+            'skipped_steps': 'VARCHAR[]',
+            'actor': 'JSON',
+            'logic_chain': 'VARCHAR[]',
+            'consistency_pattern': 'VARCHAR',
+            'archived': 'BOOLEAN',
+            'created_at': 'TIMESTAMPTZ',
+            'updated_at': 'TIMESTAMPTZ',
+        }
+    },
+    'perception_worldview_links': {
+        'watermark': 'created_at',
+        'columns': {
+            'id': 'UUID',
+            'perception_id': 'UUID',
+            'worldview_id': 'UUID',
+            'relevance_score': 'DOUBLE',
+            'created_at': 'TIMESTAMPTZ',
+        }
+    },
+    'worldviews': {
+        'watermark': 'updated_at',
+        'columns': {
+            'id': 'UUID',
+            'title': 'VARCHAR',
+            'frame': 'JSON',
+            'description': 'VARCHAR',
+            'core_subject': 'VARCHAR',
+            'core_attributes': 'VARCHAR[]',
+            'total_perceptions': 'INTEGER',
+            'version': 'INTEGER',
+            'last_updated': 'TIMESTAMP',
+            'archived': 'BOOLEAN',
+            'archived_at': 'TIMESTAMP',
+            'parent_worldview_id': 'UUID',
+            'level': 'INTEGER',
+            'created_at': 'TIMESTAMPTZ',
+            'updated_at': 'TIMESTAMPTZ',
+        }
+    },
+    'worldview_patterns': {
+        'watermark': 'updated_at',
+        'columns': {
+            'id': 'UUID',
+            'worldview_id': 'UUID',
+            'layer': 'VARCHAR',
+            'text': 'VARCHAR',
+            'strength': 'DOUBLE',
+            'status': 'VARCHAR',
+            'first_seen': 'TIMESTAMP',
+            'last_seen': 'TIMESTAMP',
+            'appearance_count': 'INTEGER',
+            'created_at': 'TIMESTAMP',
+            'updated_at': 'TIMESTAMP',
+        }
+    },
+}
+
+# DuckDB 타입 → Arrow staging 타입 (나머지는 문자열로 받아서 CAST)
+_ARROW_TYPES = {
+    'DOUBLE': pa.float64(),
+    'INTEGER': pa.int64(),
+    'BOOLEAN': pa.bool_(),
+    'VARCHAR[]': pa.list_(pa.string()),
+}
+
+
+class LocalMirror:
+    """Incremental local DuckDB mirror of the analysis tables"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        read_only: bool = False,
+        page_size: int = 1000,
+        reconcile_hours: float = DEFAULT_RECONCILE_HOURS
+    ):
+        """
+        Args:
+            path: DuckDB 파일 경로 (기본 LOCAL_MIRROR_PATH)
+            read_only: 엔진에서 분석 쿼리만 할 때 True
+            page_size: Supabase 페이지 크기
+            reconcile_hours: 삭제 정리 주기 (sync(reconcile_deletes=None)일 때)
+        """
+        self.path = path or DEFAULT_MIRROR_PATH
+        self.read_only = read_only
+        self.page_size = page_size
+        self.reconcile_interval = timedelta(hours=reconcile_hours)
+
+        if not read_only:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.conn = duckdb.connect(self.path, read_only=read_only)
+
+        if not read_only:
+            self._ensure_schema()
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def sync(self, tables: Optional[List[str]] = None, reconcile_deletes: Optional[bool] = None) -> Dict:
+        """
+        변경분 동기화
+
+        Args:
+            tables: 동기화할 테이블 (None = 전체)
+            reconcile_deletes: Supabase에서 삭제된 행을 로컬에서도 삭제
+                (None: 마지막 정리 후 reconcile_hours가 지난 테이블만, True: 항상, False: 안 함)
+
+        Returns:
+            {table: {'upserted': int, 'deleted': int 또는 None (삭제 정리 안 함), 'watermark': str}}
+        """
+        if self.read_only:
+            raise RuntimeError("LocalMirror opened read-only; cannot sync")
+
+        supabase = get_supabase()
+        report = {}
+
+        for table in tables or list(MIRROR_TABLES.keys()):
+            spec = MIRROR_TABLES[table]
+            watermark_col = spec['watermark']
+            select_cols = ', '.join(spec['columns'].keys())
+
+            watermark = self._get_watermark(table)
+            new_watermark = watermark
+            upserted = 0
+            offset = 0
+
+            while True:
+                query = supabase.table(table).select(select_cols)\
+                    .order(watermark_col)\
+                    .order('id')
+
+                # gte: 같은 timestamp의 행이 페이지 경계에서 누락되지 않도록 (upsert라 중복 무해)
+                if watermark:
+                    query = query.gte(watermark_col, watermark)
+
+                rows = query.range(offset, offset + self.page_size - 1).execute().data
+
+                if not rows:
+                    break
+
+                self._upsert(table, rows)
+                upserted += len(rows)
+
+                # watermark 오름차순 정렬이므로 마지막 행이 최대값
+                new_watermark = rows[-1].get(watermark_col) or new_watermark
+
+                if len(rows) < self.page_size:
+                    break
+                offset += self.page_size
+
+            deleted = None
+            if reconcile_deletes or (reconcile_deletes is None and self._reconcile_due(table)):
+                deleted = self._reconcile(supabase, table)
+
+            self._set_watermark(table, new_watermark, reconciled=deleted is not None)
+            report[table] = {'upserted': upserted, 'deleted': deleted, 'watermark': new_watermark}
+
+        return report
+
+    def _upsert(self, table: str, rows: List[Dict]):
+        columns = MIRROR_TABLES[table]['columns']
+
+        arrays = {}
+        for col, col_type in columns.items():
+            values = [row.get(col) for row in rows]
+            if col_type == 'JSON':
+                values = [json.dumps(v, ensure_ascii=False) if v is not None else None for v in values]
+            elif col_type == 'VARCHAR[]':
+                values = [[str(x) for x in v] if isinstance(v, list) else None for v in values]
+            elif col_type not in _ARROW_TYPES:
+                values = [str(v) if v is not None else None for v in values]
+            arrays[col] = pa.array(values, type=_ARROW_TYPES.get(col_type, pa.string()))
+
+        # DuckDB replacement scan으로 로컬 변수 staging을 직접 조회
+        staging = pa.table(arrays)
+        casts = ', '.join(f'CAST("{col}" AS {col_type})' for col, col_type in columns.items())
+        self.conn.execute(f'INSERT OR REPLACE INTO "{table}" SELECT {casts} FROM staging')
+
+    def _reconcile(self, supabase, table: str) -> int:
+        """Supabase에 없는 로컬 행 삭제 (id만 조회)"""
+        remote_ids = []
+        offset = 0
+        while True:
+            rows = supabase.table(table).select('id').order('id')\
+                .range(offset, offset + self.page_size - 1).execute().data
+            remote_ids.extend(r['id'] for r in rows)
+            if len(rows) < self.page_size:
+                break
+            offset += self.page_size
+
+        remote = pa.table({'id': pa.array(remote_ids, type=pa.string())})
+        before = self.conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+        self.conn.execute(
+            f'DELETE FROM "{table}" WHERE CAST(id AS VARCHAR) NOT IN (SELECT id FROM remote)'
+        )
+        after = self.conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+        return before - after
+
+    # ------------------------------------------------------------------
+    # Query helpers
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, params: Optional[List] = None) -> List[Dict]:
+        """SQL 실행 → dict 리스트 (Supabase 조회 결과와 같은 형태)"""
+        cursor = self.conn.execute(sql, params or [])
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def query_arrow(self, sql: str, params: Optional[List] = None) -> pa.Table:
+        """SQL 실행 → Arrow Table (대량 분석용)"""
+        return self.conn.execute(sql, params or []).arrow()
+
+    def export_parquet(self, directory: str) -> List[str]:
+        """미러된 전체 테이블을 Parquet(zstd)로 내보내기"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for table in MIRROR_TABLES:
+            path = os.path.join(directory, f'{table}.parquet')
+            self.conn.execute(f"COPY \"{table}\" TO '{path}' (FORMAT parquet, COMPRESSION zstd)")
+            paths.append(path)
+        return paths
+
+    def sync_status(self) -> List[Dict]:
+        """테이블별 마지막 watermark와 동기화 / 삭제 정리 시각"""
+        return self.query(
+            "SELECT table_name, watermark, synced_at, reconciled_at FROM _sync_state ORDER BY table_name"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _ensure_schema(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS _sync_state (
+                table_name VARCHAR PRIMARY KEY,
+                watermark VARCHAR,
+                synced_at TIMESTAMPTZ
+            )
+        """)
+        self.conn.execute("ALTER TABLE _sync_state ADD COLUMN IF NOT EXISTS reconciled_at TIMESTAMPTZ")
+
+        for table, spec in MIRROR_TABLES.items():
+            cols = ',\n'.join(
+                f'"{col}" {col_type}' + (' PRIMARY KEY' if col == 'id' else '')
+                for col, col_type in spec['columns'].items()
+            )
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({cols})')
+
+        # Convenience view (active window, Supabase active_perceptions와 동일)
+        self.conn.execute("""
+            CREATE OR REPLACE VIEW active_perceptions AS
+            SELECT lp.* FROM layered_perceptions lp
+            JOIN contents c ON lp.content_id = c.id
+            WHERE NOT coalesce(c.archived, false)
+        """)
+
+    def _get_watermark(self, table: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT watermark FROM _sync_state WHERE table_name = ?", [table]
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, table: str, watermark: Optional[str], reconciled: bool = False):
+        now = datetime.now(timezone.utc)
+        self.conn.execute(
+            """
+            INSERT INTO _sync_state (table_name, watermark, synced_at, reconciled_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (table_name) DO UPDATE SET
+                watermark = excluded.watermark,
+                synced_at = excluded.synced_at,
+                reconciled_at = coalesce(excluded.reconciled_at, _sync_state.reconciled_at)
+            """,
+            [table, watermark, now, now if reconciled else None]
+        )
+
+    def _reconcile_due(self, table: str) -> bool:
+        row = self.conn.execute(
+            "SELECT reconciled_at FROM _sync_state WHERE table_name = ?", [table]
+        ).fetchone()
+        return not row or row[0] is None or datetime.now(timezone.utc) - row[0] >= self.reconcile_interval
+
+
+# Global instance
+_local_mirror = None
+
+
+def get_local_mirror(read_only: bool = True) -> LocalMirror:
+    """Get or create local mirror instance (engines: read-only)"""
+    global _local_mirror
+    if _local_mirror is None:
+        _local_mirror = LocalMirror(read_only=read_only)
+    return _local_mirror
@@ -0,0 +1,205 @@
+"""
+Near-duplicate content detection (MinHash + LSH)
+
+DC 개념글은 거의 그대로 재게시/인용되는 경우가 많음 → 수집 시점에 기존 글과 비교해
+duplicate_of를 기록하고, process_new_contents는 LLM 대신 원본 perception을 복사 (migration 519)
+
+- normalize_body(): URL / DC 앱 서명 / 문장부호 / 공백 차이 제거
+- 문자 5-gram shingle → MinHash 서명 (128 permutations, hashlib 기반이라 프로세스 간 결정적)
+- LSH: 16 bands × 8 rows → 밴드 해시를 contents.minhash_bands (GIN)에 저장, 같은 밴드가 하나라도 있으면 후보
+  (Jaccard 0.8 → 95%, 0.9 → 99.9% 후보 포함)
+- 후보는 저장된 서명으로 추정 Jaccard를 계산해 threshold 이상만 중복 판정
+
+Usage:
+    detector = NearDuplicateDetector()
+    data.update(detector.fields(body))   # contents insert 전에
+"""
+
+import re
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from engines.utils.supabase_client import get_supabase
+
+# Universal hashing (a * x + b) mod p: p = 2^32 - 5 → a, x < 2^32 이므로 uint64 안에서 계산
+_PRIME = (1 << 32) - 5
+
+_URL = re.compile(r'https?://\S+|www\.\S+')
+# DC 모바일 앱 / 갤러리 서명
+_SIGNATURE = re.compile(r'-\s*dc\s*official\s*app|-\s*dc\s*app|dcinside\.com', re.IGNORECASE)
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_body(text: str) -> str:
+    """Lowercase, drop URLs / app signatures / punctuation, collapse whitespace"""
+    text = _SIGNATURE.sub(' ', _URL.sub(' ', (text or '').lower()))
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+class NearDuplicateDetector:
+    """MinHash-LSH near-duplicate lookup over contents.body"""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        min_length: int = 50
+    ):
+        """
+        Args:
+            threshold: 중복으로 판정할 추정 Jaccard 유사도
+            num_perm: MinHash 서명 길이
+            bands: LSH 밴드 수 (num_perm의 약수, rows = num_perm / bands)
+            shingle_size: 문자 n-gram 크기
+            min_length: 정규화 후 이보다 짧은 글은 비교하지 않음 ("ㅈㄱㄴ" 같은 짧은 글끼리 오탐 방지)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.supabase = get_supabase()
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_length = min_length
+
+        # 고정 seed → 저장된 서명과 항상 같은 permutation
+        rng = np.random.default_rng(519)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of the normalized text
+
+        Returns:
+            (num_perm,) uint32, 너무 짧은 글은 None
+        """
+        normalized = normalize_body(text)
+        if len(normalized) < self.min_length:
+            return None
+
+        n = self.shingle_size
+        shingles = {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') % _PRIME for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+        # (len(shingles), num_perm) permuted hashes → 열별 최솟값
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_PRIME)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_hashes(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit hash per band (BIGINT, 밴드 번호 포함 → 다른 밴드끼리 충돌 없음)"""
+        rows = signature.astype('<u4').reshape(self.bands, self.rows)
+        return [
+            int.from_bytes(hashlib.blake2b(bytes([band]) + rows[band].tobytes(), digest_size=8).digest(), 'little', signed=True)
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(np.asarray(a, dtype=np.uint32) == np.asarray(b, dtype=np.uint32)))
+
+    def find_duplicate(
+        self,
+        signature: np.ndarray,
+        bands: Optional[List[int]] = None,
+        exclude_id: Optional[str] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the canonical content this signature duplicates
+
+        후보가 이미 다른 글의 중복이면 그 원본(duplicate_of)을 반환 → 체인 없이 항상 원본을 가리킴
+
+        Returns:
+            (원본 content id, 추정 Jaccard) 또는 None
+        """
+        result = self.supabase.rpc('find_near_duplicate_contents', {
+            'bands': bands if bands is not None else self.band_hashes(signature),
+            'exclude_id': exclude_id,
+            'limit_count': 20
+        }).execute()
+
+        best = None
+        for row in result.data or []:
+            if not row.get('minhash'):
+                continue
+            score = self.similarity(signature, to_unsigned(row['minhash']))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (row.get('duplicate_of') or row['id'], score)
+
+        return best
+
+    def fields(self, body: str, exclude_id: Optional[str] = None) -> Dict:
+        """
+        contents columns for a new (or backfilled) body
+
+        Returns:
+            {'minhash', 'minhash_bands', 'duplicate_of', 'duplicate_similarity'} (짧은 글은 모두 None)
+        """
+        signature = self.signature(body)
+        if signature is None:
+            return {'minhash': None, 'minhash_bands': None, 'duplicate_of': None, 'duplicate_similarity': None}
+
+        bands = self.band_hashes(signature)
+        duplicate = self.find_duplicate(signature, bands, exclude_id=exclude_id)
+
+        return {
+            'minhash': to_signed(signature),
+            'minhash_bands': bands,
+            'duplicate_of': duplicate[0] if duplicate else None,
+            'duplicate_similarity': round(duplicate[1], 4) if duplicate else None
+        }
+
+    def backfill(self, batch_size: int = 500, limit: Optional[int] = None) -> Dict:
+        """
+        Sign existing contents that have no minhash yet (collected_at 순 → 먼저 수집된 글이 원본)
+
+        짧은 글은 minhash가 계속 NULL → offset으로 건너뜀
+
+        Returns:
+            {'signed': int, 'duplicates': int, 'skipped': int}
+        """
+        stats = {'signed': 0, 'duplicates': 0, 'skipped': 0}
+
+        while limit is None or stats['signed'] + stats['skipped'] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - stats['signed'] - stats['skipped'])
+            rows = self.supabase.table('contents')\
+                .select('id, body')\
+                .is_('minhash', 'null')\
+                .order('collected_at')\
+                .order('id')\
+                .range(stats['skipped'], stats['skipped'] + size - 1)\
+                .execute().data or []
+
+            if not rows:
+                break
+
+            for row in rows:
+                fields = self.fields(row['body'], exclude_id=row['id'])
+                if fields['minhash'] is None:
+                    stats['skipped'] += 1
+                    continue
+
+                self.supabase.table('contents').update(fields).eq('id', row['id']).execute()
+                stats['signed'] += 1
+                if fields['duplicate_of']:
+                    stats['duplicates'] += 1
+
+        return stats
+
+
+def to_signed(signature: np.ndarray) -> List[int]:
+    """uint32 signature → INT[] (Postgres에 unsigned 정수형 없음)"""
+    return np.asarray(signature, dtype=np.uint32).view(np.int32).tolist()
+
+
+def to_unsigned(values: List[int]) -> np.ndarray:
+    return np.asarray(values, dtype=np.int32).view(np.uint32)
@@ -0,0 +1,262 @@
+"""
+Prompt Body Preprocessing - extractor 프롬프트에 넣을 제목/본문을 토큰 예산 안에서 준비
+
+기존 content['body'][:2000]은 글자 수로만 잘라서 긴 글은 결론이 잘리고 프롬프트 토큰 수는 통제되지 않음:
+
+1. Boilerplate 제거: 인용 줄(>), URL, DC 앱 서명, 반복 줄, 반복 문자(ㅋㅋㅋㅋㅋ → ㅋㅋㅋ), 글자 없는 줄
+2. 구간별 토큰 예산 (tiktoken cl100k_base로 계산, Claude 토크나이저 근사): 제목 / 본문
+3. 예산을 넘는 긴 글은 LLM 요약 없이 문장 단위 salient span 선택:
+   - 도입(앞 35%)과 결론(끝 25%)을 먼저 확보
+   - 남은 예산은 주장 표지어 / 행위자 / 제목과 겹치는 중간 문장 순으로 채움
+   - 원래 순서 유지, 생략 구간은 "…"
+4. 통계: 기존 body[:2000] 대비 프롬프트 토큰 (process_new_contents가 실행마다 출력)
+
+Usage:
+    prepared = prepare_content(content)   # 공용 BodyPreprocessor
+    prepared['title'], prepared['body']
+    get_preprocessor().stats              # {'prompts', 'baseline_tokens', 'tokens', 'condensed'}
+"""
+
+import os
+import re
+import tiktoken
+from functools import lru_cache
+from typing import Dict, List
+from engines.utils.claim_filter import CONCRETE_SUBJECTS
+from engines.utils.near_duplicate import normalize_body
+
+TOKENIZER = 'cl100k_base'
+
+DEFAULT_BODY_TOKENS = int(os.getenv('PROMPT_BODY_TOKENS', '800'))
+DEFAULT_TITLE_TOKENS = 64
+
+# 기존 프롬프트의 글자 수 절단 (절약량 기준)
+LEGACY_BODY_CHARS = 2000
+
+GAP = '…'
+
+# 긴 문장을 잘라서라도 넣을 최소 남은 예산
+MIN_SPAN_TOKENS = 16
+
+_URL = re.compile(r'https?://\S+|www\.\S+')
+_SIGNATURE = re.compile(r'-\s*dc\s*official\s*app|-\s*dc\s*app', re.IGNORECASE)
+_QUOTE = re.compile(r'^\s*(>|&gt;)')
+_WORD = re.compile(r'[가-힣A-Za-z0-9]')
+# 숫자 제외 (1000000 같은 값은 유지)
+_REPEAT_CHAR = re.compile(r'([^\d\s])\1{3,}')
+_SPACES = re.compile(r'[ \t\u00a0\u200b]+')
+# 문장부호 / "~다", "~요" 종결 뒤 공백, 줄바꿈
+_SENTENCE = re.compile(r'(?<=[.!?。다요])\s+|\n+')
+
+# 주장 / 인과 / 표면_부정 표지어 (중간 문장 선택 점수)
+CLAIM_MARKERS = [
+    '때문', '결국', '따라서', '그래서', '반드시', '분명', '사실', '증거', '왜냐',
+    '결론', '의도', '목적', '배후', '속셈', '노리', '계획', '뻔하', '당연히', '진짜'
+]
+
+
+def clean_body(text: str) -> str:
+    """Strip quotes, links, app signatures, repeated lines/characters and empty lines"""
+    lines, seen = [], set()
+
+    for line in (text or '').splitlines():
+        if _QUOTE.match(line):
+            continue
+
+        line = _SPACES.sub(' ', _REPEAT_CHAR.sub(r'\1\1\1', _SIGNATURE.sub(' ', _URL.sub(' ', line)))).strip()
+        if not _WORD.search(line):
+            continue
+
+        key = normalize_body(line)
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE.split(text) if s and s.strip()]
+
+
+def _bigrams(text: str) -> set:
+    text = text.replace(' ', '')
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class BodyPreprocessor:
+    """Token-budgeted title/body for extraction prompts"""
+
+    def __init__(
+        self,
+        body_tokens: int = DEFAULT_BODY_TOKENS,
+        title_tokens: int = DEFAULT_TITLE_TOKENS,
+        lead_ratio: float = 0.35,
+        tail_ratio: float = 0.25
+    ):
+        """
+        Args:
+            body_tokens: 본문 토큰 예산 (PROMPT_BODY_TOKENS)
+            title_tokens: 제목 토큰 예산
+            lead_ratio: 긴 글에서 도입부에 먼저 배정할 예산 비율
+            tail_ratio: 긴 글에서 결론부에 먼저 배정할 예산 비율
+        """
+        self.encoding = tiktoken.get_encoding(TOKENIZER)
+        self.body_tokens = body_tokens
+        self.title_tokens = title_tokens
+        self.lead_ratio = lead_ratio
+        self.tail_ratio = tail_ratio
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {'prompts': 0, 'baseline_tokens': 0, 'tokens': 0, 'condensed': 0}
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def head(self, text: str, tokens: int) -> str:
+        """First `tokens` tokens of text (잘린 멀티바이트 문자 제거)"""
+        ids = self.encoding.encode(text, disallowed_special=())
+        if len(ids) <= tokens:
+            return text
+        return self.encoding.decode(ids[:tokens]).rstrip('\ufffd').rstrip()
+
+    def tail(self, text: str, tokens: int) -> str:
+        """Last `tokens` tokens of text"""
+        ids = self.encoding.encode(text, disallowed_special=())
+        if len(ids) <= tokens:
+            return text
+        return self.encoding.decode(ids[-tokens:]).lstrip('\ufffd').lstrip()
+
+    def _salience(self, sentence: str, tokens: int, title_bigrams: set) -> float:
+        markers = sum(1 for m in CLAIM_MARKERS if m in sentence)
+        actors = sum(1 for s in CONCRETE_SUBJECTS if s in sentence)
+        overlap = len(_bigrams(sentence) & title_bigrams) / len(title_bigrams) if title_bigrams else 0.0
+        return (markers + 0.5 * actors + 2 * overlap) / max(tokens, 1) ** 0.5
+
+    def condense(self, text: str, budget: int, title: str = '') -> str:
+        """
+        Salient spans of a post longer than the budget
+
+        도입 / 결론 문장을 먼저 넣고, 남은 예산은 점수 높은 중간 문장으로 채움
+        (문장 하나가 구간 예산보다 길면 토큰 단위로 자름)
+        """
+        sentences = split_sentences(text)
+        counts = [self.count(s) + 1 for s in sentences]  # +1: 구분자 / 생략 표시
+        selected: Dict[int, str] = {}
+
+        # 문장 구분이 없는 글: 앞부분 + 끝부분
+        if len(sentences) == 1:
+            limit = int(budget * self.tail_ratio)
+            return self.head(f"{self.head(text, budget - limit - 1)} {GAP} {self.tail(text, limit)}", budget)
+
+        # 구간 예산보다 긴 도입 / 결론 문장: (index, 배정 토큰) → 남는 예산을 마지막에 더 줌
+        truncated = []
+
+        used, limit = 0, int(budget * self.lead_ratio)
+        for i, n in enumerate(counts):
+            if used + n > limit:
+                if not selected:
+                    selected[i] = self.head(sentences[i], limit) + GAP
+                    truncated.append((i, limit))
+                    used = limit
+                break
+            selected[i] = sentences[i]
+            used += n
+
+        tail_used, limit = 0, int(budget * self.tail_ratio)
+        for i in range(len(sentences) - 1, -1, -1):
+            if i in selected:
+                break
+            if tail_used + counts[i] > limit:
+                if tail_used == 0:
+                    selected[i] = GAP + self.tail(sentences[i], limit)
+                    truncated.append((i, limit))
+                    tail_used = limit
+                break
+            selected[i] = sentences[i]
+            tail_used += counts[i]
+        used += tail_used
+
+        title_bigrams = _bigrams(normalize_body(title))
+        middle = sorted(
+            (i for i in range(len(sentences)) if i not in selected),
+            key=lambda i: self._salience(sentences[i], counts[i], title_bigrams),
+            reverse=True
+        )
+        for i in middle:
+            if used + counts[i] <= budget:
+                selected[i] = sentences[i]
+                used += counts[i]
+            elif budget - used > MIN_SPAN_TOKENS:
+                # 예산보다 긴 핵심 문장은 남은 예산만큼 앞부분
+                selected[i] = self.head(sentences[i], budget - used - 1) + GAP
+                used = budget
+
+        if truncated and budget - used > MIN_SPAN_TOKENS:
+            i, limit = truncated[0]
+            if i == 0:
+                selected[i] = self.head(sentences[i], limit + budget - used) + GAP
+            else:
+                selected[i] = GAP + self.tail(sentences[i], limit + budget - used)
+
+        parts, previous = [], -1
+        for i in sorted(selected):
+            if i != previous + 1:
+                parts.append(GAP)
+            parts.append(selected[i])
+            previous = i
+        if previous != len(sentences) - 1:
+            parts.append(GAP)
+
+        text = ' '.join(parts)
+        while f'{GAP} {GAP}' in text or GAP * 2 in text:
+            text = text.replace(f'{GAP} {GAP}', GAP).replace(GAP * 2, GAP)
+
+        # 구분자 / 토큰 병합 차이로 넘치는 경우만 마지막 보정
+        return self.head(text, budget)
+
+    def prepare(self, content: Dict) -> Dict:
+        """
+        Title/body for an extraction prompt
+
+        Returns:
+            {'title', 'body', 'tokens', 'baseline_tokens', 'condensed'}
+            (tokens / baseline_tokens: 제목+본문, baseline은 기존 body[:2000])
+        """
+        raw_title = content.get('title') or ''
+        raw_body = content.get('body') or ''
+
+        title = self.head(_SPACES.sub(' ', raw_title).strip(), self.title_tokens)
+        body = clean_body(raw_body)
+
+        condensed = self.count(body) > self.body_tokens
+        if condensed:
+            body = self.condense(body, self.body_tokens, title)
+
+        tokens = self.count(title) + self.count(body)
+        baseline = self.count(raw_title) + self.count(raw_body[:LEGACY_BODY_CHARS])
+
+        self.stats['prompts'] += 1
+        self.stats['baseline_tokens'] += baseline
+        self.stats['tokens'] += tokens
+        self.stats['condensed'] += int(condensed)
+
+        return {
+            'title': title,
+            'body': body,
+            'tokens': tokens,
+            'baseline_tokens': baseline,
+            'condensed': condensed
+        }
+
+
+@lru_cache(maxsize=1)
+def get_preprocessor() -> BodyPreprocessor:
+    """Process-wide preprocessor (extractor들이 통계를 공유)"""
+    return BodyPreprocessor()
+
+
+def prepare_content(content: Dict) -> Dict:
+    return get_preprocessor().prepare(content)
@@ -0,0 +1,122 @@
+"""
+Sentence encoder backends for paraphrase-multilingual-mpnet-base-v2
+
+SentenceTransformerProvider / WorldviewDiffer / PerceptionClusterer / WorldviewEmbeddingIndex가 공유하는 다국어 임베딩 모델 로더
+(import 시점이 아니라 get_encoder() 첫 호출 때 로드 → OpenAI provider만 쓰는 워커는 모델을 올리지 않음)
+워커는 CPU 전용 → PATTERN_EMBEDDING_BACKEND로 추론 백엔드 선택:
+- torch (기본): PyTorch
+- onnx: ONNX Runtime (fp32)
+- onnx-int8: ONNX Runtime + dynamic int8 quantization
+  (최초 1회 export → PATTERN_EMBEDDING_ONNX_DIR에 저장, 이후 재사용)
+
+세 백엔드 모두 SentenceTransformer 객체 → encode() 인터페이스 동일
+parity/속도 비교: scripts/_tests/benchmark_embedding_backends.py
+
+EMBEDDING_SERVICE_SOCKET이 설정되어 있고 서비스가 떠 있으면 get_encoder()는 모델을 올리지 않고
+EmbeddingClient를 반환 (scripts/run_embedding_service.py, 워커 간 모델 1개 공유)
+
+Usage:
+    model = get_encoder()               # 서비스 있으면 client, 없으면 load_encoder()
+    model = load_encoder('onnx-int8')
+    vectors = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+"""
+
+import os
+from typing import Dict, Optional
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+from engines.utils.embedding_service import EmbeddingClient
+
+MODEL_NAME = 'paraphrase-multilingual-mpnet-base-v2'
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+DEFAULT_BACKEND = os.getenv('PATTERN_EMBEDDING_BACKEND', 'torch')
+ONNX_DIR = os.getenv('PATTERN_EMBEDDING_ONNX_DIR', 'embedding_cache/onnx')
+# onnxruntime 양자화 설정: avx2 (대부분의 x86), avx512_vnni (최신 Xeon), arm64
+QUANTIZATION_CONFIG = os.getenv('PATTERN_EMBEDDING_QUANTIZATION', 'avx2')
+
+# get_encoder() 결과 (backend별 1개) → 호출하는 모듈들이 같은 모델 공유
+_encoders: Dict[Optional[str], object] = {}
+
+
+def get_encoder(backend: Optional[str] = None):
+    """
+    Shared embedding service client if EMBEDDING_SERVICE_SOCKET is reachable, else a local model
+
+    프로세스 안에서는 backend별로 한 번만 로드
+
+    Returns:
+        EmbeddingClient 또는 SentenceTransformer (둘 다 encode() / get_sentence_embedding_dimension())
+    """
+    if backend in _encoders:
+        return _encoders[backend]
+
+    socket_path = os.getenv('EMBEDDING_SERVICE_SOCKET')
+    if socket_path:
+        client = EmbeddingClient(socket_path)
+        if client.ping():
+            _encoders[backend] = client
+            return client
+        print(f"  ⚠️  Embedding service 연결 실패 ({socket_path}) → 로컬 모델 로드")
+
+    _encoders[backend] = load_encoder(backend)
+    return _encoders[backend]
+
+
+def load_encoder(backend: Optional[str] = None, model_name: str = MODEL_NAME) -> SentenceTransformer:
+    """
+    Load the sentence encoder with the selected inference backend
+
+    Args:
+        backend: 'torch' | 'onnx' | 'onnx-int8' (None이면 PATTERN_EMBEDDING_BACKEND)
+        model_name: Hugging Face 모델 이름
+
+    Returns:
+        SentenceTransformer
+
+    Raises:
+        ValueError: 알 수 없는 backend
+    """
+    backend = backend or DEFAULT_BACKEND
+
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+
+    if backend == 'onnx':
+        return SentenceTransformer(model_name, backend='onnx')
+
+    if backend == 'onnx-int8':
+        model_dir = os.path.join(ONNX_DIR, model_name.replace('/', '__'))
+        file_name = f"onnx/model_qint8_{QUANTIZATION_CONFIG}.onnx"
+
+        if not os.path.exists(os.path.join(model_dir, file_name)):
+            export_quantized_model(model_name, model_dir)
+
+        return SentenceTransformer(model_dir, backend='onnx', model_kwargs={'file_name': file_name})
+
+    raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+
+def export_quantized_model(model_name: str, model_dir: str) -> str:
+    """
+    Export the model to ONNX and add a dynamic int8 quantized copy
+
+    Args:
+        model_name: Hugging Face 모델 이름
+        model_dir: 저장 디렉토리 (onnx/model.onnx, onnx/model_qint8_<config>.onnx)
+
+    Returns:
+        model_dir
+    """
+    print(f"  ONNX int8 export: {model_name} → {model_dir} ({QUANTIZATION_CONFIG})")
+
+    model = SentenceTransformer(model_name, backend='onnx')
+    model.save(model_dir)
+
+    export_dynamic_quantized_onnx_model(
+        model,
+        quantization_config=QUANTIZATION_CONFIG,
+        model_name_or_path=model_dir,
+        file_suffix=f"qint8_{QUANTIZATION_CONFIG}"
+    )
+
+    return model_dir
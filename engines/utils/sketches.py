@@ -0,0 +1,99 @@
+"""
+Streaming frequency sketches
+
+- CountMinSketch: 고정 메모리 빈도 추정 (과대추정만, 과소추정 없음)
+- SpaceSaving: top-k heavy hitters
+
+둘 다 JSON 직렬화/병합 가능 → 일별 스냅샷을 합쳐 rolling window 계산
+해시는 hashlib 기반이라 프로세스/머신 간 결정적
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class CountMinSketch:
+    """Count-Min sketch with deterministic row hashes"""
+
+    def __init__(self, width: int = 512, depth: int = 4, table: Optional[List[List[int]]] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table or [[0] * width for _ in range(depth)]
+
+    def _buckets(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=8 * self.depth).digest()
+        return [
+            int.from_bytes(digest[i * 8:(i + 1) * 8], 'little') % self.width
+            for i in range(self.depth)
+        ]
+
+    def add(self, item: str, count: int = 1):
+        for row, bucket in enumerate(self._buckets(item)):
+            self.table[row][bucket] += count
+
+    def estimate(self, item: str) -> int:
+        return min(self.table[row][bucket] for row, bucket in enumerate(self._buckets(item)))
+
+    def merge(self, other: 'CountMinSketch'):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions")
+        for row in range(self.depth):
+            mine, theirs = self.table[row], other.table[row]
+            for i in range(self.width):
+                mine[i] += theirs[i]
+
+    def to_dict(self) -> Dict:
+        return {'width': self.width, 'depth': self.depth, 'table': self.table}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict], width: int = 512, depth: int = 4) -> 'CountMinSketch':
+        if not data:
+            return cls(width=width, depth=depth)
+        return cls(width=data['width'], depth=data['depth'], table=data['table'])
+
+
+class SpaceSaving:
+    """Space-Saving top-k heavy hitters (count, overestimation error)"""
+
+    def __init__(self, k: int = 50, counters: Optional[Dict[str, List[int]]] = None):
+        self.k = k
+        self.counters: Dict[str, List[int]] = counters or {}
+
+    def add(self, item: str, count: int = 1):
+        if item in self.counters:
+            self.counters[item][0] += count
+        elif len(self.counters) < self.k:
+            self.counters[item] = [count, 0]
+        else:
+            # 최소 카운터를 새 항목으로 교체
+            victim = min(self.counters, key=lambda x: self.counters[x][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[item] = [floor + count, floor]
+
+    def merge(self, other: 'SpaceSaving'):
+        for item, (count, error) in other.counters.items():
+            if item in self.counters:
+                self.counters[item][0] += count
+                self.counters[item][1] += error
+            else:
+                self.counters[item] = [count, error]
+
+        if len(self.counters) > self.k:
+            keep = sorted(self.counters.items(), key=lambda x: x[1][0], reverse=True)[:self.k]
+            self.counters = dict(keep)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        ranked = sorted(self.counters.items(), key=lambda x: x[1][0], reverse=True)
+        return [(item, count) for item, (count, _) in ranked[:n or self.k]]
+
+    def candidates(self) -> Iterable[str]:
+        return self.counters.keys()
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'counters': self.counters}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict], k: int = 50) -> 'SpaceSaving':
+        if not data:
+            return cls(k=k)
+        return cls(k=data['k'], counters={item: list(v) for item, v in data['counters'].items()})
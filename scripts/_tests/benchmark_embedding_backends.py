@@ -0,0 +1,156 @@
+"""
+Embedding Backend Parity & Throughput (engines.utils.sentence_encoder)
+
+PyTorch(기준) 대비 ONNX / ONNX int8 백엔드의:
+- Parity: 문장별 코사인 일치도 (min / mean), 문장 간 유사도 행렬 최대 오차,
+  최근접 이웃(top-1) 일치율 → PatternManager 레이어 threshold 판정이 바뀌지 않는지 확인
+- Throughput: batch_size별 초당 문장 수
+
+케이스:
+- 한국어 정치 게시글 스타일 fixture (내장)
+- worldview_patterns.text (--patterns N, DB에서 로드)
+
+min cosine이 --min-cosine 미만이면 exit 1
+
+사용 예시:
+    python3 scripts/_tests/benchmark_embedding_backends.py
+    python3 scripts/_tests/benchmark_embedding_backends.py --backends onnx-int8 --patterns 500
+    python3 scripts/_tests/benchmark_embedding_backends.py --batch-sizes 1 8 32 --repeat 5
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.utils.sentence_encoder import BACKENDS, load_encoder
+from engines.utils.embedding_store import cosine_similarity
+
+FIXTURES = [
+    # surface (explicit claims)
+    "정부가 부동산 대책을 발표했지만 집값은 계속 오르고 있다",
+    "민주당이 특검법을 단독으로 통과시켰다",
+    "경찰이 집회 참가자들을 과잉 진압했다",
+    "중국 유학생들이 국내 선거 여론조사에 개입했다",
+    "언론이 대통령 지지율 하락을 일부러 축소 보도했다",
+    "검찰이 야당 대표 측근을 압수수색했다",
+    "국회가 예산안 처리 시한을 또 넘겼다",
+    "선관위가 사전투표 관리 부실을 인정했다",
+    "의대 정원 확대에 반발한 전공의들이 병원을 떠났다",
+    "환율이 1400원을 넘으면서 수입 물가가 급등했다",
+    # implicit (assumptions)
+    "정부 발표는 실제 상황을 숨기기 위한 것이다",
+    "언론은 특정 정당에 유리하게 편향되어 있다",
+    "외국 세력이 국내 여론을 조작하고 있다",
+    "공권력은 힘 있는 쪽의 편을 든다",
+    "정치인들은 선거가 끝나면 공약을 잊는다",
+    "통계 수치는 정권에 유리하게 가공된다",
+    "시위대가 폭력을 쓰면 여론이 돌아선다",
+    "사법부 판결은 정치적 고려에 따라 달라진다",
+    # deep (beliefs)
+    "권력은 결국 스스로를 지키기 위해 움직인다",
+    "우리 사회는 공정하지 않다",
+    "국가의 주권은 외부 세력에 의해 위협받고 있다",
+    "진실은 주류 언론 밖에 있다",
+    "기득권은 변화를 원하지 않는다",
+    "개인의 자유가 집단의 이익보다 우선한다",
+    # 짧은 / 구어체 / 혼합
+    "ㄹㅇ 이건 선 넘었지",
+    "이게 나라냐",
+    "팩트체크 해보면 다 거짓말임",
+    "GDP 성장률 2% 아래로 떨어짐",
+    "MZ세대는 정치에 관심이 없다는 말은 틀렸다",
+    "북한 미사일 발사 직후 주가가 출렁였다",
+]
+
+
+def load_pattern_texts(limit: int) -> list:
+    from engines.utils.supabase_client import get_supabase
+
+    supabase = get_supabase()
+    result = supabase.table('worldview_patterns').select('text').in_('status', ['active', 'fading']).limit(limit).execute()
+    return [row['text'] for row in result.data or [] if row.get('text')]
+
+
+def encode(model, texts: list, batch_size: int) -> np.ndarray:
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+
+def throughput(model, texts: list, batch_size: int, repeat: int) -> float:
+    """Sentences per second (첫 배치 warm-up 제외)"""
+    encode(model, texts[:batch_size], batch_size)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(model, texts, batch_size)
+    return len(texts) * repeat / (time.perf_counter() - start)
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    per_sentence = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+
+    ref_sim = cosine_similarity(reference, reference)
+    cand_sim = cosine_similarity(candidate, candidate)
+    np.fill_diagonal(ref_sim, -np.inf)
+    np.fill_diagonal(cand_sim, -np.inf)
+    finite = np.isfinite(ref_sim)
+
+    return {
+        'min_cosine': float(per_sentence.min()),
+        'mean_cosine': float(per_sentence.mean()),
+        'max_sim_error': float(np.abs(ref_sim[finite] - cand_sim[finite]).max()) if finite.any() else 0.0,
+        'top1_agreement': float(np.mean(ref_sim.argmax(axis=1) == cand_sim.argmax(axis=1)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentence encoder backend parity & throughput')
+    parser.add_argument('--backends', nargs='+', default=['onnx', 'onnx-int8'], choices=[b for b in BACKENDS if b != 'torch'])
+    parser.add_argument('--patterns', type=int, default=0, help='DB에서 추가로 로드할 패턴 텍스트 수')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 32])
+    parser.add_argument('--repeat', type=int, default=3, help='throughput 반복 횟수')
+    parser.add_argument('--min-cosine', type=float, default=0.98, help='문장별 최소 코사인 (미만이면 실패)')
+
+    args = parser.parse_args()
+
+    texts = list(FIXTURES)
+    if args.patterns:
+        texts += load_pattern_texts(args.patterns)
+
+    print("\n" + "="*80)
+    print("Embedding Backend Parity & Throughput")
+    print("="*80 + "\n")
+    print(f"문장: {len(texts)}개 (fixture {len(FIXTURES)}, pattern {len(texts) - len(FIXTURES)})\n")
+
+    models = {'torch': load_encoder('torch')}
+    for backend in args.backends:
+        models[backend] = load_encoder(backend)
+
+    reference = encode(models['torch'], texts, 32)
+    failed = []
+
+    print(f"{'backend':<12} {'min cos':>9} {'mean cos':>9} {'sim err':>9} {'top-1':>7}")
+    for backend in args.backends:
+        r = parity(reference, encode(models[backend], texts, 32))
+        print(f"{backend:<12} {r['min_cosine']:>9.4f} {r['mean_cosine']:>9.4f} {r['max_sim_error']:>9.4f} {r['top1_agreement']:>7.1%}")
+        if r['min_cosine'] < args.min_cosine:
+            failed.append(backend)
+
+    print(f"\n{'backend':<12}" + ''.join(f"{f'batch {b}':>14}" for b in args.batch_sizes))
+    for backend, model in models.items():
+        rates = [throughput(model, texts, b, args.repeat) for b in args.batch_sizes]
+        print(f"{backend:<12}" + ''.join(f"{rate:>10.1f} s/s" for rate in rates))
+
+    if failed:
+        print(f"\n❌ Parity 실패 (min cosine < {args.min_cosine}): {', '.join(failed)}")
+        sys.exit(1)
+
+    print(f"\n✅ Parity OK (min cosine ≥ {args.min_cosine})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Pattern Similarity Search Benchmark (migration 516, 517, 518)
+
+find_similar_patterns의 기존 함수(506: 거리 조건을 WHERE에 둔 형태, 파라미터 레이어 → partial index 미사용)와
+새 함수(516: 레이어별 HNSW partial index, ORDER BY distance LIMIT k 후 threshold)를 비교
+
+506 함수는 세션 임시 함수(pg_temp.find_similar_patterns_506)로 만들어 같은 데이터/인덱스에서 호출
+
+측정:
+- Recall: 인덱스 스캔을 끈 정확한 결과 대비 비율
+- Latency: 쿼리당 평균 / p95
+- EXPLAIN ANALYZE: 첫 쿼리의 실행 계획 (--explain, 506은 plpgsql과 같은 generic plan)
+- 임베딩 컬럼 타입(vector/halfvec, 517)과 테이블/인덱스 크기
+- 518 이후: 차원 없는 halfvec 컬럼 → --model 벡터만 사용, 모델별 partial index 식 (embedding::halfvec(dim))
+
+쿼리: 무작위 active/fading 패턴 임베딩 + 노이즈 (같은 worldview / layer로 검색)
+
+Supabase REST로는 EXPLAIN을 볼 수 없으므로 PostgreSQL 직접 연결 필요:
+    export DATABASE_URL=postgresql://postgres.<project>:<password>@<host>:6543/postgres
+
+사용 예시:
+    python3 scripts/_tests/benchmark_pattern_search.py
+    python3 scripts/_tests/benchmark_pattern_search.py --queries 500 --k 10 --explain
+    python3 scripts/_tests/benchmark_pattern_search.py --model openai:text-embedding-3-small:768
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import psycopg2
+
+# 518 이전 데이터(embedding_model 없음)는 모두 이 모델
+DEFAULT_MODEL = 'sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768'
+
+# PatternManager.SIMILARITY_THRESHOLDS (max_distance = 1 - threshold)
+MAX_DISTANCE = {
+    'surface': 1 - 0.85,
+    'implicit': 1 - 0.70,
+    'deep': 1 - 0.60
+}
+
+# 506의 find_similar_patterns 본문 ($1 worldview, $2 layer, $3 embedding, $4 max_distance, $5 limit)
+OLD_BODY = """
+    SELECT wp.id
+    FROM worldview_patterns wp
+    WHERE wp.worldview_id = $1
+        AND wp.layer = $2
+        AND wp.status IN ('active', 'fading')
+        AND wp.embedding IS NOT NULL
+        AND wp.embedding <=> $3 <= $4
+    ORDER BY wp.embedding <=> $3
+    LIMIT $5
+"""
+
+OLD_FUNCTION_DDL = f"""
+    CREATE FUNCTION pg_temp.find_similar_patterns_506(UUID, TEXT, {{vtype}}, FLOAT, INT)
+    RETURNS TABLE (id UUID)
+    LANGUAGE plpgsql
+    AS $fn$
+    BEGIN
+        RETURN QUERY {OLD_BODY};
+    END;
+    $fn$
+"""
+
+OLD_FUNCTION = """
+    SELECT id FROM pg_temp.find_similar_patterns_506(
+        %(worldview_id)s, %(layer)s, %(embedding)s::{vtype}, %(max_distance)s, %(k)s
+    )
+"""
+
+EXACT_QUERY = """
+    SELECT wp.id
+    FROM worldview_patterns wp
+    WHERE wp.worldview_id = %(worldview_id)s
+        AND wp.layer = %(layer)s
+        AND wp.status IN ('active', 'fading')
+        AND wp.embedding IS NOT NULL {model_filter}
+        AND wp.embedding <=> %(embedding)s::{vtype} <= %(max_distance)s
+    ORDER BY wp.embedding <=> %(embedding)s::{vtype}
+    LIMIT %(k)s
+"""
+
+# 516/517/518 함수 내부 쿼리 (EXPLAIN용, 레이어/모델은 리터럴)
+# {column}: embedding (516/517) 또는 (embedding::halfvec(dim)) (518, partial index 식)
+NEW_QUERY = """
+    SELECT nearest.id
+    FROM (
+        SELECT wp.id, {column} <=> %(embedding)s::{qtype} AS distance
+        FROM worldview_patterns wp
+        WHERE wp.layer = '{layer}'
+            AND wp.status IN ('active', 'fading')
+            AND wp.embedding IS NOT NULL {model_literal}
+            AND wp.worldview_id = %(worldview_id)s
+        ORDER BY {column} <=> %(embedding)s::{qtype}
+        LIMIT %(k)s
+    ) nearest
+    WHERE nearest.distance <= %(max_distance)s
+    ORDER BY nearest.distance
+"""
+
+NEW_FUNCTION = """
+    SELECT id FROM find_similar_patterns(
+        %(worldview_id)s, %(layer)s, %(embedding)s::{ftype}, %(max_distance)s, %(k)s {model_arg}
+    )
+"""
+
+
+def embedding_type(cur) -> str:
+    """worldview_patterns.embedding 타입: 'vector(768)', 'halfvec(768)' (517) 또는 'halfvec' (518)"""
+    cur.execute("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = 'worldview_patterns'::regclass AND attname = 'embedding'
+    """)
+    return cur.fetchone()[0]
+
+
+def has_model_column(cur) -> bool:
+    """518 적용 여부 (worldview_patterns.embedding_model)"""
+    cur.execute("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_attribute
+            WHERE attrelid = 'worldview_patterns'::regclass AND attname = 'embedding_model' AND NOT attisdropped
+        )
+    """)
+    return cur.fetchone()[0]
+
+
+def model_dimension(cur, model: str) -> int:
+    cur.execute("SELECT dimension FROM embedding_models WHERE fingerprint = %s", (model,))
+    row = cur.fetchone()
+    if row is None:
+        raise SystemExit(f"embedding_models에 없는 모델: {model}")
+    return row[0]
+
+
+def query_templates(vtype: str, model: str = None, dim: int = None) -> dict:
+    """
+    Fill schema-dependent parts of the SQL templates
+
+    model이 없으면 516/517 (고정 차원 컬럼), 있으면 518 (모델 필터 + 차원 캐스트)
+    """
+    if model is None:
+        return {
+            # 516/517 함수 인자는 vector(768)
+            'vtype': vtype, 'qtype': vtype, 'ftype': 'vector', 'column': 'wp.embedding',
+            'model_filter': '', 'model_literal': '', 'model_arg': ''
+        }
+
+    return {
+        'vtype': vtype,
+        'qtype': f'halfvec({dim})',
+        'ftype': 'halfvec',
+        'column': f'(wp.embedding::halfvec({dim}))',
+        'model_filter': 'AND wp.embedding_model = %(model)s',
+        'model_literal': "AND wp.embedding_model = '" + model.replace("'", "''") + "'",
+        'model_arg': ', %(model)s'
+    }
+
+
+def relation_sizes(cur) -> list:
+    """worldview_patterns 테이블(TOAST 포함)과 임베딩 인덱스 크기"""
+    cur.execute("""
+        SELECT c.relname, pg_total_relation_size(c.oid) - pg_indexes_size(c.oid)
+        FROM pg_class c WHERE c.relname = 'worldview_patterns'
+        UNION ALL
+        SELECT i.relname, pg_relation_size(i.oid)
+        FROM pg_class i
+        JOIN pg_index x ON x.indexrelid = i.oid
+        WHERE x.indrelid = 'worldview_patterns'::regclass AND i.relname LIKE 'idx_patterns_embedding%'
+        ORDER BY 1
+    """)
+    return cur.fetchall()
+
+
+def to_vector(values) -> str:
+    return '[' + ','.join(f'{v:.6f}' for v in values) + ']'
+
+
+def parse_vector(value) -> np.ndarray:
+    return np.array([float(x) for x in value.strip('[]').split(',')], dtype=np.float32)
+
+
+def load_queries(cur, n: int, noise: float, seed: int, model: str = None) -> list:
+    model_filter = 'AND embedding_model = %(model)s' if model else ''
+    cur.execute(f"""
+        SELECT worldview_id, layer, embedding::text
+        FROM worldview_patterns
+        WHERE status IN ('active', 'fading') AND embedding IS NOT NULL {model_filter}
+        ORDER BY random()
+        LIMIT %(n)s
+    """, {'n': n, 'model': model})
+
+    rng = np.random.default_rng(seed)
+    queries = []
+    for worldview_id, layer, embedding in cur.fetchall():
+        vec = parse_vector(embedding)
+        vec = vec + noise * np.linalg.norm(vec) / np.sqrt(len(vec)) * rng.standard_normal(len(vec))
+        queries.append({
+            'worldview_id': worldview_id,
+            'layer': layer,
+            'embedding': to_vector(vec),
+            'model': model
+        })
+    return queries
+
+
+def exact_results(conn, params: dict, templates: dict) -> list:
+    """Ground truth with index scans disabled"""
+    with conn.cursor() as cur:
+        cur.execute("SET LOCAL enable_indexscan = off")
+        cur.execute("SET LOCAL enable_bitmapscan = off")
+        cur.execute(EXACT_QUERY.format(**templates), params)
+        rows = [r[0] for r in cur.fetchall()]
+    conn.rollback()
+    return rows
+
+
+def run(conn, sql: str, queries: list, truth: list, repeat: int, templates: dict) -> dict:
+    latencies, recalls = [], []
+
+    with conn.cursor() as cur:
+        for params, expected in zip(queries, truth):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cur.execute(sql.format(layer=params['layer'], **templates), params)
+                rows = [r[0] for r in cur.fetchall()]
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            if expected:
+                recalls.append(len(set(rows) & set(expected)) / len(expected))
+    conn.rollback()
+
+    return {
+        'mean_ms': float(np.mean(latencies)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'recall': float(np.mean(recalls)) if recalls else 1.0,
+        'evaluated': len(recalls)
+    }
+
+
+def explain(conn, sql: str, params: dict, templates: dict, generic: bool = False):
+    with conn.cursor() as cur:
+        if generic:
+            # plpgsql과 같은 조건: 레이어가 파라미터인 generic plan
+            cur.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+            vtype = templates['vtype']
+            cur.execute(f"PREPARE old_plan(UUID, TEXT, {vtype}, FLOAT, INT) AS {OLD_BODY}")
+            cur.execute(
+                "EXPLAIN (ANALYZE, BUFFERS) EXECUTE old_plan("
+                f"%(worldview_id)s, %(layer)s, %(embedding)s::{vtype}, %(max_distance)s, %(k)s)",
+                params
+            )
+        else:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql.format(layer=params['layer'], **templates), params)
+
+        for (line,) in cur.fetchall():
+            # 벡터 리터럴은 생략
+            if "'[" in line:
+                line = line[:line.index("'[")] + "'[...]'" + line[line.index("]'") + 2:]
+            print(f"    {line}")
+    conn.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='find_similar_patterns recall/latency benchmark')
+    parser.add_argument('--dsn', default=os.getenv('DATABASE_URL'), help='PostgreSQL 연결 (기본: DATABASE_URL)')
+    parser.add_argument('--queries', type=int, default=200, help='쿼리 수')
+    parser.add_argument('--k', type=int, default=1, help='limit_count (PatternManager는 1)')
+    parser.add_argument('--noise', type=float, default=0.3, help='쿼리 임베딩 노이즈 (원소 크기 대비)')
+    parser.add_argument('--max-distance', type=float, default=None, help='모든 레이어에 같은 max_distance 사용')
+    parser.add_argument('--repeat', type=int, default=3, help='쿼리당 반복 횟수')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--explain', action='store_true', help='첫 쿼리 EXPLAIN ANALYZE 출력')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='임베딩 모델 fingerprint (518 이후)')
+
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error('DATABASE_URL 또는 --dsn 필요')
+
+    conn = psycopg2.connect(args.dsn)
+    conn.autocommit = False
+
+    with conn.cursor() as cur:
+        vtype = embedding_type(cur)
+        model = args.model if has_model_column(cur) else None
+        templates = query_templates(vtype, model, model_dimension(cur, model) if model else None)
+        cur.execute(OLD_FUNCTION_DDL.format(vtype=vtype))
+        sizes = relation_sizes(cur)
+    conn.commit()
+
+    print("\n" + "="*80)
+    print("find_similar_patterns Benchmark (506 vs current)")
+    print("="*80 + "\n")
+
+    print(f"embedding 컬럼: {vtype}" + (f" (model {model})" if model else ""))
+    for name, size in sizes:
+        print(f"  {name:<36} {size / 1024 / 1024:>8.1f} MB")
+    print()
+
+    with conn.cursor() as cur:
+        queries = load_queries(cur, args.queries, args.noise, args.seed, model)
+    conn.rollback()
+
+    for q in queries:
+        q['k'] = args.k
+        q['max_distance'] = args.max_distance if args.max_distance is not None else MAX_DISTANCE[q['layer']]
+
+    print(f"쿼리: {len(queries)}개 (k={args.k}, noise={args.noise})")
+    truth = [exact_results(conn, q, templates) for q in queries]
+    print(f"정답 있는 쿼리: {sum(1 for t in truth if t)}개\n")
+
+    results = {
+        '506 (old function)': run(conn, OLD_FUNCTION, queries, truth, args.repeat, templates),
+        'current (function)': run(conn, NEW_FUNCTION, queries, truth, args.repeat, templates),
+    }
+
+    print(f"{'plan':<20} {'mean':>10} {'p95':>10} {'recall':>10}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['mean_ms']:>8.2f}ms {r['p95_ms']:>8.2f}ms {r['recall']:>10.3f}")
+
+    if args.explain and queries:
+        print(f"\n{'='*80}")
+        print("EXPLAIN ANALYZE (첫 쿼리)")
+        print(f"{'='*80}")
+        print("\n  506 (generic plan):")
+        explain(conn, None, queries[0], templates, generic=True)
+        print("\n  current (function body):")
+        explain(conn, NEW_QUERY, queries[0], templates)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
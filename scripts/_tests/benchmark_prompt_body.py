@@ -0,0 +1,94 @@
+"""
+Prompt Body Benchmark (engines.utils.prompt_body)
+
+기존 body[:2000] 대비 BodyPreprocessor의:
+- 토큰: 글당 평균 / p95 프롬프트 토큰 (제목+본문), 절약률
+- 결론 포함률: 2000자를 넘는 글 중 마지막 문장이 프롬프트에 들어간 비율
+- 주장 문장 포함률: 주장 표지어(CLAIM_MARKERS)가 있는 문장 중 프롬프트에 들어간 비율
+
+사용 예시:
+    python3 scripts/_tests/benchmark_prompt_body.py
+    python3 scripts/_tests/benchmark_prompt_body.py --limit 2000 --body-tokens 600
+"""
+
+import sys
+import os
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.utils.supabase_client import get_supabase
+from engines.utils.prompt_body import (
+    CLAIM_MARKERS, LEGACY_BODY_CHARS, BodyPreprocessor, clean_body, split_sentences
+)
+
+
+def load_contents(limit: int, page_size: int = 1000) -> list:
+    supabase = get_supabase()
+    contents = []
+    while len(contents) < limit:
+        rows = supabase.table('contents')\
+            .select('id, title, body')\
+            .order('collected_at', desc=True)\
+            .range(len(contents), min(len(contents) + page_size, limit) - 1)\
+            .execute().data or []
+        contents.extend(rows)
+        if len(rows) < page_size:
+            break
+    return contents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prompt body token / coverage benchmark')
+    parser.add_argument('--limit', type=int, default=1000, help='최근 contents 수')
+    parser.add_argument('--body-tokens', type=int, help='본문 토큰 예산 (기본: PROMPT_BODY_TOKENS)')
+
+    args = parser.parse_args()
+
+    preprocessor = BodyPreprocessor(body_tokens=args.body_tokens) if args.body_tokens else BodyPreprocessor()
+    contents = [c for c in load_contents(args.limit) if c.get('body')]
+
+    baseline, tokens = [], []
+    long_posts, legacy_tail, new_tail = 0, 0, 0
+    claim_sentences, legacy_claims, new_claims = 0, 0, 0
+
+    for content in contents:
+        prepared = preprocessor.prepare(content)
+        baseline.append(prepared['baseline_tokens'])
+        tokens.append(prepared['tokens'])
+
+        legacy = content['body'][:LEGACY_BODY_CHARS]
+        sentences = split_sentences(clean_body(content['body']))
+
+        if len(content['body']) > LEGACY_BODY_CHARS and sentences:
+            long_posts += 1
+            legacy_tail += sentences[-1] in legacy
+            new_tail += sentences[-1] in prepared['body']
+
+        for sentence in sentences:
+            if any(m in sentence for m in CLAIM_MARKERS):
+                claim_sentences += 1
+                legacy_claims += sentence in legacy
+                new_claims += sentence in prepared['body']
+
+    baseline, tokens = np.array(baseline), np.array(tokens)
+
+    print("=" * 80)
+    print(f"Prompt Body Benchmark - {len(contents):,} contents (budget {preprocessor.body_tokens} tokens)")
+    print("=" * 80)
+    print(f"\n{'':<22} {'body[:2000]':>14} {'prepared':>14}")
+    print(f"{'mean tokens':<22} {baseline.mean():>14.1f} {tokens.mean():>14.1f}")
+    print(f"{'p95 tokens':<22} {np.percentile(baseline, 95):>14.0f} {np.percentile(tokens, 95):>14.0f}")
+    print(f"{'max tokens':<22} {baseline.max():>14,} {tokens.max():>14,}")
+    if long_posts:
+        print(f"{'conclusion kept':<22} {legacy_tail / long_posts:>14.1%} {new_tail / long_posts:>14.1%}  ({long_posts} posts > {LEGACY_BODY_CHARS} chars)")
+    if claim_sentences:
+        print(f"{'claim sentences kept':<22} {legacy_claims / claim_sentences:>14.1%} {new_claims / claim_sentences:>14.1%}")
+
+    saved = int(baseline.sum() - tokens.sum())
+    print(f"\nSaved: {saved:,} tokens ({saved / baseline.sum():.1%}), condensed {preprocessor.stats['condensed']} posts")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Claim Filter Parity & Benchmark
+
+engines.utils.claim_filter (사전 컴파일 정규식)가 기존 루프 구현
+(_fast_filter_claim / _fast_filter_surface = test_enhanced_fast_filter_v2.py의 enhanced_fast_filter_v2)과
+모든 claim에 대해 같은 (keep, reason)을 내는지 확인하고 속도를 비교
+
+케이스:
+- 규칙별 경계 케이스 (내장)
+- layered_perceptions.explicit_claims (test_enhanced_fast_filter*.py와 같은 방식으로 DB에서 로드)
+
+사용 예시:
+    python3 scripts/_tests/test_claim_filter_parity.py
+    python3 scripts/_tests/test_claim_filter_parity.py --limit 500 --repeat 20
+    python3 scripts/_tests/test_claim_filter_parity.py --offline
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.utils.claim_filter import filter_claim, filter_claims
+
+
+def reference_fast_filter(claim_text) -> tuple[bool, str]:
+    """Previous loop-based implementation (LayeredPerceptionExtractorV2._fast_filter_claim)"""
+    if isinstance(claim_text, dict):
+        text = claim_text.get('predicate', '')
+        if not text and 'subject' in claim_text:
+            text = f"{claim_text.get('subject', '')} {claim_text.get('predicate', '')}"
+    else:
+        text = claim_text
+
+    text_clean = str(text).strip()
+
+    if len(text_clean) < 10:
+        return (False, "길이 < 10")
+
+    pronouns_start = [
+        '이는 ', '이는,', '이것은 ', '이것이 ', '그것은 ', '그것이 ',
+        '여기는 ', '거기는 ', '저기는 '
+    ]
+    for p in pronouns_start:
+        if text_clean.startswith(p):
+            return (False, "지시대명사 시작")
+
+    if text_clean.startswith('이 ') or text_clean.startswith('그 ') or text_clean.startswith('저 '):
+        if not any(text_clean.startswith(p) for p in ['이 사건', '이 사람', '이 일', '그 사건', '그 사람']):
+            return (False, "지시대명사 시작")
+
+    vague_subjects = [
+        '우리가 ', '우리는 ', '이들은 ', '이들이 ', '그들은 ', '그들이 ',
+        '엄마들이 ', '좌파들이 ', '보수들이 ', '사람들이 '
+    ]
+    for s in vague_subjects:
+        if text_clean.startswith(s):
+            return (False, "막연한 주어")
+
+    normative = ['해야 한다', '해야한다', '하자', '드리자', '말아야', '되어야']
+    for n in normative:
+        if n in text_clean:
+            return (False, "당위문")
+
+    vague_eval = ['웃기다', '다행', '부당', '적절', '나쁜', '좋은',
+                  '이상하다', '복잡하다', '어렵다', '쉽다']
+
+    concrete_subjects = ['민주당', '국민의힘', '윤석열', '이재명',
+                         '경찰', '검찰', '법원', '정부', '국회',
+                         '대통령', '의원', '장관', '판사', '검사']
+
+    has_concrete_subject = any(subj in text_clean for subj in concrete_subjects)
+
+    if not has_concrete_subject:
+        for v in vague_eval:
+            if v in text_clean:
+                return (False, "막연한 평가")
+
+    endings = ['다.', '다,', '다"', '다\'', '다!', '다?',
+               '까.', '까,', '까?', '냐.', '냐,', '냐?',
+               '요.', '요,', '요!', '음.', '음,']
+
+    has_ending = any(text_clean.endswith(end) for end in endings)
+
+    if not has_ending and not text_clean.endswith('다'):
+        return (False, "불완전한 문장")
+
+    korean_consonants = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+    if any(c in korean_consonants for c in text_clean[:3]):
+        return (False, "자음 이니셜")
+
+    return (True, "")
+
+
+EDGE_CASES = [
+    # 길이
+    "짧은 주장이다", "  민주당이 했다  ",
+    # 지시대명사
+    "이는 민주당의 사찰 시도를 보여준다", "이는,결국 조작이라는 뜻이다",
+    "이 사건은 민주당이 조작한 것이다", "이 사람이 모든 것을 꾸몄다",
+    "이 일본 언론이 왜곡 보도를 했다", "이 정부는 국민을 감시하고 있다",
+    "그 사건은 검찰이 덮은 것이다", "그 일은 경찰이 은폐한 것이다",
+    "저 사람들은 중국의 지시를 받는다", "저기는 이미 조작된 곳이다",
+    # 막연한 주어
+    "우리는 이미 모든 것을 알고 있다", "사람들이 진실을 모르고 있다",
+    "좌파들이 여론을 조작하고 있다", "우리나라 정부가 사찰을 했다",
+    # 당위문
+    "민주당은 즉시 해체해야 한다", "윤석열을 끝까지 지켜드리자",
+    "이재명을 절대 믿지 말아야 한다", "정부는 책임을 지게 되어야 마땅하다",
+    # 막연한 평가
+    "이번 판결은 정말 웃기다고 생각한다", "법원의 판결은 부당하다",
+    "이런 상황이 너무 복잡하다", "결과가 나와서 정말 다행이다",
+    # 종결어미
+    "민주당이 통신사를 협박해 개인정보를 취득했다", "민주당이 통신사를 협박해 개인정보를 취득했다.",
+    "민주당이 정말 통신사를 협박했을까?", "경찰이 이걸 모른다고 하냐?",
+    "검찰이 수사를 시작했어요!", "국회가 법안을 통과시켰음.",
+    "민주당이 통신사를 협박해 개인정보를 취득", "민주당이 통신사를 협박했다\"",
+    # 자음 이니셜
+    "ㅉㅉ 민주당이 또 사찰을 했다", "ㅁㅈ당이 개인정보를 빼돌렸다", "민ㅈ당이 개인정보를 빼돌렸다",
+    "민주ㄷ이 개인정보를 빼돌렸다", "ㄳ 민주당이 개인정보를 빼돌렸다",
+    # dict 형식
+    {'subject': '민주당', 'predicate': '통신사를 협박해 개인정보를 불법 취득했다'},
+    {'subject': '민주당이 통신사를 협박해', 'predicate': ''},
+    {'subject': '이는', 'predicate': ''},
+]
+
+
+def load_db_claims(limit: int) -> list:
+    from engines.utils.supabase_client import get_supabase
+
+    supabase = get_supabase()
+    result = supabase.table('layered_perceptions').select(
+        'explicit_claims'
+    ).limit(limit).execute()
+
+    claims = []
+    for p in result.data:
+        claims.extend(p.get('explicit_claims') or [])
+    return claims
+
+
+def benchmark(fn, items: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(items)
+    return (time.perf_counter() - start) / (repeat * max(len(items), 1)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Claim filter parity & benchmark')
+    parser.add_argument('--limit', type=int, default=200, help='DB에서 로드할 perception 수')
+    parser.add_argument('--repeat', type=int, default=50, help='벤치마크 반복 횟수')
+    parser.add_argument('--offline', action='store_true', help='내장 케이스만 사용')
+
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("Claim Filter Parity & Benchmark")
+    print("="*80 + "\n")
+
+    claims = list(EDGE_CASES)
+    if not args.offline:
+        db_claims = load_db_claims(args.limit)
+        print(f"DB claims: {len(db_claims)}개")
+        claims.extend(db_claims)
+    print(f"총 케이스: {len(claims)}개\n")
+
+    # 1. Parity
+    mismatches = []
+    for claim in claims:
+        expected = reference_fast_filter(claim)
+        actual = filter_claim(claim)
+        if expected != actual:
+            mismatches.append((claim, expected, actual))
+
+    batch = filter_claims(claims)
+    if batch != [filter_claim(c) for c in claims]:
+        mismatches.append(('<batch>', 'filter_claims', 'differs from filter_claim'))
+
+    by_reason = {}
+    for keep, reason in batch:
+        by_reason[reason or '유지'] = by_reason.get(reason or '유지', 0) + 1
+    for reason, count in sorted(by_reason.items(), key=lambda x: x[1], reverse=True):
+        print(f"  {reason}: {count}개")
+
+    if mismatches:
+        print(f"\n❌ 불일치 {len(mismatches)}개:")
+        for claim, expected, actual in mismatches[:20]:
+            print(f"  - {claim}\n    기존: {expected} / 신규: {actual}")
+    else:
+        print(f"\n✅ Parity: {len(claims)}개 모두 일치")
+
+    # 2. Benchmark
+    old_us = benchmark(lambda items: [reference_fast_filter(c) for c in items], claims, args.repeat)
+    new_us = benchmark(filter_claims, claims, args.repeat)
+
+    print(f"\n{'='*80}")
+    print("Benchmark (claim당 평균)")
+    print(f"{'='*80}\n")
+    print(f"  기존 루프 구현:   {old_us:.2f} µs")
+    print(f"  컴파일 정규식:    {new_us:.2f} µs")
+    print(f"  속도 향상:        {old_us / new_us:.2f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Embedding Service Client Test
+
+EmbeddingClient가 timeout 뒤에 이전 요청의 응답을 다음 요청의 결과로 읽지 않는지 확인
+(임시 Unix socket에 EmbeddingServer를 띄우고 텍스트 길이로 결정되는 가짜 encode 사용)
+
+케이스:
+- 느린 요청이 timeout → 연결 폐기, 다음 요청은 자기 응답을 받음
+- 응답 id가 요청과 다르면 연결 폐기 후 새 연결로 한 번 재시도
+
+사용 예시:
+    python3 scripts/_tests/test_embedding_service_client.py
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import asyncio
+import tempfile
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.utils.embedding_service import _HEADER, _pack, EmbeddingClient, EmbeddingServer
+
+DIM = 4
+
+
+def fake_encode(texts):
+    """'slow'가 들어간 배치는 0.5초 지연, 벡터는 텍스트 길이"""
+    if any('slow' in t for t in texts):
+        time.sleep(0.5)
+    return np.array([[len(t)] * DIM for t in texts], dtype=np.float32)
+
+
+def start_server(socket_path: str):
+    server = EmbeddingServer(fake_encode, DIM, socket_path=socket_path, max_wait_ms=1)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    while not os.path.exists(socket_path):
+        time.sleep(0.01)
+
+    def stop():
+        loop.call_soon_threadsafe(task.cancel)
+        time.sleep(0.1)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return stop
+
+
+def test_timeout_discards_connection(socket_path: str):
+    client = EmbeddingClient(socket_path, timeout=0.2)
+
+    try:
+        client.encode(['slow request'])
+        raise AssertionError('expected timeout')
+    except socket.timeout:
+        pass
+    assert client._sock is None, '타임아웃 후 연결이 남아 있음'
+
+    time.sleep(0.6)  # 느린 응답이 서버에서 전송될 때까지
+    vectors = client.encode(['abc', 'de'])
+    assert vectors.tolist() == [[3.0] * DIM, [2.0] * DIM], vectors.tolist()
+    client.close()
+    print("✅ timeout 뒤 이전 응답을 읽지 않음")
+
+
+def test_mismatched_response_id(path: str):
+    """첫 연결은 엉뚱한 id로 응답하는 서버 → 클라이언트가 폐기 후 재연결"""
+    socket_path = os.path.join(path, 'stale.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(2)
+    connections = []
+
+    def serve():
+        for stale in (True, False):
+            conn, _ = listener.accept()
+            connections.append(conn)
+            (length,) = _HEADER.unpack(conn.recv(_HEADER.size))
+            request = json.loads(conn.recv(length))
+            response_id = request['id'] - 1 if stale else request['id']
+            conn.sendall(_pack({'shape': [1, DIM], 'id': response_id}, np.full(DIM, response_id, np.float32).tobytes()))
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+
+    client = EmbeddingClient(socket_path, timeout=2)
+    vector = client.encode('x')
+    thread.join()
+    assert vector.tolist() == [2.0] * DIM, vector.tolist()
+    assert len(connections) == 2
+    client.close()
+    listener.close()
+    print("✅ 다른 요청의 응답 id는 거부")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        socket_path = os.path.join(path, 'embedding.sock')
+        stop = start_server(socket_path)
+        test_timeout_discards_connection(socket_path)
+        stop()
+        test_mismatched_response_id(path)
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+EmbeddingStore Compact Test
+
+같은 저장소를 연 두 EmbeddingStore 중 하나가 compact()한 뒤 다른 쪽이 add()해도
+rows.tsv / vectors 파일이 어긋나지 않는지 확인 (임시 디렉토리, 네트워크 없음)
+
+케이스:
+- compact 전에 연 저장소의 add → 새 세대에 이어서 기록, NUL 바이트 없음, 모든 id의 벡터 일치
+- compact 중 기록이 중단된 다음 세대 파일이 남아 있어도 이전 세대로 계속 읽힘
+
+사용 예시:
+    python3 scripts/_tests/test_embedding_store_compact.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.utils.embedding_store import DTYPE, EmbeddingStore
+
+DIM = 8
+
+
+def vec(entity_id: str) -> np.ndarray:
+    """Deterministic vector per id (float16로 정확히 표현되는 값)"""
+    seed = sum(ord(c) for c in entity_id)
+    return (np.arange(DIM, dtype=np.float32) + seed).astype(DTYPE)
+
+
+def add(store: EmbeddingStore, ids):
+    store.add(list(ids), np.stack([vec(i) for i in ids]))
+
+
+def assert_consistent(path: str, expected_ids):
+    fresh = EmbeddingStore(path)
+    assert set(fresh.rows) == set(expected_ids), sorted(set(fresh.rows) ^ set(expected_ids))
+    for i in expected_ids:
+        assert np.array_equal(fresh.get([i])[0], vec(i)), i
+
+    with open(fresh._rows_path, 'rb') as f:
+        assert b'\x00' not in f.read(), 'NUL bytes in rows file'
+    assert os.path.getsize(fresh._vectors_path) == fresh.total_rows * DIM * np.dtype(DTYPE).itemsize
+
+
+def test_add_after_foreign_compact():
+    with tempfile.TemporaryDirectory() as path:
+        a = EmbeddingStore(path, dim=DIM)
+        add(a, [f'w{i}' for i in range(10)])
+        add(a, [f'w{i}' for i in range(10)])       # 대체된 행 10개
+
+        b = EmbeddingStore(path)
+        assert b.total_rows == 20
+
+        a.compact([f'w{i}' for i in range(5)])     # b의 인덱스는 이전 세대 기준
+        assert a.total_rows == 5 and a.generation == 1
+
+        add(b, ['n1', 'n2'])
+        assert b.generation == 1 and b.total_rows == 7, (b.generation, b.total_rows)
+        assert np.array_equal(b.get(['n2'])[0], vec('n2'))
+        assert np.array_equal(b.get(['w3'])[0], vec('w3'))
+
+        add(a, ['n3'])
+        assert_consistent(path, [f'w{i}' for i in range(5)] + ['n1', 'n2', 'n3'])
+        assert not os.path.exists(os.path.join(path, 'vectors.f16')), '이전 세대 파일이 남음'
+    print("✅ 다른 저장소의 compact 후 add 정상")
+
+
+def test_interrupted_compact_ignored():
+    with tempfile.TemporaryDirectory() as path:
+        a = EmbeddingStore(path, dim=DIM)
+        add(a, ['x1', 'x2'])
+
+        # meta.json 교체 전에 중단된 compact: 다음 세대 파일만 남음
+        vectors_path, rows_path = a._data_paths(1)
+        with open(vectors_path, 'wb') as f:
+            f.write(b'\x01' * 5)
+        with open(rows_path, 'wb') as f:
+            f.write(b'garbage\t\n')
+        with open(os.path.join(path, 'meta.json')) as f:
+            assert json.load(f)['generation'] == 0
+
+        b = EmbeddingStore(path)
+        add(b, ['x3'])
+        assert_consistent(path, ['x1', 'x2', 'x3'])
+
+        b.compact()
+        assert_consistent(path, ['x1', 'x2', 'x3'])
+    print("✅ 중단된 compact 파일 무시")
+
+
+def main():
+    test_add_after_foreign_compact()
+    test_interrupted_compact_ignored()
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+OpenAI Embedding Provider Test
+
+OpenAIProvider.encode()를 연속으로 호출해도 동작하는지 확인
+(AsyncOpenAI 연결 풀이 첫 호출의 event loop에 묶여 두 번째 호출에서 "Event loop is closed")
+
+로컬 HTTP 서버가 OpenAI embeddings API를 흉내냄 (OPENAI_BASE_URL, 네트워크 / API 키 불필요)
+
+사용 예시:
+    python3 scripts/_tests/test_openai_provider_encode.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+DIM = 8
+
+
+class MockEmbeddingsHandler(BaseHTTPRequestHandler):
+    """POST /v1/embeddings → 텍스트 길이로 결정되는 벡터"""
+
+    # keep-alive: 실제 API처럼 연결이 풀에 남아 다음 호출에서 재사용됨
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        inputs = request['input'] if isinstance(request['input'], list) else [request['input']]
+        body = json.dumps({
+            'object': 'list',
+            'model': request['model'],
+            'data': [
+                {'object': 'embedding', 'index': i, 'embedding': [float(len(str(text)) + 1)] * DIM}
+                for i, text in enumerate(inputs)
+            ],
+            'usage': {'prompt_tokens': 1, 'total_tokens': 1}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockEmbeddingsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ['OPENAI_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault('OPENAI_API_KEY', 'test')
+
+    with tempfile.TemporaryDirectory() as cache_path:
+        os.environ['OPENAI_EMBEDDING_CACHE'] = cache_path
+        from engines.utils.embedding_providers import OpenAIProvider
+
+        provider = OpenAIProvider('text-embedding-3-small', DIM)
+        for texts in (['a', 'b'], ['c', 'dd'], ['eee']):
+            vectors = provider.encode(texts)
+            assert vectors.shape == (len(texts), DIM), vectors.shape
+            assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+        print("✅ encode() 연속 호출 (같은 provider)")
+
+        # 여러 스레드에서 동시에 호출해도 같은 loop를 순서대로 사용
+        errors = []
+
+        def worker(i):
+            try:
+                provider.encode([f'thread-{i}-{j}' for j in range(5)])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert not errors, errors
+        print("✅ 스레드 동시 호출")
+
+    server.shutdown()
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
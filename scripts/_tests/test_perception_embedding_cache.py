@@ -0,0 +1,110 @@
+"""
+Perception Embedding Cache Test
+
+PerceptionClusterer가 logic chain 임베딩을 EmbeddingStore에 perception id별로 캐시해서
+다음 사이클에는 새 perception (또는 logic chain이 바뀐 perception)만 인코딩하는지 확인
+(DB / 모델 없이 임시 디렉토리 + 호출 횟수를 세는 결정적 encode로 실행)
+
+케이스:
+- 두 번째 호출은 인코딩 0개, 새 perception 1개 추가 시 그 1개만 인코딩
+- logic chain이 바뀐 perception은 다시 인코딩
+- 캐시 결과가 캐시 없이 계산한 임베딩과 같음 (float16 정밀도)
+- window 밖으로 나간 perception 행이 쌓이면 compact로 정리
+
+사용 예시:
+    python3 scripts/_tests/test_perception_embedding_cache.py
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.analyzers.perception_clusterer import PerceptionClusterer
+from engines.utils.embedding_store import EmbeddingStore
+
+DIM = 16
+
+
+class CountingEncode:
+    """Deterministic text → unit vector, records every encoded text"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+            v = np.random.default_rng(seed).standard_normal(DIM)
+            vectors.append(v / np.linalg.norm(v))
+        return np.array(vectors, dtype=np.float32)
+
+
+def make_clusterer(encode, cache_path) -> PerceptionClusterer:
+    clusterer = PerceptionClusterer.__new__(PerceptionClusterer)
+    clusterer.encode = encode
+    clusterer.cache_path = cache_path
+    return clusterer
+
+
+def perception(pid, chain):
+    return {'id': pid, 'mechanisms': ['즉시_단정'], 'actor': {'subject': '민주당'}, 'logic_chain': chain}
+
+
+def window(n, offset=0):
+    return [perception(f'p{i}', [f'사건 {i}', f'결론 {i}']) for i in range(offset, offset + n)]
+
+
+def test_only_new_perceptions_encoded():
+    with tempfile.TemporaryDirectory() as path:
+        encode = CountingEncode()
+        clusterer = make_clusterer(encode, path)
+
+        perceptions = window(20)
+        first = clusterer.logic_embeddings(perceptions)
+        assert len(encode.encoded) == 20
+
+        second = clusterer.logic_embeddings(perceptions)
+        assert len(encode.encoded) == 20, '캐시된 perception을 다시 인코딩함'
+        assert np.array_equal(first, second)
+
+        clusterer.logic_embeddings(perceptions + window(1, offset=20))
+        assert len(encode.encoded) == 21
+
+        changed = perception('p3', ['바뀐 사건', '바뀐 결론'])
+        clusterer.logic_embeddings(perceptions[:3] + [changed] + perceptions[4:])
+        assert encode.encoded[-1] == '바뀐 사건 → 바뀐 결론' and len(encode.encoded) == 22
+
+        uncached = make_clusterer(CountingEncode(), None).logic_embeddings(perceptions)
+        cached = clusterer.logic_embeddings(perceptions)
+        assert np.allclose(cached, uncached, atol=1e-3)
+    print("✅ 새 perception만 인코딩")
+
+
+def test_window_compaction():
+    with tempfile.TemporaryDirectory() as path:
+        clusterer = make_clusterer(CountingEncode(), path)
+
+        clusterer.logic_embeddings(window(10))
+        clusterer.logic_embeddings(window(10, offset=10))   # 이전 10개는 window 밖
+        clusterer.logic_embeddings(window(10, offset=15))   # 30행 > 2 × 10 → compact
+
+        store = EmbeddingStore(path)
+        assert store.total_rows == 10, store.total_rows
+        assert set(store.rows) == {f'p{i}' for i in range(15, 25)}
+    print("✅ window 밖 perception 정리")
+
+
+def main():
+    test_only_new_perceptions_encoded()
+    test_window_compaction()
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Worldview Evolution Safety Test
+
+WorldviewEvolutionEngine이 변화 적용 단계에서 아카이브하면 안 되는 세계관을 건드리지 않는지 확인
+(Claude / DB 호출 없이 in-memory worldviews 테이블 + 결정적 임베딩으로 실행)
+
+케이스:
+- 하위 세계관(level 2, parent_worldview_id)은 diff 대상이 아니며 사이클 후에도 아카이브되지 않음
+- 클러스터가 없거나 추출된 세계관이 0개면 어떤 세계관도 아카이브되지 않음
+
+사용 예시:
+    python3 scripts/_tests/test_worldview_evolution_safety.py
+"""
+
+import sys
+import os
+import asyncio
+import hashlib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from engines.analyzers.worldview_evolution_engine import WorldviewEvolutionEngine
+from engines.analyzers.worldview_differ import WorldviewDiffer
+
+
+class FakeQuery:
+    """Minimal supabase-py query over an in-memory table (select / neq / is_ / eq / update)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.values = None
+
+    def select(self, *_):
+        return self
+
+    def neq(self, col, value):
+        self.filters.append(lambda r: r.get(col) != value)
+        return self
+
+    def is_(self, col, value):
+        self.filters.append(lambda r: r.get(col) is None if value == 'null' else r.get(col) == value)
+        return self
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r.get(col) == value)
+        return self
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def insert(self, row):
+        self.rows.append(dict(row, id=f"inserted-{len(self.rows)}", parent_worldview_id=None, level=1))
+        return self
+
+    def execute(self):
+        matched = [r for r in self.rows if all(f(r) for f in self.filters)]
+        if self.values is not None:
+            for r in matched:
+                r.update(self.values)
+        return type('Result', (), {'data': [dict(r) for r in matched]})()
+
+
+class FakeSupabase:
+    def __init__(self, worldviews):
+        self.worldviews = worldviews
+
+    def table(self, name):
+        assert name == 'worldviews', name
+        return FakeQuery(self.worldviews)
+
+
+def hash_encode(texts):
+    """Deterministic bag-of-characters embedding (같은 문자 구성 → 높은 유사도)"""
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for ch in text:
+            vectors[i, hashlib.blake2b(ch.encode('utf-8'), digest_size=1).digest()[0]] += 1
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def worldview(id, title, subject, mechanisms, parent=None):
+    return {
+        'id': id,
+        'title': title,
+        'frame': {
+            'actor': {'subject': subject, 'purpose': '권력 유지', 'methods': ['여론 조작']},
+            'core_mechanisms': mechanisms,
+            'logic_pattern': {'trigger': f'{subject}의 행동', 'conclusion': '음모'}
+        },
+        'archived': False,
+        'version': 1,
+        'parent_worldview_id': parent,
+        'level': 2 if parent else 1
+    }
+
+
+def extracted(title, subject, mechanisms):
+    return {
+        'title': title,
+        'actor': {'subject': subject, 'purpose': '권력 유지', 'methods': ['여론 조작']},
+        'core_mechanisms': mechanisms,
+        'logic_pattern': {'trigger': f'{subject}의 행동', 'conclusion': '음모'}
+    }
+
+
+def make_engine(rows) -> WorldviewEvolutionEngine:
+    engine = WorldviewEvolutionEngine.__new__(WorldviewEvolutionEngine)
+    engine.supabase = FakeSupabase(rows)
+    engine.window_days = 90
+    engine.sample_seed = None
+    engine.differ = WorldviewDiffer(encode=hash_encode)
+    return engine
+
+
+async def test_children_never_archived():
+    rows = [
+        worldview('p1', '민주당은 사찰로 국민을 감시한다', '민주당', ['즉시_단정', '역사_투사']),
+        worldview('p2', '중국이 댓글부대로 여론을 조작한다', '중국', ['네트워크_추론']),
+        worldview('c1', '민주당은 통신사를 협박한다', '민주당', ['즉시_단정'], parent='p1'),
+        worldview('c2', '민주당은 판사를 표적 사찰한다', '민주당', ['역사_투사'], parent='p1'),
+        worldview('c3', '중국 유학생이 여론조사에 개입한다', '중국', ['네트워크_추론'], parent='p2'),
+    ]
+    engine = make_engine(rows)
+
+    existing = await engine._load_existing_worldviews()
+    assert {wv['id'] for wv in existing} == {'p1', 'p2'}, [wv['id'] for wv in existing]
+
+    # p1만 다시 추출됨 → p2는 disappeared, 하위 세계관은 diff에 없어야 함
+    changes = await engine._detect_changes(existing, [
+        extracted('민주당은 사찰로 국민을 감시한다', '민주당', ['즉시_단정', '역사_투사'])
+    ])
+    assert not {'c1', 'c2', 'c3'} & set(changes['disappeared_worldview_ids']), changes['disappeared_worldview_ids']
+
+    await engine._apply_changes(changes)
+    archived = {r['id'] for r in rows if r['archived']}
+    assert not archived & {'c1', 'c2', 'c3'}, archived
+    print("✅ 하위 세계관 아카이브 안 됨")
+
+
+async def test_empty_extraction_archives_nothing():
+    rows = [
+        worldview('p1', '민주당은 사찰로 국민을 감시한다', '민주당', ['즉시_단정', '역사_투사']),
+        worldview('p2', '중국이 댓글부대로 여론을 조작한다', '중국', ['네트워크_추론']),
+    ]
+    engine = make_engine(rows)
+
+    # 클러스터 없음 → LLM 호출 없이 빈 결과
+    async def no_clusters(perceptions):
+        return []
+    async def stats(perceptions):
+        return {'perception_count': 0, 'mechanism_counts': {}, 'actor_counts': {}, 'cooccurrence': {}}
+    engine._cluster_window = no_clusters
+    engine._load_corpus_statistics = stats
+    assert await engine._consolidate_worldviews([]) == []
+
+    existing = await engine._load_existing_worldviews()
+    changes = await engine._detect_changes(existing, [])
+    assert not changes['significant'], changes['summary']
+    assert changes['disappeared_worldview_ids'] == [], changes['disappeared_worldview_ids']
+
+    await engine._apply_changes(changes)
+    assert not any(r['archived'] for r in rows)
+    print("✅ 빈 추출 결과로 아카이브 안 됨")
+
+
+async def main():
+    await test_children_never_archived()
+    await test_empty_extraction_archives_nothing()
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
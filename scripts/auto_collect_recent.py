@@ -13,6 +13,7 @@ import re
 from datetime import datetime, timedelta, timezone
 from engines.adapters.dc_gallery_adapter import DCGalleryAdapter
 from engines.utils.supabase_client import get_supabase
+from engines.utils.near_duplicate import NearDuplicateDetector
 from dateutil import parser as date_parser
 
 
@@ -24,6 +25,7 @@ async def main():
 
     adapter = DCGalleryAdapter()
     supabase = get_supabase()
+    duplicates = NearDuplicateDetector()
 
     # Step 1: DB에서 가장 큰 글 번호 찾기
     print("🔍 DB에서 최대 글 번호 확인 중...")
@@ -68,6 +70,7 @@ async def main():
         print("💾 새 글 저장 중...")
 
         saved_count = 0
+        duplicate_count = 0
         for post in new_posts:
             try:
                 # 중복 체크
@@ -118,17 +121,27 @@ async def main():
                     'is_active': True
                 }
 
+                # 거의 같은 글이 이미 있으면 duplicate_of 기록 → 분석 시 원본 perception 복사
+                try:
+                    data.update(duplicates.fields(data['body']))
+                except Exception as e:
+                    print(f"  ⚠️  중복 검사 실패 (no={post['post_num']}): {e}")
+
                 supabase.table('contents').insert(data).execute()
                 saved_count += 1
 
-                print(f"  저장: no={post['post_num']} - {post['title'][:30]}")
+                if data.get('duplicate_of'):
+                    duplicate_count += 1
+                    print(f"  저장 (중복 {data['duplicate_similarity']:.2f}): no={post['post_num']} - {post['title'][:30]}")
+                else:
+                    print(f"  저장: no={post['post_num']} - {post['title'][:30]}")
 
             except Exception as e:
                 print(f"  오류 (no={post['post_num']}): {e}")
                 continue
 
         print()
-        print(f"✅ 새 글 {saved_count}개 저장 완료")
+        print(f"✅ 새 글 {saved_count}개 저장 완료 (중복 {duplicate_count}개)")
 
     print()
 
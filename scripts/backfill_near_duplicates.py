@@ -0,0 +1,36 @@
+"""
+Near-duplicate Backfill - 기존 contents에 MinHash 서명 / duplicate_of 기록
+
+migration 519 적용 직후 1회 (이후 새 글은 수집 시점에 기록)
+이미 분석된 글은 duplicate_of가 생겨도 다시 분석하지 않음 → 이후 들어오는 재게시 글의 원본 후보가 됨
+
+사용 예시:
+    python3 scripts/backfill_near_duplicates.py
+    python3 scripts/backfill_near_duplicates.py --threshold 0.85 --limit 5000
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.utils.near_duplicate import NearDuplicateDetector
+
+
+def main():
+    parser = argparse.ArgumentParser(description='contents MinHash / near-duplicate backfill')
+    parser.add_argument('--threshold', type=float, default=0.8, help='중복 판정 추정 Jaccard (기본: 0.8)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--limit', type=int, help='이번 실행에서 처리할 최대 글 수')
+
+    args = parser.parse_args()
+
+    detector = NearDuplicateDetector(threshold=args.threshold)
+    stats = detector.backfill(batch_size=args.batch_size, limit=args.limit)
+
+    print(f"✅ {stats['signed']:,}개 서명 (중복 {stats['duplicates']:,}개), 짧은 글 {stats['skipped']:,}개 건너뜀")
+
+
+if __name__ == '__main__':
+    main()
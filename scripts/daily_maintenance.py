@@ -3,6 +3,8 @@ Daily Maintenance Script v2.0
 
 v2.0 시스템에 맞춰 단순화:
 1. Contents/Perceptions 아카이빙 (90일 이상) - published_at 기준
+   - COLD_STORAGE_URI 설정 시 삭제 전 Parquet(zstd)로 내보내기
+   - 삭제된 perception의 날짜 버킷(mechanism_daily_stats) 재계산
 2. 통계 출력
 
 Pattern decay, snapshots 등은 v2.0에서 제거됨
@@ -18,6 +20,8 @@ from datetime import datetime, timedelta, timezone
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from engines.utils.supabase_client import get_supabase
+from engines.archiving.cold_storage import ColdStorageExporter, cold_storage_uri
+from engines.analyzers.mechanism_stats import MechanismStatsStore, created_day
 
 
 def archive_old_contents(supabase, days_threshold=90):
@@ -36,8 +40,10 @@ def archive_old_contents(supabase, days_threshold=90):
     print()
 
     # 90일 이상 된 contents 찾기
+    storage_uri = cold_storage_uri()
+
     old_contents = supabase.table('contents')\
-        .select('id')\
+        .select('*' if storage_uri else 'id')\
         .lt('published_at', cutoff_iso)\
         .execute()
 
@@ -52,7 +58,7 @@ def archive_old_contents(supabase, days_threshold=90):
 
     # 관련 perceptions 수 확인
     old_perceptions = supabase.table('layered_perceptions')\
-        .select('id')\
+        .select('*' if storage_uri else 'id, created_at')\
         .in_('content_id', old_ids)\
         .execute()
 
@@ -61,6 +67,13 @@ def archive_old_contents(supabase, days_threshold=90):
     print(f"관련 perceptions: {perception_count:,}개")
     print()
 
+    # Cold storage 내보내기 (실패 시 예외 → 삭제하지 않음)
+    if storage_uri:
+        print(f"Cold storage 내보내기: {storage_uri}")
+        exported = ColdStorageExporter(storage_uri).export(old_contents.data, old_perceptions.data or [])
+        print(f"  ✅ Parquet 파일 {len(exported['files'])}개 작성")
+        print()
+
     # 삭제 시작
     print("삭제 중...")
 
@@ -82,6 +95,11 @@ def archive_old_contents(supabase, days_threshold=90):
 
         print(f"  ✅ Perceptions 삭제: {perception_count:,}개")
 
+        # 증분 통계에서도 빠지도록 해당 날짜 버킷 재계산 (get_mechanism_statistics와 같은 집계 유지)
+        days = {d for d in map(created_day, old_perceptions.data) if d}
+        MechanismStatsStore().refresh_days(days)
+        print(f"  ✅ 메커니즘 통계 버킷 재계산: {len(days):,}일")
+
     # Contents 삭제
     supabase.table('contents')\
         .delete()\
@@ -2,9 +2,12 @@
 Process New Contents - GitHub Actions용 자동화 스크립트
 
 새로 수집된 contents를 분석하여:
+0. Triage (ContentTriage): 명백히 신호 없는 글은 LLM 없이 빈 perception 저장
 1. Layered perception 추출 (v2.1 with filtering)
 2. Reasoning structure 추출
-3. Mechanism matching으로 세계관 연결
+3. 거의 같은 글(contents.duplicate_of, migration 519)은 LLM 대신 원본 perception 복사
+   (원본 perception이 없으면 1-2로 분석)
+4. Mechanism matching으로 세계관 연결
 
 GitHub Actions에서 10분마다 실행됨
 """
@@ -19,52 +22,28 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from engines.analyzers.layered_perception_extractor_v2 import LayeredPerceptionExtractorV2
 from engines.analyzers.reasoning_structure_extractor import ReasoningStructureExtractor
 from engines.analyzers.mechanism_matcher import MechanismMatcher
+from engines.analyzers.mechanism_stats import MechanismStatsStore
+from engines.analyzers.content_triage import ContentTriage
+from engines.utils.prompt_body import get_preprocessor
 from engines.utils.supabase_client import get_supabase
 
 
-async def main():
-    print("\n" + "="*80)
-    print(f"Process New Contents - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80 + "\n")
-
-    supabase = get_supabase()
+async def analyze(supabase, contents: list) -> tuple:
+    """
+    LLM perception + reasoning structure extraction
 
-    # Step 1: perception이 없는 모든 contents 찾기
-    # 먼저 모든 contents 가져오기
-    all_contents = supabase.table('contents')\
-        .select('id, title, body')\
-        .not_.is_('body', 'null')\
-        .neq('body', '')\
-        .execute()
-
-    # 이미 처리된 content_ids
-    processed = supabase.table('layered_perceptions')\
-        .select('content_id')\
-        .execute()
-
-    processed_ids = {p['content_id'] for p in processed.data}
-
-    # 처리되지 않은 contents만 필터링
-    new_contents = [c for c in all_contents.data if c['id'] not in processed_ids]
-
-    if not new_contents:
-        print("✅ No new contents to process")
-        return
-
-    print(f"Processing {len(new_contents)} unprocessed contents...\n")
-
-    to_process = new_contents
-
-    # Step 3: Perception 추출 (v2.1 with filtering)
+    Returns:
+        (저장된 perception 수, reasoning structure 수)
+    """
     extractor = LayeredPerceptionExtractorV2()
     structure_extractor = ReasoningStructureExtractor()
 
     batch_size = 2  # Rate limit 회피를 위해 줄임
-    total = len(to_process)
+    total = len(contents)
     processed = 0
 
     for i in range(0, total, batch_size):
-        batch = to_process[i:i+batch_size]
+        batch = contents[i:i+batch_size]
 
         # Perception 추출
         tasks = [extractor.extract(content) for content in batch]
@@ -84,12 +63,12 @@ async def main():
 
     print(f"\n✅ Perception extraction complete: {processed} perceptions created")
 
-    # Step 4: Reasoning structure 추가
+    # Reasoning structure 추가
     print("\nExtracting reasoning structures...")
 
     perception_ids = supabase.table('layered_perceptions')\
         .select('id')\
-        .in_('content_id', [c['id'] for c in to_process])\
+        .in_('content_id', [c['id'] for c in contents])\
         .execute()
 
     structure_count = 0
@@ -103,6 +82,114 @@ async def main():
 
     print(f"✅ Reasoning structures extracted: {structure_count}")
 
+    return processed, structure_count
+
+
+def triage_contents(supabase, triage: ContentTriage, contents: list) -> tuple:
+    """
+    Save empty perceptions for no-signal posts (LLM 호출 없음)
+
+    Returns:
+        (LLM으로 보낼 contents, 건너뛴 수)
+    """
+    to_extract, skipped = triage.split(contents)
+
+    if skipped:
+        supabase.table('layered_perceptions').insert([triage.empty_perception(c) for c in skipped]).execute()
+
+        reasons = {}
+        for c in skipped:
+            reasons[c['_triage']['reason']] = reasons.get(c['_triage']['reason'], 0) + 1
+        print(f"✅ Triage skipped: {len(skipped)}/{len(contents)} ({', '.join(f'{r} {n}' for r, n in reasons.items())})")
+
+    return to_extract, len(skipped)
+
+
+def copy_duplicates(supabase, duplicates: list) -> list:
+    """
+    Copy the canonical perception to near-duplicate contents (LLM 호출 없음)
+
+    Returns:
+        원본 perception이 없어 복사하지 못한 contents (→ LLM 분석)
+    """
+    copied = supabase.rpc('copy_duplicate_perceptions', {
+        'content_ids': [c['id'] for c in duplicates]
+    }).execute().data or []
+
+    # 복사본도 mechanism 일별 통계에 반영 (ReasoningStructureExtractor가 저장할 때와 동일)
+    if copied:
+        try:
+            MechanismStatsStore().record_many(copied)
+        except Exception as e:
+            print(f"  ⚠️  통계 갱신 실패: {e}")
+
+    copied_ids = {row['content_id'] for row in copied}
+    print(f"✅ Duplicate perceptions copied: {len(copied_ids)}/{len(duplicates)}")
+
+    return [c for c in duplicates if c['id'] not in copied_ids]
+
+
+async def main():
+    print("\n" + "="*80)
+    print(f"Process New Contents - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80 + "\n")
+
+    supabase = get_supabase()
+
+    # Step 1: perception이 없는 모든 contents 찾기
+    # 먼저 모든 contents 가져오기
+    all_contents = supabase.table('contents')\
+        .select('id, title, body, duplicate_of')\
+        .not_.is_('body', 'null')\
+        .neq('body', '')\
+        .execute()
+
+    # 이미 처리된 content_ids
+    processed = supabase.table('layered_perceptions')\
+        .select('content_id')\
+        .execute()
+
+    processed_ids = {p['content_id'] for p in processed.data}
+
+    # 처리되지 않은 contents만 필터링
+    new_contents = [c for c in all_contents.data if c['id'] not in processed_ids]
+
+    if not new_contents:
+        print("✅ No new contents to process")
+        return
+
+    # 원본을 먼저 분석해야 같은 실행에서 들어온 중복 글도 복사 가능
+    originals = [c for c in new_contents if not c.get('duplicate_of')]
+    duplicates = [c for c in new_contents if c.get('duplicate_of')]
+
+    print(f"Processing {len(new_contents)} unprocessed contents ({len(duplicates)} near-duplicates)...\n")
+
+    # Step 2: Triage (모델 파일이 없으면 heuristics만)
+    triage = ContentTriage()
+    if triage.has_model:
+        print(f"Triage model threshold: {triage.threshold:.4f}")
+    originals, skipped = triage_contents(supabase, triage, originals)
+
+    # Step 3-4: Perception (v2.1 with filtering) + reasoning structure 추출
+    processed, structure_count = 0, 0
+    if originals:
+        processed, structure_count = await analyze(supabase, originals)
+
+    # Step 4b: 중복 글은 원본 perception 복사, 원본 perception이 없으면 LLM 분석
+    copied = 0
+    if duplicates:
+        print("\nCopying perceptions for near-duplicates...")
+        remaining = copy_duplicates(supabase, duplicates)
+        copied = len(duplicates) - len(remaining)
+
+        remaining, extra_skipped = triage_contents(supabase, triage, remaining)
+        skipped += extra_skipped
+
+        if remaining:
+            extra_processed, extra_structures = await analyze(supabase, remaining)
+            processed += extra_processed
+            structure_count += extra_structures
+
     # Step 5: Mechanism matching
     print("\nMatching to worldviews...")
 
@@ -117,8 +204,16 @@ async def main():
     print("="*80)
     print(f"New contents found: {len(new_contents)}")
     print(f"Processed: {processed}")
+    print(f"Copied from duplicates: {copied}")
+    print(f"Skipped by triage: {skipped}")
     print(f"Reasoning structures: {structure_count}")
     print(f"Worldview matches: {len(matched)}")
+
+    body_stats = get_preprocessor().stats
+    if body_stats['prompts']:
+        saved = body_stats['baseline_tokens'] - body_stats['tokens']
+        print(f"Prompt body tokens: {body_stats['tokens']:,} / body[:2000] {body_stats['baseline_tokens']:,} "
+              f"(saved {saved:,}, {saved / body_stats['baseline_tokens']:.1%}; condensed {body_stats['condensed']}/{body_stats['prompts']} prompts)")
     print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
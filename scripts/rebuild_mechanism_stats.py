@@ -0,0 +1,33 @@
+"""
+Mechanism Stats Rebuild - 증분 통계 저장소 backfill
+
+mechanism_daily_stats를 기존 layered_perceptions로부터 재계산
+(migration 512 적용 직후 1회, 또는 통계가 어긋났을 때)
+
+사용 예시:
+    python3 scripts/rebuild_mechanism_stats.py --days 90
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.analyzers.mechanism_stats import MechanismStatsStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='mechanism_daily_stats 재계산')
+    parser.add_argument('--days', type=int, default=90, help='재계산할 기간 (기본: 90일)')
+
+    args = parser.parse_args()
+
+    store = MechanismStatsStore()
+    recorded = store.rebuild(days=args.days)
+
+    print(f"✅ {recorded:,}개 perception으로 최근 {args.days}일 통계 재계산 완료")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Pattern Re-embedding - worldview_patterns를 새 임베딩 모델로 점진 이전 (migration 518)
+
+서비스 중단 없이 모델 교체:
+1. 새 모델 벡터를 embedding_next에 배치 단위로 기록 (기존 embedding / 검색은 그대로)
+   - 재임베딩 중 find_similar_patterns(target_model=새 모델)은 embedding_next도 검색
+   - id keyset 순회 → 중단 후 다시 실행하면 남은 패턴부터 이어서 처리
+2. 워커를 PATTERN_EMBEDDING_PROVIDER=<새 provider>로 재시작
+3. --promote: 남은 패턴(그 사이 기존 모델로 생성된 패턴 포함)을 처리한 뒤
+   promote_pattern_embeddings()로 embedding_next → embedding 교체 + 모델별 HNSW 인덱스 생성
+
+사용 예시:
+    # 진행 상황
+    python3 scripts/reembed_patterns.py --status
+
+    # 새 모델로 재임베딩 (embedding_next)
+    python3 scripts/reembed_patterns.py --provider openai-3-small-768 --batch-size 256
+
+    # 워커 전환 후 마무리
+    python3 scripts/reembed_patterns.py --provider openai-3-small-768 --promote
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.utils.supabase_client import get_supabase
+from engines.utils.embedding_providers import PROVIDERS, get_provider, register_model
+from engines.analyzers.pattern_manager import EMBEDDING_DTYPE
+
+
+def print_status(supabase):
+    rows = supabase.rpc('pattern_embedding_status', {}).execute().data or []
+
+    print(f"  {'embedding_model':<66} {'embedding_next_model':<40} {'patterns':>9}")
+    for row in rows:
+        print(f"  {row['embedding_model'] or '-':<66} {row['embedding_next_model'] or '-':<40} {row['patterns']:>9,}")
+
+
+def reembed(supabase, provider, batch_size: int, limit: int = None) -> int:
+    """
+    Fill embedding_next for every pattern not yet embedded with the provider
+
+    Returns:
+        처리한 패턴 수
+    """
+    done, after_id = 0, None
+    start = time.time()
+
+    while limit is None or done < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done)
+        rows = supabase.rpc('pending_pattern_embeddings', {
+            'model': provider.fingerprint,
+            'after_id': after_id,
+            'batch_size': size
+        }).execute().data or []
+
+        if not rows:
+            break
+
+        vectors = provider.encode([row['text'] or '' for row in rows]).astype(EMBEDDING_DTYPE)
+
+        supabase.rpc('set_next_pattern_embeddings', {
+            'rows': [{'id': row['id'], 'embedding': vec.tolist()} for row, vec in zip(rows, vectors)],
+            'model': provider.fingerprint
+        }).execute()
+
+        done += len(rows)
+        after_id = rows[-1]['id']
+        print(f"  {done:,}개 ({done / (time.time() - start):.1f}/s)")
+
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description='worldview_patterns 임베딩 모델 이전')
+    parser.add_argument('--provider', choices=list(PROVIDERS), help='새 임베딩 provider (embedding_providers.PROVIDERS)')
+    parser.add_argument('--batch-size', type=int, default=256, help='RPC / encode 배치 크기')
+    parser.add_argument('--limit', type=int, help='이번 실행에서 처리할 최대 패턴 수')
+    parser.add_argument('--promote', action='store_true', help='남은 패턴 처리 후 embedding_next → embedding 교체')
+    parser.add_argument('--status', action='store_true', help='모델별 패턴 수만 출력')
+
+    args = parser.parse_args()
+
+    if not args.status and not args.provider:
+        parser.error('--provider 또는 --status 필요')
+
+    print("=" * 80)
+    print(f"Pattern Re-embedding - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 80)
+
+    supabase = get_supabase()
+
+    if args.status:
+        print_status(supabase)
+        return
+
+    provider = get_provider(args.provider)
+    register_model(supabase, provider)
+    print(f"\n대상 모델: {provider.fingerprint}\n")
+
+    done = reembed(supabase, provider, args.batch_size, args.limit)
+    print(f"\n✅ embedding_next 기록: {done:,}개")
+
+    if args.promote:
+        if args.limit is not None and done >= args.limit:
+            print("\n⚠️  --limit에 도달해 남은 패턴이 있을 수 있음 → promote 건너뜀")
+        else:
+            promoted = supabase.rpc('promote_pattern_embeddings', {'model': provider.fingerprint}).execute().data
+            print(f"✅ promote: {promoted:,}개 → embedding ({provider.fingerprint})")
+
+    print()
+    print_status(supabase)
+
+
+if __name__ == '__main__':
+    main()
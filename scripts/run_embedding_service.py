@@ -0,0 +1,68 @@
+"""
+Embedding Service 실행 스크립트
+
+문장 임베딩 모델을 한 프로세스에만 올리고 Unix socket으로 제공
+워커(process_new_contents, mechanism matcher 등)는 EMBEDDING_SERVICE_SOCKET을 설정하면
+sentence_encoder.get_encoder()가 자동으로 이 서비스를 사용 (모델 로드 없음)
+
+사용 예시:
+    python3 scripts/run_embedding_service.py
+    python3 scripts/run_embedding_service.py --backend onnx-int8 --max-batch 128 --max-wait-ms 10
+    EMBEDDING_SERVICE_SOCKET=/tmp/moniterdc-embedding.sock python3 scripts/process_new_contents.py
+"""
+
+import asyncio
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engines.utils.sentence_encoder import BACKENDS, load_encoder
+from engines.utils.embedding_service import DEFAULT_SOCKET_PATH, EmbeddingServer
+
+
+async def report(server: EmbeddingServer, interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        stats = server.stats
+        if stats['batches']:
+            print(f"  요청 {stats['requests']:,}개 / 문장 {stats['texts']:,}개 / "
+                  f"배치 {stats['batches']:,}개 (평균 {stats['texts'] / stats['batches']:.1f}문장)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Shared sentence embedding service')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help='Unix socket 경로 (기본: EMBEDDING_SERVICE_SOCKET)')
+    parser.add_argument('--backend', choices=BACKENDS, default=None, help='추론 백엔드 (기본: PATTERN_EMBEDDING_BACKEND)')
+    parser.add_argument('--max-batch', type=int, default=64, help='micro-batch 최대 문장 수')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='첫 요청 후 batch를 모으는 최대 시간')
+    parser.add_argument('--report-interval', type=int, default=300, help='통계 출력 주기 (초)')
+
+    args = parser.parse_args()
+
+    print("="*80)
+    print("EMBEDDING SERVICE")
+    print("="*80)
+
+    model = load_encoder(args.backend)
+
+    server = EmbeddingServer(
+        encode=lambda texts: model.encode(texts, batch_size=args.max_batch, convert_to_numpy=True),
+        dim=model.get_sentence_embedding_dimension(),
+        socket_path=args.socket,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms
+    )
+
+    reporter = asyncio.create_task(report(server, args.report_interval))
+    try:
+        await server.serve()
+    finally:
+        reporter.cancel()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n종료")
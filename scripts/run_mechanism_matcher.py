@@ -3,9 +3,14 @@ Mechanism Matcher 실행 스크립트
 
 layered_perceptions와 worldviews를 연결
 Actor + Mechanism 기반 매칭
+
+사용 예시:
+    python3 scripts/run_mechanism_matcher.py
+    python3 scripts/run_mechanism_matcher.py --top-k 10   # 임베딩 top-k 후보만 재정렬
 """
 
 import asyncio
+import argparse
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -14,14 +19,19 @@ from engines.analyzers.mechanism_matcher import MechanismMatcher
 
 
 async def main():
+    parser = argparse.ArgumentParser(description='Mechanism matcher')
+    parser.add_argument('--threshold', type=float, default=0.4, help='링크 생성 최소 점수')
+    parser.add_argument('--top-k', type=int, default=None, help='임베딩 검색 후보 수 (기본: 전체 세계관)')
+
+    args = parser.parse_args()
+
     print("="*80)
     print("MECHANISM MATCHER - Perception-Worldview 연결")
     print("="*80)
 
-    matcher = MechanismMatcher()
+    matcher = MechanismMatcher(embedding_top_k=args.top_k)
 
-    # Run matching with threshold 0.4
-    links_created = await matcher.match_all_perceptions(threshold=0.4)
+    links_created = await matcher.match_all_perceptions(threshold=args.threshold)
 
     print("\n" + "="*80)
     print("완료")
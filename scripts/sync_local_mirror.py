@@ -0,0 +1,64 @@
+"""
+Local Mirror Sync - Supabase → 로컬 DuckDB 증분 동기화
+
+분석/실험 스크립트가 production DB를 반복 조회하지 않도록
+contents, layered_perceptions, perception_worldview_links, worldviews, worldview_patterns를
+로컬 DuckDB로 미러링 (updated_at/created_at watermark 기반)
+
+사용 예시:
+    # 전체 테이블 증분 동기화
+    python3 scripts/sync_local_mirror.py
+
+    # 일부 테이블만, 삭제 정리 없이
+    python3 scripts/sync_local_mirror.py --tables layered_perceptions worldviews --no-reconcile
+
+    # 주기(LOCAL_MIRROR_RECONCILE_HOURS)와 상관없이 삭제 정리
+    python3 scripts/sync_local_mirror.py --reconcile
+
+    # 동기화 후 Parquet로 내보내기
+    python3 scripts/sync_local_mirror.py --export-parquet local_mirror/parquet
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.utils.local_mirror import LocalMirror, MIRROR_TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Supabase → 로컬 DuckDB 증분 동기화')
+    parser.add_argument('--path', type=str, help='DuckDB 파일 경로 (기본: LOCAL_MIRROR_PATH)')
+    parser.add_argument('--tables', nargs='+', choices=list(MIRROR_TABLES.keys()), help='동기화할 테이블 (기본: 전체)')
+    reconcile = parser.add_mutually_exclusive_group()
+    reconcile.add_argument('--reconcile', action='store_true', help='주기와 상관없이 삭제된 행 정리 (전체 id 조회)')
+    reconcile.add_argument('--no-reconcile', action='store_true', help='삭제된 행 정리 건너뛰기')
+    parser.add_argument('--export-parquet', type=str, help='동기화 후 Parquet 내보낼 디렉토리')
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"Local Mirror Sync - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 80)
+
+    mirror = LocalMirror(path=args.path)
+    reconcile_deletes = True if args.reconcile else False if args.no_reconcile else None
+    report = mirror.sync(tables=args.tables, reconcile_deletes=reconcile_deletes)
+
+    for table, stats in report.items():
+        deleted = f"-{stats['deleted']:,}" if stats['deleted'] is not None else '삭제 정리 건너뜀'
+        print(f"  {table}: +{stats['upserted']:,} / {deleted} (watermark: {stats['watermark']})")
+
+    if args.export_parquet:
+        paths = mirror.export_parquet(args.export_parquet)
+        print(f"\n✅ Parquet {len(paths)}개 내보내기: {args.export_parquet}")
+
+    mirror.close()
+    print(f"\n✅ 동기화 완료: {mirror.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Content Triage Model 학습
+
+과거 contents + layered_perceptions로 "추출하면 perception이 남는 글인가" 분류기 학습
+(라벨: explicit_claims 또는 deep_beliefs가 비어있지 않음, 복사본 / triage perception 제외)
+
+held-out 20%에서 signal recall이 --min-signal-recall 이상인 최대 threshold를 고른 뒤
+전체 데이터로 재학습해 joblib으로 저장 → process_new_contents가 ContentTriage로 사용
+
+사용 예시:
+    python3 scripts/train_triage_model.py
+    python3 scripts/train_triage_model.py --min-signal-recall 0.99 --output models/content_triage.joblib
+    python3 scripts/train_triage_model.py --dry-run        # 지표만 출력, 저장 안 함
+"""
+
+import sys
+import os
+import argparse
+import joblib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.analyzers.content_triage import DEFAULT_MODEL_PATH, heuristic_reason, load_training_data, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content triage 분류기 학습')
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH, help='저장 경로 (기본: CONTENT_TRIAGE_MODEL)')
+    parser.add_argument('--min-signal-recall', type=float, default=0.98, help='신호 있는 글 중 LLM으로 보낼 최소 비율')
+    parser.add_argument('--limit', type=int, help='학습에 사용할 최대 글 수')
+    parser.add_argument('--dry-run', action='store_true', help='지표만 출력')
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Content Triage Model Training")
+    print("=" * 80)
+
+    contents, labels = load_training_data(limit=args.limit)
+    heuristic = sum(1 for c in contents if heuristic_reason(c))
+    print(f"\n학습 데이터: {len(contents):,}개 (신호 있음 {labels.mean():.1%}, heuristics로 건너뜀 {heuristic:,}개)")
+
+    bundle, metrics = train(contents, labels, min_signal_recall=args.min_signal_recall)
+
+    print(f"\nHeld-out (모델 대상 {metrics['samples']:,}개 중 20%):")
+    print(f"  ROC AUC:              {metrics['roc_auc']:.3f}")
+    print(f"  Threshold:            {metrics['threshold']:.4f}")
+    print(f"  건너뛰는 글:           {metrics['skip_rate']:.1%}")
+    print(f"  Signal recall:        {metrics['signal_recall']:.1%}")
+    print(f"  빈 perception 적중:    {metrics['no_signal_caught']:.1%}")
+
+    if args.dry_run:
+        return
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    joblib.dump(bundle, args.output, compress=3)
+    print(f"\n✅ 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
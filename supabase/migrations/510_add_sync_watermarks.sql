@@ -0,0 +1,54 @@
+-- Migration 510: updated_at watermarks for incremental local mirror sync
+-- Purpose: engines/utils/local_mirror.py가 변경된 행만 가져올 수 있도록 updated_at 추적
+
+-- Generic trigger function
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- contents
+ALTER TABLE contents
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+DROP TRIGGER IF EXISTS trigger_contents_updated_at ON contents;
+CREATE TRIGGER trigger_contents_updated_at
+BEFORE UPDATE ON contents
+FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+-- layered_perceptions (reasoning structure 추출 시 UPDATE 됨)
+ALTER TABLE layered_perceptions
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+DROP TRIGGER IF EXISTS trigger_layered_perceptions_updated_at ON layered_perceptions;
+CREATE TRIGGER trigger_layered_perceptions_updated_at
+BEFORE UPDATE ON layered_perceptions
+FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+-- worldviews (updated_at 컬럼은 103에서 생성, 트리거만 추가)
+DROP TRIGGER IF EXISTS trigger_worldviews_updated_at ON worldviews;
+CREATE TRIGGER trigger_worldviews_updated_at
+BEFORE UPDATE ON worldviews
+FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+-- Watermark indexes (perception_worldview_links는 insert-only → created_at 사용)
+CREATE INDEX IF NOT EXISTS idx_contents_updated_at
+ON contents(updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_layered_perceptions_updated_at
+ON layered_perceptions(updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_pwlinks_created_at
+ON perception_worldview_links(created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_patterns_updated_at
+ON worldview_patterns(updated_at, id);
+
+COMMENT ON COLUMN contents.updated_at IS 'Last modification time (local mirror sync watermark)';
+COMMENT ON COLUMN layered_perceptions.updated_at IS 'Last modification time (local mirror sync watermark)';
@@ -0,0 +1,69 @@
+-- Migration 511: Corpus-wide mechanism / actor statistics for worldview evolution
+-- Purpose: WorldviewEvolutionEngine이 200개 샘플 대신 active window 전체 통계를 한 번의 RPC로 조회
+
+CREATE OR REPLACE FUNCTION get_mechanism_statistics(
+    days_window INTEGER DEFAULT 90,
+    actor_limit INTEGER DEFAULT 30
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_perceptions AS (
+        SELECT lp.id, lp.mechanisms, lp.actor
+        FROM layered_perceptions lp
+        INNER JOIN contents c ON lp.content_id = c.id
+        WHERE COALESCE(lp.archived, false) = false
+          AND COALESCE(c.published_at, lp.created_at) >= NOW() - make_interval(days => days_window)
+          AND cardinality(lp.mechanisms) > 0
+    ),
+    perception_mechanisms AS (
+        -- 한 perception 안의 중복 메커니즘은 1회로
+        SELECT DISTINCT wp.id, m.mechanism
+        FROM window_perceptions wp, unnest(wp.mechanisms) AS m(mechanism)
+    ),
+    mechanism_counts AS (
+        SELECT mechanism, COUNT(*) AS cnt
+        FROM perception_mechanisms
+        GROUP BY mechanism
+    ),
+    actor_counts AS (
+        SELECT
+            CASE jsonb_typeof(wp.actor->'subject')
+                WHEN 'string' THEN wp.actor->>'subject'
+                WHEN 'array' THEN (
+                    SELECT string_agg(s, ', ')
+                    FROM jsonb_array_elements_text(wp.actor->'subject') AS s
+                )
+                ELSE 'Unknown'
+            END AS actor,
+            COUNT(*) AS cnt
+        FROM window_perceptions wp
+        GROUP BY 1
+    ),
+    cooccurrence AS (
+        SELECT a.mechanism AS mechanism_a, b.mechanism AS mechanism_b, COUNT(*) AS cnt
+        FROM perception_mechanisms a
+        INNER JOIN perception_mechanisms b
+            ON a.id = b.id AND a.mechanism < b.mechanism
+        GROUP BY a.mechanism, b.mechanism
+    )
+    SELECT jsonb_build_object(
+        'perception_count', (SELECT COUNT(*) FROM window_perceptions),
+        'mechanism_counts', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(mechanism, cnt) ORDER BY cnt DESC) FROM mechanism_counts),
+            '[]'::jsonb
+        ),
+        'actor_counts', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(actor, cnt) ORDER BY cnt DESC)
+             FROM (SELECT * FROM actor_counts ORDER BY cnt DESC LIMIT actor_limit) top_actors),
+            '[]'::jsonb
+        ),
+        'cooccurrence', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(mechanism_a, mechanism_b, cnt) ORDER BY cnt DESC) FROM cooccurrence),
+            '[]'::jsonb
+        )
+    );
+$$;
+
+COMMENT ON FUNCTION get_mechanism_statistics IS 'Active window 전체의 메커니즘 빈도, Actor 빈도, 메커니즘 공출현 쌍 (세계관 진화 프롬프트용)';
@@ -0,0 +1,31 @@
+-- Migration 512: Streaming mechanism / actor statistics (daily buckets)
+-- Purpose: perception 저장 시점에 증분 갱신되는 일별 통계
+--          → 세계관 진화와 대시보드 트렌드가 perception 재스캔 없이 rolling window 조회
+
+CREATE TABLE IF NOT EXISTS mechanism_daily_stats (
+    stat_date DATE PRIMARY KEY,
+
+    perception_count INT NOT NULL DEFAULT 0,
+
+    -- {"즉시_단정": 12, "역사_투사": 5, ...}
+    mechanism_counts JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    -- 메커니즘 × 메커니즘 공출현 (알파벳 순 쌍, "a|b" 키)
+    -- {"역사_투사|즉시_단정": 4, ...}
+    cooccurrence JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    -- Actor 빈도 Count-Min sketch {"width": 512, "depth": 4, "table": [[...], ...]}
+    actor_sketch JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    -- Actor top-k (Space-Saving) {"k": 50, "counters": {"민주당": [count, error], ...}}
+    actor_heavy_hitters JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_mechanism_daily_stats_date
+ON mechanism_daily_stats(stat_date DESC);
+
+COMMENT ON TABLE mechanism_daily_stats IS 'Per-day streaming statistics updated as perceptions are saved (mechanism counts, co-occurrence, actor sketches)';
+COMMENT ON COLUMN mechanism_daily_stats.actor_sketch IS 'Count-Min sketch of actor subjects (mergeable across days)';
+COMMENT ON COLUMN mechanism_daily_stats.actor_heavy_hitters IS 'Space-Saving top-k actor subjects';
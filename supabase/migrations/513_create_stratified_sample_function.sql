@@ -0,0 +1,69 @@
+-- Migration 513: Time-stratified, mechanism-balanced perception sampling
+-- Purpose: 세계관 진화 사이클이 최신 N개 대신 window 전체를 대표하는 샘플 사용
+--          (특정 사건에 대한 하루치 게시글 폭주가 사이클을 지배하지 않도록)
+--
+-- 방식:
+--   1. 날짜 × 주 메커니즘(mechanisms[1]) 층마다 무작위 순위
+--   2. 날짜 안에서 메커니즘 순위 순으로 round-robin → 메커니즘 균형
+--   3. 모든 날짜에서 1순위, 2순위, ... 순으로 채움 → 날짜별 균등 할당
+--      (글이 적은 날의 남는 할당량은 다른 날로 자연스럽게 재분배)
+
+CREATE OR REPLACE FUNCTION sample_perceptions_stratified(
+    sample_size INTEGER DEFAULT 200,
+    days_window INTEGER DEFAULT 90,
+    seed DOUBLE PRECISION DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    content_id UUID,
+    mechanisms TEXT[],
+    actor JSONB,
+    logic_chain TEXT[],
+    consistency_pattern TEXT,
+    deep_beliefs TEXT[],
+    implicit_assumptions JSONB,
+    created_at TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+    -- 같은 seed → 같은 샘플 (재현 가능한 사이클)
+    IF seed IS NOT NULL THEN
+        PERFORM setseed(seed);
+    END IF;
+
+    RETURN QUERY
+    WITH window_perceptions AS (
+        SELECT
+            lp.id, lp.content_id, lp.mechanisms, lp.actor, lp.logic_chain,
+            lp.consistency_pattern, lp.deep_beliefs, lp.implicit_assumptions, lp.created_at,
+            date_trunc('day', COALESCE(c.published_at, lp.created_at)) AS day,
+            lp.mechanisms[1] AS primary_mechanism,
+            random() AS r
+        FROM layered_perceptions lp
+        INNER JOIN contents c ON lp.content_id = c.id
+        WHERE COALESCE(lp.archived, false) = false
+          AND COALESCE(c.published_at, lp.created_at) >= NOW() - make_interval(days => days_window)
+          AND cardinality(lp.mechanisms) > 0
+    ),
+    mechanism_ranked AS (
+        SELECT wp.*,
+            row_number() OVER (PARTITION BY wp.day, wp.primary_mechanism ORDER BY wp.r) AS mechanism_rank
+        FROM window_perceptions wp
+    ),
+    day_ranked AS (
+        SELECT mr.*,
+            row_number() OVER (PARTITION BY mr.day ORDER BY mr.mechanism_rank, mr.r) AS day_rank
+        FROM mechanism_ranked mr
+    )
+    SELECT
+        dr.id, dr.content_id, dr.mechanisms, dr.actor, dr.logic_chain,
+        dr.consistency_pattern, dr.deep_beliefs, dr.implicit_assumptions, dr.created_at
+    FROM day_ranked dr
+    ORDER BY dr.day_rank, dr.r
+    LIMIT sample_size;
+END;
+$$;
+
+COMMENT ON FUNCTION sample_perceptions_stratified IS '날짜별 균등 + 날짜 안 메커니즘 균형 perception 샘플 (세계관 진화 사이클용)';
@@ -0,0 +1,60 @@
+-- Migration 514: worldviews.frame TEXT → JSONB
+-- Purpose: frame을 JSON 문자열로 저장하고 매칭/대시보드마다 다시 파싱하던 것을 제거
+--          (엔진은 WorldviewFrame으로 한 번 파싱, 대시보드는 객체를 그대로 사용)
+--
+-- 파싱 불가능한 과거 형식 ("대상=속성=결과" 텍스트)은 {"legacy_text": ...}로 보존
+
+-- Safe parse: 유효한 JSON이 아니면 NULL
+CREATE OR REPLACE FUNCTION safe_parse_jsonb(value TEXT)
+RETURNS JSONB
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+BEGIN
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$;
+
+ALTER TABLE worldviews
+ALTER COLUMN frame TYPE JSONB
+USING CASE
+    WHEN frame IS NULL OR btrim(frame) = '' THEN '{}'::jsonb
+    WHEN jsonb_typeof(safe_parse_jsonb(frame)) = 'object' THEN safe_parse_jsonb(frame)
+    ELSE jsonb_build_object('legacy_text', frame)
+END;
+
+ALTER TABLE worldviews
+ALTER COLUMN frame SET DEFAULT '{}'::jsonb;
+
+COMMENT ON COLUMN worldviews.frame IS 'Reasoning frame: {actor, core_mechanisms, logic_pattern, examples, estimated_coverage_pct}';
+
+-- search_similar_worldviews (migration 105)는 frame을 text로 반환
+CREATE OR REPLACE FUNCTION search_similar_worldviews(
+    query_embedding vector(1536),
+    similarity_threshold float DEFAULT 0.7,
+    max_results int DEFAULT 5
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    frame text,
+    core_subject text,
+    similarity float
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        w.id,
+        w.title,
+        w.frame::text,
+        w.core_subject,
+        1 - (w.worldview_embedding <=> query_embedding) AS similarity
+    FROM worldviews w
+    WHERE w.worldview_embedding IS NOT NULL
+        AND 1 - (w.worldview_embedding <=> query_embedding) >= similarity_threshold
+    ORDER BY w.worldview_embedding <=> query_embedding ASC
+    LIMIT max_results;
+END;
+$$ LANGUAGE plpgsql;
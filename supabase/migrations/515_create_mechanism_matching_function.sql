@@ -0,0 +1,193 @@
+-- Migration 515: Server-side mechanism matching for new perceptions
+-- Purpose: 10분 증분 매칭을 Python으로 perception/worldview 전체를 가져오지 않고 RPC 한 번으로 처리
+--
+-- MechanismMatcher 규칙과 동일:
+--   Actor: 세계관 Actor 키워드가 perception Actor에 포함 → 1.0, 유사어 쌍 → 0.8
+--   Mechanism: IoU
+--   가중치: 메커니즘 4개 이상 → 0.3 Actor + 0.5 Mechanism, 그 외 0.5 Actor + 0.3 Mechanism
+-- Logic 점수(20%, char n-gram TF-IDF)는 SQL에서 계산하지 않음 → 점수는 Python 점수의 하한
+
+-- ============================================================================
+-- 1. worldviews.frame에서 매칭용 컬럼 생성 (generated, GIN 인덱스 가능)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION jsonb_text_array(value JSONB)
+RETURNS TEXT[]
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(value) = 'array' THEN ARRAY(SELECT jsonb_array_elements_text(value))
+        ELSE '{}'::TEXT[]
+    END
+$$;
+
+-- WorldviewFrame.normalize_actor와 동일: dict(subject 문자열/배열) 또는 문자열
+CREATE OR REPLACE FUNCTION frame_actor_subject(frame JSONB)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE jsonb_typeof(frame->'actor')
+        WHEN 'object' THEN
+            CASE jsonb_typeof(frame->'actor'->'subject')
+                WHEN 'string' THEN frame->'actor'->>'subject'
+                WHEN 'array' THEN array_to_string(jsonb_text_array(frame->'actor'->'subject'), ', ')
+                ELSE ''
+            END
+        WHEN 'string' THEN frame->>'actor'
+        ELSE ''
+    END
+$$;
+
+-- split_actor_keywords와 동일: "중국/좌파 세력" → {중국, 좌파, 세력}
+CREATE OR REPLACE FUNCTION actor_keywords(subject TEXT)
+RETURNS TEXT[]
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT COALESCE(
+        ARRAY(
+            SELECT k FROM regexp_split_to_table(COALESCE(subject, ''), '[/()·,[:space:]]+') AS k
+            WHERE k <> ''
+        ),
+        '{}'::TEXT[]
+    )
+$$;
+
+ALTER TABLE worldviews
+ADD COLUMN IF NOT EXISTS core_mechanisms TEXT[]
+    GENERATED ALWAYS AS (jsonb_text_array(frame->'core_mechanisms')) STORED,
+ADD COLUMN IF NOT EXISTS actor_subject TEXT
+    GENERATED ALWAYS AS (frame_actor_subject(frame)) STORED,
+ADD COLUMN IF NOT EXISTS actor_keywords TEXT[]
+    GENERATED ALWAYS AS (actor_keywords(frame_actor_subject(frame))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_worldviews_core_mechanisms
+    ON worldviews USING GIN (core_mechanisms);
+
+-- layered_perceptions.mechanisms GIN 인덱스는 301에서 생성 (idx_layered_perceptions_mechanisms)
+CREATE INDEX IF NOT EXISTS idx_layered_perceptions_created
+    ON layered_perceptions(created_at DESC);
+
+-- ============================================================================
+-- 2. 매칭 함수
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION match_recent_perceptions(
+    minutes_window INTEGER DEFAULT 10,
+    min_score FLOAT DEFAULT 0.4,
+    max_links INTEGER DEFAULT 3
+)
+RETURNS TABLE (
+    perception_id UUID,
+    worldview_id UUID,
+    relevance_score FLOAT
+)
+LANGUAGE sql
+VOLATILE
+AS $$
+    WITH similar_pairs(term1, term2) AS (
+        -- worldview_index.SIMILAR_ACTOR_PAIRS
+        VALUES ('민주', '민주당'), ('좌파', '진보'), ('중국', '중국계'),
+               ('경찰', '공권력'), ('정부', '정권'), ('언론', '미디어')
+    ),
+    new_perceptions AS (
+        SELECT
+            lp.id,
+            ARRAY(SELECT DISTINCT m FROM unnest(lp.mechanisms) AS m) AS mechanisms,
+            cardinality(lp.mechanisms) AS num_mechanisms,
+            CASE jsonb_typeof(lp.actor->'subject')
+                WHEN 'string' THEN lp.actor->>'subject'
+                WHEN 'array' THEN array_to_string(jsonb_text_array(lp.actor->'subject'), ', ')
+                ELSE ''
+            END AS actor_subject
+        FROM layered_perceptions lp
+        WHERE lp.created_at >= NOW() - make_interval(mins => minutes_window)
+          AND cardinality(lp.mechanisms) > 0
+          AND COALESCE(lp.archived, false) = false
+    ),
+    active_worldviews AS (
+        SELECT w.id, w.core_mechanisms, w.actor_subject, w.actor_keywords
+        FROM worldviews w
+        WHERE COALESCE(w.archived, false) = false
+          AND (cardinality(w.core_mechanisms) > 0 OR w.actor_subject <> '')
+    ),
+    scored AS (
+        SELECT
+            p.id AS perception_id,
+            w.id AS worldview_id,
+            p.num_mechanisms,
+            -- Actor
+            CASE
+                WHEN p.actor_subject = '' OR w.actor_subject = '' THEN 0.0
+                WHEN EXISTS (
+                    SELECT 1 FROM unnest(w.actor_keywords) AS k
+                    WHERE strpos(p.actor_subject, k) > 0
+                ) THEN 1.0
+                WHEN EXISTS (
+                    SELECT 1 FROM similar_pairs sp
+                    WHERE (strpos(p.actor_subject, sp.term1) > 0 AND strpos(w.actor_subject, sp.term2) > 0)
+                       OR (strpos(p.actor_subject, sp.term2) > 0 AND strpos(w.actor_subject, sp.term1) > 0)
+                ) THEN 0.8
+                ELSE 0.0
+            END AS actor_score,
+            -- Mechanism IoU
+            CASE
+                WHEN cardinality(w.core_mechanisms) = 0 THEN 0.0
+                ELSE (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) INTERSECT SELECT unnest(w.core_mechanisms)
+                    ) i
+                )::FLOAT / (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) UNION SELECT unnest(w.core_mechanisms)
+                    ) u
+                )
+            END AS mechanism_score
+        FROM new_perceptions p
+        -- 메커니즘 겹침(GIN &&) 또는 Actor 비교 가능한 쌍만 (나머지는 0점)
+        INNER JOIN active_worldviews w
+            ON w.core_mechanisms && p.mechanisms
+            OR (p.actor_subject <> '' AND w.actor_subject <> '')
+    ),
+    ranked AS (
+        SELECT
+            s.perception_id,
+            s.worldview_id,
+            s.total_score,
+            ROW_NUMBER() OVER (PARTITION BY s.perception_id ORDER BY s.total_score DESC, s.worldview_id) AS rank
+        FROM (
+            SELECT
+                perception_id,
+                worldview_id,
+                CASE
+                    WHEN num_mechanisms >= 4 THEN 0.3 * actor_score + 0.5 * mechanism_score
+                    ELSE 0.5 * actor_score + 0.3 * mechanism_score
+                END AS total_score
+            FROM scored
+        ) s
+        WHERE s.total_score >= min_score
+    ),
+    inserted AS (
+        INSERT INTO perception_worldview_links (perception_id, worldview_id, relevance_score)
+        SELECT r.perception_id, r.worldview_id, r.total_score
+        FROM ranked r
+        WHERE r.rank <= max_links
+        ON CONFLICT (perception_id, worldview_id) DO NOTHING
+        RETURNING perception_worldview_links.perception_id,
+                  perception_worldview_links.worldview_id,
+                  perception_worldview_links.relevance_score
+    ),
+    counted AS (
+        UPDATE worldviews w
+        SET total_perceptions = COALESCE(w.total_perceptions, 0) + c.new_links
+        FROM (SELECT i.worldview_id, COUNT(*) AS new_links FROM inserted i GROUP BY i.worldview_id) c
+        WHERE w.id = c.worldview_id
+        RETURNING w.id
+    )
+    SELECT i.perception_id, i.worldview_id, i.relevance_score FROM inserted i
+$$;
+
+COMMENT ON FUNCTION match_recent_perceptions IS 'Link perceptions created in the last N minutes to their top-3 active worldviews (actor + mechanism IoU), entirely in Postgres';
+COMMENT ON COLUMN worldviews.core_mechanisms IS 'frame->core_mechanisms as TEXT[] (generated, GIN indexed for matching)';
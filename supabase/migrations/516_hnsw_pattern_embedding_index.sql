@@ -0,0 +1,136 @@
+-- Migration 516: HNSW per-layer indexes + index-friendly find_similar_patterns
+-- Purpose: find_similar_patterns가 ivfflat 인덱스를 못 타고 전체 패턴을 순차 스캔하던 문제 수정
+--
+-- 기존 문제:
+--   - idx_patterns_embedding (ivfflat, lists=100)은 status = 'active'만 포함하는 partial index인데
+--     함수는 status IN ('active', 'fading') → 인덱스 조건을 만족하지 않아 사용 불가
+--   - 거리 조건 (<=> <= max_distance)이 WHERE에 있어 ORDER BY ... LIMIT 인덱스 스캔이 불가
+--
+-- 변경:
+--   - 레이어별 HNSW partial index (함수 조건과 정확히 같은 predicate)
+--   - 함수는 가까운 순으로 LIMIT 먼저, threshold는 그 결과에만 적용
+--   - (worldview, layer) 패턴이 적으면 (≤ 2000) btree로 후보만 읽어 정확히 비교,
+--     많으면 레이어를 리터럴로 넣은 동적 SQL → 해당 레이어 HNSW partial index 사용
+--   - HNSW는 worldview_id 필터를 스캔 후 적용하므로 세계관당 패턴이 적을 때는
+--     정확 비교가 더 빠르고 recall도 100% (scripts/_tests/benchmark_pattern_search.py)
+
+-- ============================================================================
+-- 1. Indexes
+-- ============================================================================
+
+DROP INDEX IF EXISTS idx_patterns_embedding;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_surface
+ON worldview_patterns USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'surface' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_implicit
+ON worldview_patterns USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'implicit' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_deep
+ON worldview_patterns USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'deep' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+-- ============================================================================
+-- 2. find_similar_patterns (signature/result unchanged)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION find_similar_patterns(
+    target_worldview_id UUID,
+    target_layer TEXT,
+    target_embedding vector(768),
+    max_distance FLOAT DEFAULT 0.3,
+    limit_count INT DEFAULT 10
+)
+RETURNS TABLE (
+    id UUID,
+    worldview_id UUID,
+    layer TEXT,
+    text TEXT,
+    strength FLOAT,
+    status TEXT,
+    appearance_count INT,
+    last_seen TIMESTAMP,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+-- HNSW 스캔 후 worldview_id 필터 → 후보를 넉넉히 (기본 40)
+SET hnsw.ef_search = 200
+AS $$
+DECLARE
+    -- 이 이하면 (worldview, layer) 패턴 전체를 정확히 비교하는 쪽이 HNSW + 필터보다 빠르고 정확
+    exact_scan_limit CONSTANT INT := 2000;
+    candidate_count INT;
+BEGIN
+    IF target_layer NOT IN ('surface', 'implicit', 'deep') THEN
+        RETURN;
+    END IF;
+
+    -- idx_patterns_worldview_layer (worldview_id, layer, status) 범위 스캔
+    SELECT COUNT(*) INTO candidate_count
+    FROM worldview_patterns wp
+    WHERE wp.worldview_id = target_worldview_id
+        AND wp.layer = target_layer
+        AND wp.status IN ('active', 'fading');
+
+    IF candidate_count <= exact_scan_limit THEN
+        -- 정확한 top-k: btree로 후보만 읽고 거리 정렬 (OFFSET 0 → HNSW 정렬 스캔 방지)
+        RETURN QUERY
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT scanned.*
+            FROM (
+                SELECT
+                    wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                    wp.status, wp.appearance_count, wp.last_seen,
+                    wp.embedding <=> target_embedding AS distance
+                FROM worldview_patterns wp
+                WHERE wp.worldview_id = target_worldview_id
+                    AND wp.layer = target_layer
+                    AND wp.status IN ('active', 'fading')
+                    AND wp.embedding IS NOT NULL
+                OFFSET 0
+            ) scanned
+            ORDER BY scanned.distance
+            LIMIT limit_count
+        ) nearest
+        WHERE nearest.distance <= max_distance
+        ORDER BY nearest.distance;
+        RETURN;
+    END IF;
+
+    -- 큰 세계관: 레이어 리터럴 → 해당 레이어 HNSW partial index로 ORDER BY ... LIMIT
+    RETURN QUERY EXECUTE format($query$
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT
+                wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                wp.status, wp.appearance_count, wp.last_seen,
+                wp.embedding <=> $1 AS distance
+            FROM worldview_patterns wp
+            WHERE wp.layer = %L
+                AND wp.status IN ('active', 'fading')
+                AND wp.embedding IS NOT NULL
+                AND wp.worldview_id = $2
+            ORDER BY wp.embedding <=> $1
+            LIMIT $3
+        ) nearest
+        WHERE nearest.distance <= $4
+        ORDER BY nearest.distance
+    $query$, target_layer)
+    USING target_embedding, target_worldview_id, limit_count, max_distance;
+END;
+$$;
+
+COMMENT ON FUNCTION find_similar_patterns IS 'Nearest patterns (ORDER BY distance LIMIT k, then max_distance): exact scan for small worldview/layer sets, per-layer HNSW partial index otherwise (768-dim)';
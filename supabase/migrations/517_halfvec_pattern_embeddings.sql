@@ -0,0 +1,146 @@
+-- Migration 517: Half-precision pattern embeddings (pgvector halfvec)
+-- Purpose: worldview_patterns.embedding을 float32 vector(768) → float16 halfvec(768)로 저장
+--
+-- 효과:
+--   - 행당 임베딩 3KB → 1.5KB, HNSW 인덱스 크기도 약 절반
+--   - 768차원 문장 임베딩의 코사인 거리 오차는 ~1e-3 수준 → 레이어 threshold(0.60~0.85)에 영향 없음
+--
+-- 요구사항: pgvector 0.7.0+ (Supabase: ALTER EXTENSION vector UPDATE;)
+--
+-- find_similar_patterns의 시그니처는 그대로 (target_embedding vector(768)) → 함수 안에서 halfvec으로 변환
+-- PatternManager는 임베딩을 기본 조회 컬럼에서 제외 (PATTERN_COLUMNS)
+
+-- ============================================================================
+-- 1. Column: vector(768) → halfvec(768)
+-- ============================================================================
+
+-- 516 HNSW 인덱스는 vector_cosine_ops → 타입 변경 전에 삭제
+DROP INDEX IF EXISTS idx_patterns_embedding_surface;
+DROP INDEX IF EXISTS idx_patterns_embedding_implicit;
+DROP INDEX IF EXISTS idx_patterns_embedding_deep;
+
+ALTER TABLE worldview_patterns
+ALTER COLUMN embedding TYPE halfvec(768) USING embedding::halfvec(768);
+
+COMMENT ON COLUMN worldview_patterns.embedding IS 'Text embedding for similarity matching (sentence-transformers multilingual: 768 dimensions, float16 halfvec)';
+
+-- ============================================================================
+-- 2. Indexes (516과 같은 per-layer partial HNSW, halfvec_cosine_ops)
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_surface
+ON worldview_patterns USING hnsw (embedding halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'surface' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_implicit
+ON worldview_patterns USING hnsw (embedding halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'implicit' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_deep
+ON worldview_patterns USING hnsw (embedding halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE layer = 'deep' AND status IN ('active', 'fading') AND embedding IS NOT NULL;
+
+-- ============================================================================
+-- 3. find_similar_patterns (signature/result unchanged, halfvec 비교)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION find_similar_patterns(
+    target_worldview_id UUID,
+    target_layer TEXT,
+    target_embedding vector(768),
+    max_distance FLOAT DEFAULT 0.3,
+    limit_count INT DEFAULT 10
+)
+RETURNS TABLE (
+    id UUID,
+    worldview_id UUID,
+    layer TEXT,
+    text TEXT,
+    strength FLOAT,
+    status TEXT,
+    appearance_count INT,
+    last_seen TIMESTAMP,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+-- HNSW 스캔 후 worldview_id 필터 → 후보를 넉넉히 (기본 40)
+SET hnsw.ef_search = 200
+AS $$
+DECLARE
+    -- 이 이하면 (worldview, layer) 패턴 전체를 정확히 비교하는 쪽이 HNSW + 필터보다 빠르고 정확
+    exact_scan_limit CONSTANT INT := 2000;
+    candidate_count INT;
+    -- 컬럼과 같은 타입으로 비교해야 halfvec 인덱스 사용
+    query_embedding halfvec(768) := target_embedding::halfvec(768);
+BEGIN
+    IF target_layer NOT IN ('surface', 'implicit', 'deep') THEN
+        RETURN;
+    END IF;
+
+    -- idx_patterns_worldview_layer (worldview_id, layer, status) 범위 스캔
+    SELECT COUNT(*) INTO candidate_count
+    FROM worldview_patterns wp
+    WHERE wp.worldview_id = target_worldview_id
+        AND wp.layer = target_layer
+        AND wp.status IN ('active', 'fading');
+
+    IF candidate_count <= exact_scan_limit THEN
+        -- 정확한 top-k: btree로 후보만 읽고 거리 정렬 (OFFSET 0 → HNSW 정렬 스캔 방지)
+        RETURN QUERY
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT scanned.*
+            FROM (
+                SELECT
+                    wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                    wp.status, wp.appearance_count, wp.last_seen,
+                    wp.embedding <=> query_embedding AS distance
+                FROM worldview_patterns wp
+                WHERE wp.worldview_id = target_worldview_id
+                    AND wp.layer = target_layer
+                    AND wp.status IN ('active', 'fading')
+                    AND wp.embedding IS NOT NULL
+                OFFSET 0
+            ) scanned
+            ORDER BY scanned.distance
+            LIMIT limit_count
+        ) nearest
+        WHERE nearest.distance <= max_distance
+        ORDER BY nearest.distance;
+        RETURN;
+    END IF;
+
+    -- 큰 세계관: 레이어 리터럴 → 해당 레이어 HNSW partial index로 ORDER BY ... LIMIT
+    RETURN QUERY EXECUTE format($query$
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT
+                wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                wp.status, wp.appearance_count, wp.last_seen,
+                wp.embedding <=> $1 AS distance
+            FROM worldview_patterns wp
+            WHERE wp.layer = %L
+                AND wp.status IN ('active', 'fading')
+                AND wp.embedding IS NOT NULL
+                AND wp.worldview_id = $2
+            ORDER BY wp.embedding <=> $1
+            LIMIT $3
+        ) nearest
+        WHERE nearest.distance <= $4
+        ORDER BY nearest.distance
+    $query$, target_layer)
+    USING query_embedding, target_worldview_id, limit_count, max_distance;
+END;
+$$;
+
+COMMENT ON FUNCTION find_similar_patterns IS 'Nearest patterns (ORDER BY distance LIMIT k, then max_distance): exact scan for small worldview/layer sets, per-layer HNSW partial index otherwise (768-dim halfvec)';
@@ -0,0 +1,313 @@
+-- Migration 518: Embedding model fingerprint + dimension-safe provider switching
+-- Purpose: 임베딩 모델을 바꿀 때마다 컬럼 차원과 SQL 함수를 다시 쓰던 문제 (502/504/506) 제거
+--
+-- 변경:
+--   - embedding_models: DB에 있는 모델 fingerprint → dimension 등록부
+--     (fingerprint = engines/utils/embedding_providers.py의 provider:model:dimension)
+--   - worldview_patterns.embedding_model: 각 벡터를 만든 모델 fingerprint
+--   - embedding 컬럼은 차원 없는 halfvec → 모델마다 차원이 달라도 같은 컬럼에 저장
+--     HNSW는 모델별 partial expression index (embedding::halfvec(dim), WHERE embedding_model = ...)
+--   - embedding_next / embedding_next_model: 재임베딩 중인 새 모델 벡터 (scripts/reembed_patterns.py)
+--     → 다 채워지면 promote_pattern_embeddings()로 한 문장에 교체 (서비스 중단 없음)
+--   - find_similar_patterns: target_model 인자 추가, 같은 모델 벡터끼리만 비교 (차원 다르면 에러)
+--     재임베딩 중에는 embedding_next도 검색 → 워커를 새 모델로 먼저 바꿔도 기존 패턴과 매칭됨
+
+-- ============================================================================
+-- 1. Model registry
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS embedding_models (
+    fingerprint TEXT PRIMARY KEY,
+    dimension INT NOT NULL CHECK (dimension > 0),
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO embedding_models (fingerprint, dimension)
+VALUES ('sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768', 768)
+ON CONFLICT (fingerprint) DO NOTHING;
+
+COMMENT ON TABLE embedding_models IS 'Embedding model fingerprints present in the database and their dimensions';
+
+-- ============================================================================
+-- 2. Columns
+-- ============================================================================
+
+ALTER TABLE worldview_patterns
+ADD COLUMN IF NOT EXISTS embedding_model TEXT REFERENCES embedding_models(fingerprint),
+ADD COLUMN IF NOT EXISTS embedding_next halfvec,
+ADD COLUMN IF NOT EXISTS embedding_next_model TEXT REFERENCES embedding_models(fingerprint);
+
+UPDATE worldview_patterns
+SET embedding_model = 'sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768'
+WHERE embedding IS NOT NULL AND embedding_model IS NULL;
+
+-- 517 인덱스는 halfvec(768) 컬럼 기준 → 차원 없는 컬럼으로 바꾸기 전에 삭제
+DROP INDEX IF EXISTS idx_patterns_embedding_surface;
+DROP INDEX IF EXISTS idx_patterns_embedding_implicit;
+DROP INDEX IF EXISTS idx_patterns_embedding_deep;
+
+ALTER TABLE worldview_patterns ALTER COLUMN embedding TYPE halfvec;
+
+-- 재임베딩 진행 중인 모델 확인 (find_similar_patterns, promote_pattern_embeddings)
+CREATE INDEX IF NOT EXISTS idx_patterns_embedding_next_model
+    ON worldview_patterns(embedding_next_model)
+    WHERE embedding_next_model IS NOT NULL;
+
+COMMENT ON COLUMN worldview_patterns.embedding IS 'Text embedding for similarity matching (float16 halfvec, dimension per embedding_model)';
+COMMENT ON COLUMN worldview_patterns.embedding_model IS 'Fingerprint of the model that produced embedding (embedding_models)';
+COMMENT ON COLUMN worldview_patterns.embedding_next IS 'Re-embedding in progress: vector from embedding_next_model, swapped in by promote_pattern_embeddings()';
+
+-- ============================================================================
+-- 3. Per-model HNSW indexes (516/517과 같은 per-layer partial index)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION ensure_pattern_embedding_indexes(model TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    dim INT;
+    layer_name TEXT;
+BEGIN
+    SELECT dimension INTO dim FROM embedding_models WHERE fingerprint = model;
+    IF dim IS NULL THEN
+        RAISE EXCEPTION 'Unknown embedding model: %', model;
+    END IF;
+
+    FOREACH layer_name IN ARRAY ARRAY['surface', 'implicit', 'deep'] LOOP
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON worldview_patterns '
+            'USING hnsw ((embedding::halfvec(%s)) halfvec_cosine_ops) WITH (m = 16, ef_construction = 64) '
+            'WHERE layer = %L AND status IN (''active'', ''fading'') AND embedding_model = %L AND embedding IS NOT NULL',
+            'idx_patterns_embedding_' || layer_name || '_' || left(md5(model), 8),
+            dim, layer_name, model
+        );
+    END LOOP;
+END;
+$$;
+
+SELECT ensure_pattern_embedding_indexes('sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768');
+
+-- ============================================================================
+-- 4. find_similar_patterns (+ target_model, 기존 호출은 기본값으로 그대로 동작)
+-- ============================================================================
+
+DROP FUNCTION IF EXISTS find_similar_patterns(UUID, TEXT, vector, FLOAT, INT);
+
+CREATE OR REPLACE FUNCTION find_similar_patterns(
+    target_worldview_id UUID,
+    target_layer TEXT,
+    target_embedding halfvec,
+    max_distance FLOAT DEFAULT 0.3,
+    limit_count INT DEFAULT 10,
+    target_model TEXT DEFAULT 'sentence-transformers:paraphrase-multilingual-mpnet-base-v2:768'
+)
+RETURNS TABLE (
+    id UUID,
+    worldview_id UUID,
+    layer TEXT,
+    text TEXT,
+    strength FLOAT,
+    status TEXT,
+    appearance_count INT,
+    last_seen TIMESTAMP,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+-- HNSW 스캔 후 worldview_id 필터 → 후보를 넉넉히 (기본 40)
+SET hnsw.ef_search = 200
+AS $$
+DECLARE
+    -- 이 이하면 (worldview, layer) 패턴 전체를 정확히 비교하는 쪽이 HNSW + 필터보다 빠르고 정확
+    exact_scan_limit CONSTANT INT := 2000;
+    candidate_count INT;
+    dim INT;
+    reembedding BOOLEAN;
+BEGIN
+    IF target_layer NOT IN ('surface', 'implicit', 'deep') THEN
+        RETURN;
+    END IF;
+
+    SELECT dimension INTO dim FROM embedding_models WHERE fingerprint = target_model;
+    IF dim IS NULL THEN
+        RAISE EXCEPTION 'Unknown embedding model: %', target_model;
+    END IF;
+    IF vector_dims(target_embedding) <> dim THEN
+        RAISE EXCEPTION 'Embedding dimension mismatch: % expects %, got %', target_model, dim, vector_dims(target_embedding);
+    END IF;
+
+    -- idx_patterns_worldview_layer (worldview_id, layer, status) 범위 스캔
+    SELECT COUNT(*) INTO candidate_count
+    FROM worldview_patterns wp
+    WHERE wp.worldview_id = target_worldview_id
+        AND wp.layer = target_layer
+        AND wp.status IN ('active', 'fading');
+
+    -- 이 모델로 재임베딩 중 (embedding_next) → HNSW 인덱스에 없는 벡터가 있으므로 정확 비교
+    reembedding := EXISTS (
+        SELECT 1 FROM worldview_patterns wp WHERE wp.embedding_next_model = target_model
+    );
+
+    IF candidate_count <= exact_scan_limit OR reembedding THEN
+        -- 정확한 top-k: btree로 후보만 읽고 거리 정렬 (OFFSET 0 → HNSW 정렬 스캔 방지)
+        RETURN QUERY
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT scanned.*
+            FROM (
+                SELECT
+                    wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                    wp.status, wp.appearance_count, wp.last_seen,
+                    CASE WHEN wp.embedding_model = target_model THEN wp.embedding ELSE wp.embedding_next END
+                        <=> target_embedding AS distance
+                FROM worldview_patterns wp
+                WHERE wp.worldview_id = target_worldview_id
+                    AND wp.layer = target_layer
+                    AND wp.status IN ('active', 'fading')
+                    AND (
+                        (wp.embedding_model = target_model AND wp.embedding IS NOT NULL)
+                        OR (wp.embedding_next_model = target_model AND wp.embedding_next IS NOT NULL)
+                    )
+                OFFSET 0
+            ) scanned
+            ORDER BY scanned.distance
+            LIMIT limit_count
+        ) nearest
+        WHERE nearest.distance <= max_distance
+        ORDER BY nearest.distance;
+        RETURN;
+    END IF;
+
+    -- 큰 세계관: 레이어/모델 리터럴 + 차원 캐스트 → ensure_pattern_embedding_indexes()의 partial index
+    RETURN QUERY EXECUTE format($query$
+        SELECT
+            nearest.id, nearest.worldview_id, nearest.layer, nearest.text, nearest.strength,
+            nearest.status, nearest.appearance_count, nearest.last_seen,
+            1 - nearest.distance AS similarity
+        FROM (
+            SELECT
+                wp.id, wp.worldview_id, wp.layer, wp.text, wp.strength,
+                wp.status, wp.appearance_count, wp.last_seen,
+                (wp.embedding::halfvec(%1$s)) <=> $1::halfvec(%1$s) AS distance
+            FROM worldview_patterns wp
+            WHERE wp.layer = %2$L
+                AND wp.status IN ('active', 'fading')
+                AND wp.embedding_model = %3$L
+                AND wp.embedding IS NOT NULL
+                AND wp.worldview_id = $2
+            ORDER BY (wp.embedding::halfvec(%1$s)) <=> $1::halfvec(%1$s)
+            LIMIT $3
+        ) nearest
+        WHERE nearest.distance <= $4
+        ORDER BY nearest.distance
+    $query$, dim, target_layer, target_model)
+    USING target_embedding, target_worldview_id, limit_count, max_distance;
+END;
+$$;
+
+COMMENT ON FUNCTION find_similar_patterns IS 'Nearest patterns of the same embedding model (ORDER BY distance LIMIT k, then max_distance): exact scan for small worldview/layer sets, per-model/layer HNSW partial index otherwise';
+
+-- ============================================================================
+-- 5. Re-embedding (scripts/reembed_patterns.py)
+-- ============================================================================
+
+-- rows: [{"id": uuid, "embedding": [..]}, ...] → embedding_next에 기록
+CREATE OR REPLACE FUNCTION set_next_pattern_embeddings(rows JSONB, model TEXT)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    dim INT;
+    updated INT;
+BEGIN
+    SELECT dimension INTO dim FROM embedding_models WHERE fingerprint = model;
+    IF dim IS NULL THEN
+        RAISE EXCEPTION 'Unknown embedding model: %', model;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM jsonb_array_elements(rows) AS r
+        WHERE jsonb_array_length(r.value->'embedding') <> dim
+    ) THEN
+        RAISE EXCEPTION 'Embedding dimension mismatch: % expects %', model, dim;
+    END IF;
+
+    UPDATE worldview_patterns wp
+    SET embedding_next = ((r.value->'embedding')::TEXT)::halfvec,
+        embedding_next_model = model
+    FROM jsonb_array_elements(rows) AS r
+    WHERE wp.id = (r.value->>'id')::UUID;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+-- embedding_next → embedding (한 UPDATE 문 → 읽는 쪽은 MVCC로 이전/이후 중 하나만 봄)
+-- 이후 더 이상 쓰이지 않는 모델의 HNSW 인덱스 삭제
+CREATE OR REPLACE FUNCTION promote_pattern_embeddings(model TEXT)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    promoted INT;
+    unused TEXT;
+    layer_name TEXT;
+BEGIN
+    PERFORM ensure_pattern_embedding_indexes(model);
+
+    UPDATE worldview_patterns
+    SET embedding = embedding_next,
+        embedding_model = embedding_next_model,
+        embedding_next = NULL,
+        embedding_next_model = NULL
+    WHERE embedding_next_model = model;
+
+    GET DIAGNOSTICS promoted = ROW_COUNT;
+
+    FOR unused IN
+        SELECT em.fingerprint FROM embedding_models em
+        WHERE em.fingerprint <> model
+            AND NOT EXISTS (SELECT 1 FROM worldview_patterns wp WHERE wp.embedding_model = em.fingerprint)
+    LOOP
+        FOREACH layer_name IN ARRAY ARRAY['surface', 'implicit', 'deep'] LOOP
+            EXECUTE format('DROP INDEX IF EXISTS %I', 'idx_patterns_embedding_' || layer_name || '_' || left(md5(unused), 8));
+        END LOOP;
+    END LOOP;
+
+    RETURN promoted;
+END;
+$$;
+
+-- 재임베딩 대상: embedding도 embedding_next도 이 모델이 아닌 패턴 (id keyset)
+CREATE OR REPLACE FUNCTION pending_pattern_embeddings(model TEXT, after_id UUID DEFAULT NULL, batch_size INT DEFAULT 256)
+RETURNS TABLE (id UUID, text TEXT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT wp.id, wp.text
+    FROM worldview_patterns wp
+    WHERE wp.embedding_model IS DISTINCT FROM model
+        AND wp.embedding_next_model IS DISTINCT FROM model
+        AND (after_id IS NULL OR wp.id > after_id)
+    ORDER BY wp.id
+    LIMIT batch_size
+$$;
+
+-- 모델별 진행 상황
+CREATE OR REPLACE FUNCTION pattern_embedding_status()
+RETURNS TABLE (embedding_model TEXT, embedding_next_model TEXT, patterns BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT wp.embedding_model, wp.embedding_next_model, COUNT(*)
+    FROM worldview_patterns wp
+    GROUP BY 1, 2
+    ORDER BY 3 DESC
+$$;
+
+COMMENT ON FUNCTION promote_pattern_embeddings IS 'Swap re-embedded vectors (embedding_next) into embedding for the given model in one statement';
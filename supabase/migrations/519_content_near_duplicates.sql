@@ -0,0 +1,116 @@
+-- Migration 519: Near-duplicate contents (MinHash LSH)
+-- Purpose: 재게시/인용된 거의 같은 글마다 Claude 호출 3번 → 수집 시 중복 표시, 분석 시 원본 perception 복사
+--
+-- 변경:
+--   - contents.minhash: 정규화한 body의 MinHash 서명 (128 x uint32, INT로 저장)
+--   - contents.minhash_bands: LSH 밴드 해시 (16개) + GIN → 밴드 하나라도 같은 글이 후보
+--   - contents.duplicate_of: 원본 content (항상 원본을 가리킴, 체인 없음)
+--   - layered_perceptions.copied_from: 원본 perception에서 복사된 경우
+--   - find_near_duplicate_contents(): 후보 조회 (검증은 engines/utils/near_duplicate.py에서 서명 비교)
+--   - copy_duplicate_perceptions(): 중복 글에 원본 perception 분석 결과 복사
+
+-- ============================================================================
+-- 1. Columns
+-- ============================================================================
+
+ALTER TABLE contents
+ADD COLUMN IF NOT EXISTS minhash INT[],
+ADD COLUMN IF NOT EXISTS minhash_bands BIGINT[],
+ADD COLUMN IF NOT EXISTS duplicate_of UUID REFERENCES contents(id) ON DELETE SET NULL,
+ADD COLUMN IF NOT EXISTS duplicate_similarity FLOAT;
+
+CREATE INDEX IF NOT EXISTS idx_contents_minhash_bands
+    ON contents USING GIN (minhash_bands);
+
+CREATE INDEX IF NOT EXISTS idx_contents_duplicate_of
+    ON contents(duplicate_of)
+    WHERE duplicate_of IS NOT NULL;
+
+ALTER TABLE layered_perceptions
+ADD COLUMN IF NOT EXISTS copied_from UUID REFERENCES layered_perceptions(id) ON DELETE SET NULL;
+
+COMMENT ON COLUMN contents.minhash IS 'MinHash signature of the normalized body (uint32 values stored as INT)';
+COMMENT ON COLUMN contents.minhash_bands IS 'LSH band hashes of minhash, GIN-indexed for candidate lookup';
+COMMENT ON COLUMN contents.duplicate_of IS 'Canonical content this body near-duplicates (estimated Jaccard in duplicate_similarity)';
+COMMENT ON COLUMN layered_perceptions.copied_from IS 'Perception copied from the canonical content instead of running extraction';
+
+-- ============================================================================
+-- 2. Candidate lookup
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION find_near_duplicate_contents(
+    bands BIGINT[],
+    exclude_id UUID DEFAULT NULL,
+    limit_count INT DEFAULT 20
+)
+RETURNS TABLE (
+    id UUID,
+    duplicate_of UUID,
+    minhash INT[],
+    shared_bands INT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        c.id,
+        c.duplicate_of,
+        c.minhash,
+        (SELECT COUNT(*)::INT FROM unnest(c.minhash_bands) AS b WHERE b = ANY(bands)) AS shared_bands
+    FROM contents c
+    WHERE c.minhash_bands && bands
+        AND (exclude_id IS NULL OR c.id <> exclude_id)
+        AND COALESCE(c.archived, false) = false
+    ORDER BY shared_bands DESC, c.collected_at
+    LIMIT limit_count
+$$;
+
+-- ============================================================================
+-- 3. Perception copy (scripts/process_new_contents.py)
+-- ============================================================================
+
+-- 아직 perception이 없는 중복 글에 원본의 최신 perception 복사 → 복사된 행 반환
+-- 원본에 perception이 없으면 (아직 미분석 / 아카이브) 반환에서 빠짐 → 호출 측이 LLM으로 분석
+CREATE OR REPLACE FUNCTION copy_duplicate_perceptions(content_ids UUID[])
+RETURNS TABLE (
+    content_id UUID,
+    perception_id UUID,
+    copied_from UUID,
+    mechanisms TEXT[],
+    actor JSONB,
+    created_at TIMESTAMPTZ
+)
+LANGUAGE sql
+AS $$
+    WITH sources AS (
+        SELECT DISTINCT ON (c.id)
+            c.id AS content_id,
+            lp.id,
+            lp.explicit_claims, lp.implicit_assumptions, lp.reasoning_gaps, lp.deep_beliefs, lp.worldview_hints,
+            lp.mechanisms, lp.skipped_steps, lp.actor, lp.logic_chain, lp.consistency_pattern
+        FROM contents c
+        JOIN layered_perceptions lp ON lp.content_id = c.duplicate_of
+        WHERE c.id = ANY(content_ids)
+            AND c.duplicate_of IS NOT NULL
+            AND COALESCE(lp.archived, false) = false
+            AND NOT EXISTS (SELECT 1 FROM layered_perceptions own WHERE own.content_id = c.id)
+        ORDER BY c.id, lp.created_at DESC
+    ),
+    copied AS (
+        INSERT INTO layered_perceptions (
+            content_id, copied_from,
+            explicit_claims, implicit_assumptions, reasoning_gaps, deep_beliefs, worldview_hints,
+            mechanisms, skipped_steps, actor, logic_chain, consistency_pattern
+        )
+        SELECT
+            s.content_id, s.id,
+            s.explicit_claims, s.implicit_assumptions, s.reasoning_gaps, s.deep_beliefs, s.worldview_hints,
+            s.mechanisms, s.skipped_steps, s.actor, s.logic_chain, s.consistency_pattern
+        FROM sources s
+        RETURNING layered_perceptions.content_id, layered_perceptions.id, layered_perceptions.copied_from,
+            layered_perceptions.mechanisms, layered_perceptions.actor, layered_perceptions.created_at
+    )
+    SELECT * FROM copied
+$$;
+
+COMMENT ON FUNCTION copy_duplicate_perceptions IS 'Copy the canonical perception to near-duplicate contents that have none yet; returns the copies';
@@ -0,0 +1,19 @@
+-- Migration 520: Perception filter stats + triage result
+-- Purpose: LayeredPerceptionExtractorV2의 filter_stats (process_new_contents가 perception과 함께 insert)를 저장하고,
+--          ContentTriage가 LLM 없이 빈 perception으로 처리한 글을 구분
+--
+-- filter_stats:
+--   {"total": 5, "kept": 3, "filtered": 2}                                   -- LLM 추출
+--   {"total": 0, "kept": 0, "filtered": 0, "triage": {"reason": "model", "score": 0.03}}  -- triage로 건너뜀
+--
+-- scripts/train_triage_model.py는 triage / 복사본(copied_from) perception을 학습 라벨에서 제외
+
+ALTER TABLE layered_perceptions
+ADD COLUMN IF NOT EXISTS filter_stats JSONB;
+
+-- triage로 건너뛴 글 모니터링 (오탐 검토, 재분석 대상 조회)
+CREATE INDEX IF NOT EXISTS idx_layered_perceptions_triaged
+    ON layered_perceptions(created_at DESC)
+    WHERE filter_stats ? 'triage';
+
+COMMENT ON COLUMN layered_perceptions.filter_stats IS 'Claim filter counts from extraction; "triage" key when the post was skipped before the LLM';
@@ -0,0 +1,119 @@
+-- Migration 521: Atomic mechanism_daily_stats increments
+-- Purpose: MechanismStatsStore.record_many가 일별 행을 읽고 → Python에서 병합 → upsert 하던 방식은
+--          동시에 실행되는 extractor 워커 / process_new_contents 중복 복사 경로에서 카운트 유실
+--          → 배치의 증분(delta)만 보내고 병합은 INSERT ... ON CONFLICT DO UPDATE 한 문장에서 (행 잠금)
+
+-- ============================================================================
+-- 1. Merge helpers
+-- ============================================================================
+
+-- {"a": 1, "b": 2} + {"b": 3} → {"a": 1, "b": 5}
+CREATE OR REPLACE FUNCTION merge_jsonb_counts(a JSONB, b JSONB)
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+    FROM (
+        SELECT key, SUM(value::BIGINT) AS total
+        FROM (
+            SELECT key, value FROM jsonb_each_text(COALESCE(a, '{}'::jsonb))
+            UNION ALL
+            SELECT key, value FROM jsonb_each_text(COALESCE(b, '{}'::jsonb))
+        ) entries
+        GROUP BY key
+    ) totals
+$$;
+
+-- Count-Min sketch {"width", "depth", "table"} 원소별 합 (engines/utils/sketches.py CountMinSketch.merge)
+CREATE OR REPLACE FUNCTION merge_count_min(a JSONB, b JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+BEGIN
+    IF a IS NULL OR NOT a ? 'table' THEN
+        RETURN COALESCE(b, '{}'::jsonb);
+    END IF;
+    IF b IS NULL OR NOT b ? 'table' THEN
+        RETURN a;
+    END IF;
+    IF a->'width' <> b->'width' OR a->'depth' <> b->'depth' THEN
+        RAISE EXCEPTION 'Cannot merge Count-Min sketches with different dimensions';
+    END IF;
+
+    RETURN jsonb_build_object(
+        'width', a->'width',
+        'depth', a->'depth',
+        'table', (
+            SELECT jsonb_agg(
+                (
+                    SELECT jsonb_agg(x.v::BIGINT + y.v::BIGINT ORDER BY x.i)
+                    FROM jsonb_array_elements_text(ra.vals) WITH ORDINALITY AS x(v, i)
+                    JOIN jsonb_array_elements_text(rb.vals) WITH ORDINALITY AS y(v, i) ON x.i = y.i
+                )
+                ORDER BY ra.r
+            )
+            FROM jsonb_array_elements(a->'table') WITH ORDINALITY AS ra(vals, r)
+            JOIN jsonb_array_elements(b->'table') WITH ORDINALITY AS rb(vals, r) ON ra.r = rb.r
+        )
+    );
+END;
+$$;
+
+-- Space-Saving {"k", "counters": {item: [count, error]}} 병합 후 상위 k개 (SpaceSaving.merge)
+CREATE OR REPLACE FUNCTION merge_space_saving(a JSONB, b JSONB)
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT jsonb_build_object(
+        'k', COALESCE((b->>'k')::INT, (a->>'k')::INT, 50),
+        'counters', COALESCE(jsonb_object_agg(item, jsonb_build_array(cnt, err)), '{}'::jsonb)
+    )
+    FROM (
+        SELECT item, SUM((counter->>0)::BIGINT) AS cnt, SUM((counter->>1)::BIGINT) AS err
+        FROM (
+            SELECT key AS item, value AS counter FROM jsonb_each(COALESCE(a->'counters', '{}'::jsonb))
+            UNION ALL
+            SELECT key, value FROM jsonb_each(COALESCE(b->'counters', '{}'::jsonb))
+        ) entries
+        GROUP BY item
+        ORDER BY cnt DESC, item
+        LIMIT COALESCE((b->>'k')::INT, (a->>'k')::INT, 50)
+    ) top_k
+$$;
+
+-- ============================================================================
+-- 2. Increment RPC (engines/analyzers/mechanism_stats.py)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION increment_mechanism_daily_stats(
+    stat_day DATE,
+    add_perceptions INT,
+    add_mechanisms JSONB,
+    add_cooccurrence JSONB,
+    add_actor_sketch JSONB,
+    add_actor_heavy_hitters JSONB
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO mechanism_daily_stats AS s (
+        stat_date, perception_count, mechanism_counts, cooccurrence,
+        actor_sketch, actor_heavy_hitters, updated_at
+    )
+    VALUES (
+        stat_day, add_perceptions, add_mechanisms, add_cooccurrence,
+        add_actor_sketch, add_actor_heavy_hitters, NOW()
+    )
+    ON CONFLICT (stat_date) DO UPDATE SET
+        perception_count = s.perception_count + EXCLUDED.perception_count,
+        mechanism_counts = merge_jsonb_counts(s.mechanism_counts, EXCLUDED.mechanism_counts),
+        cooccurrence = merge_jsonb_counts(s.cooccurrence, EXCLUDED.cooccurrence),
+        actor_sketch = merge_count_min(s.actor_sketch, EXCLUDED.actor_sketch),
+        actor_heavy_hitters = merge_space_saving(s.actor_heavy_hitters, EXCLUDED.actor_heavy_hitters),
+        updated_at = NOW()
+$$;
+
+COMMENT ON FUNCTION increment_mechanism_daily_stats IS 'Add a batch delta to a day bucket in one statement (safe under concurrent writers)';
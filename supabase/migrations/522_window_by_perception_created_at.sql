@@ -0,0 +1,135 @@
+-- Migration 522: Active window by layered_perceptions.created_at everywhere
+-- Purpose: 세계관 진화 사이클의 window 기준 통일
+--          get_mechanism_statistics / sample_perceptions_stratified는 COALESCE(published_at, created_at),
+--          PerceptionClusterer.load_window와 MechanismStatsStore(mechanism_daily_stats)는 created_at 기준이라
+--          통계 / 샘플 / 클러스터가 서로 다른 perception 집합을 봄
+--          → 네 경로 모두 lp.created_at (contents join 불필요, 층화 샘플의 id가 클러스터 멤버에 포함됨)
+
+-- ============================================================================
+-- 1. get_mechanism_statistics (511)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION get_mechanism_statistics(
+    days_window INTEGER DEFAULT 90,
+    actor_limit INTEGER DEFAULT 30
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_perceptions AS (
+        SELECT lp.id, lp.mechanisms, lp.actor
+        FROM layered_perceptions lp
+        WHERE COALESCE(lp.archived, false) = false
+          AND lp.created_at >= NOW() - make_interval(days => days_window)
+          AND cardinality(lp.mechanisms) > 0
+    ),
+    perception_mechanisms AS (
+        -- 한 perception 안의 중복 메커니즘은 1회로
+        SELECT DISTINCT wp.id, m.mechanism
+        FROM window_perceptions wp, unnest(wp.mechanisms) AS m(mechanism)
+    ),
+    mechanism_counts AS (
+        SELECT mechanism, COUNT(*) AS cnt
+        FROM perception_mechanisms
+        GROUP BY mechanism
+    ),
+    actor_counts AS (
+        SELECT
+            CASE jsonb_typeof(wp.actor->'subject')
+                WHEN 'string' THEN wp.actor->>'subject'
+                WHEN 'array' THEN (
+                    SELECT string_agg(s, ', ')
+                    FROM jsonb_array_elements_text(wp.actor->'subject') AS s
+                )
+                ELSE 'Unknown'
+            END AS actor,
+            COUNT(*) AS cnt
+        FROM window_perceptions wp
+        GROUP BY 1
+    ),
+    cooccurrence AS (
+        SELECT a.mechanism AS mechanism_a, b.mechanism AS mechanism_b, COUNT(*) AS cnt
+        FROM perception_mechanisms a
+        INNER JOIN perception_mechanisms b
+            ON a.id = b.id AND a.mechanism < b.mechanism
+        GROUP BY a.mechanism, b.mechanism
+    )
+    SELECT jsonb_build_object(
+        'perception_count', (SELECT COUNT(*) FROM window_perceptions),
+        'mechanism_counts', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(mechanism, cnt) ORDER BY cnt DESC) FROM mechanism_counts),
+            '[]'::jsonb
+        ),
+        'actor_counts', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(actor, cnt) ORDER BY cnt DESC)
+             FROM (SELECT * FROM actor_counts ORDER BY cnt DESC LIMIT actor_limit) top_actors),
+            '[]'::jsonb
+        ),
+        'cooccurrence', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_array(mechanism_a, mechanism_b, cnt) ORDER BY cnt DESC) FROM cooccurrence),
+            '[]'::jsonb
+        )
+    );
+$$;
+
+-- ============================================================================
+-- 2. sample_perceptions_stratified (513)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION sample_perceptions_stratified(
+    sample_size INTEGER DEFAULT 200,
+    days_window INTEGER DEFAULT 90,
+    seed DOUBLE PRECISION DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    content_id UUID,
+    mechanisms TEXT[],
+    actor JSONB,
+    logic_chain TEXT[],
+    consistency_pattern TEXT,
+    deep_beliefs TEXT[],
+    implicit_assumptions JSONB,
+    created_at TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+    -- 같은 seed → 같은 샘플 (재현 가능한 사이클)
+    IF seed IS NOT NULL THEN
+        PERFORM setseed(seed);
+    END IF;
+
+    RETURN QUERY
+    WITH window_perceptions AS (
+        SELECT
+            lp.id, lp.content_id, lp.mechanisms, lp.actor, lp.logic_chain,
+            lp.consistency_pattern, lp.deep_beliefs, lp.implicit_assumptions, lp.created_at,
+            date_trunc('day', lp.created_at) AS day,
+            lp.mechanisms[1] AS primary_mechanism,
+            random() AS r
+        FROM layered_perceptions lp
+        WHERE COALESCE(lp.archived, false) = false
+          AND lp.created_at >= NOW() - make_interval(days => days_window)
+          AND cardinality(lp.mechanisms) > 0
+    ),
+    mechanism_ranked AS (
+        SELECT wp.*,
+            row_number() OVER (PARTITION BY wp.day, wp.primary_mechanism ORDER BY wp.r) AS mechanism_rank
+        FROM window_perceptions wp
+    ),
+    day_ranked AS (
+        SELECT mr.*,
+            row_number() OVER (PARTITION BY mr.day ORDER BY mr.mechanism_rank, mr.r) AS day_rank
+        FROM mechanism_ranked mr
+    )
+    SELECT
+        dr.id, dr.content_id, dr.mechanisms, dr.actor, dr.logic_chain,
+        dr.consistency_pattern, dr.deep_beliefs, dr.implicit_assumptions, dr.created_at
+    FROM day_ranked dr
+    ORDER BY dr.day_rank, dr.r
+    LIMIT sample_size;
+END;
+$$;
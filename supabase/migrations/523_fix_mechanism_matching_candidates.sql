@@ -0,0 +1,210 @@
+-- Migration 523: match_recent_perceptions 후보 조건 / 하위 세계관 Actor 수정 (515)
+-- Purpose:
+--   1. 515의 JOIN 조건 "메커니즘 겹침 OR (양쪽 Actor가 비어있지 않음)"은 사실상 cross join
+--      → WorldviewIndex.candidates와 같은 규칙: 메커니즘 겹침 OR Actor 키워드 포함 OR 유사어 쌍
+--         (Actor 키워드 포함은 perception Actor 부분 문자열 배열과의 GIN && 로)
+--   2. frame_actor_subject가 하위 세계관 frame {'subject', 'action', 'object'}의 subject를 무시
+--      → WorldviewFrame.from_row와 같이 actor가 비어 있으면 subject 사용
+--
+-- RPC는 Logic 점수(20%)를 계산하지 않으므로 점수는 MechanismMatcher 점수의 하한이지만,
+-- logic 없이 top-3를 고르므로 생성되는 링크가 Python 매칭의 top-3와 다를 수 있음
+
+-- ============================================================================
+-- 1. Actor subject (WorldviewFrame.normalize_actor / from_row)
+-- ============================================================================
+
+-- dict(subject 문자열/배열) 또는 문자열 → subject 문자열
+CREATE OR REPLACE FUNCTION jsonb_actor_subject(actor JSONB)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE jsonb_typeof(actor)
+        WHEN 'object' THEN
+            CASE jsonb_typeof(actor->'subject')
+                WHEN 'string' THEN actor->>'subject'
+                WHEN 'array' THEN array_to_string(jsonb_text_array(actor->'subject'), ', ')
+                ELSE ''
+            END
+        WHEN 'string' THEN actor #>> '{}'
+        ELSE ''
+    END
+$$;
+
+-- frame.get('actor') or frame.get('subject'): 비어 있는 actor는 Python에서 falsy → 하위 세계관 subject
+CREATE OR REPLACE FUNCTION frame_actor_subject(frame JSONB)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT jsonb_actor_subject(
+        CASE
+            WHEN COALESCE(frame->'actor', 'null'::jsonb) IN ('null'::jsonb, '""'::jsonb, '{}'::jsonb, '[]'::jsonb, 'false'::jsonb)
+                THEN frame->'subject'
+            ELSE frame->'actor'
+        END
+    )
+$$;
+
+-- 세계관 키워드 k가 perception Actor의 부분 문자열(k in subject)인지를 배열 겹침(&&)으로 검사하기 위한
+-- 토큰별 모든 부분 문자열 (키워드에는 구분자가 없으므로 한 토큰 안의 부분 문자열과 동치)
+CREATE OR REPLACE FUNCTION actor_substrings(subject TEXT)
+RETURNS TEXT[]
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT COALESCE(
+        ARRAY(
+            SELECT DISTINCT substr(k, s, l)
+            FROM unnest(actor_keywords(subject)) AS k,
+                 generate_series(1, char_length(k)) AS s,
+                 generate_series(1, char_length(k) - s + 1) AS l
+        ),
+        '{}'::TEXT[]
+    )
+$$;
+
+-- generated 컬럼은 UPDATE 시 다시 계산됨 → 하위 세계관 행만 갱신
+UPDATE worldviews
+SET frame = frame
+WHERE frame ? 'subject';
+
+CREATE INDEX IF NOT EXISTS idx_worldviews_actor_keywords
+    ON worldviews USING GIN (actor_keywords);
+
+-- ============================================================================
+-- 2. 매칭 함수
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION match_recent_perceptions(
+    minutes_window INTEGER DEFAULT 10,
+    min_score FLOAT DEFAULT 0.4,
+    max_links INTEGER DEFAULT 3
+)
+RETURNS TABLE (
+    perception_id UUID,
+    worldview_id UUID,
+    relevance_score FLOAT
+)
+LANGUAGE sql
+VOLATILE
+AS $$
+    WITH similar_pairs(term1, term2) AS (
+        -- worldview_index.SIMILAR_ACTOR_PAIRS
+        VALUES ('민주', '민주당'), ('좌파', '진보'), ('중국', '중국계'),
+               ('경찰', '공권력'), ('정부', '정권'), ('언론', '미디어')
+    ),
+    new_perceptions AS (
+        SELECT
+            np.*,
+            actor_substrings(np.actor_subject) AS actor_substrings,
+            -- perception Actor에 한 term이 있을 때 세계관 Actor에서 찾을 짝 term
+            ARRAY(
+                SELECT sp.term2 FROM similar_pairs sp WHERE strpos(np.actor_subject, sp.term1) > 0
+                UNION
+                SELECT sp.term1 FROM similar_pairs sp WHERE strpos(np.actor_subject, sp.term2) > 0
+            ) AS similar_terms
+        FROM (
+            SELECT
+                lp.id,
+                ARRAY(SELECT DISTINCT m FROM unnest(lp.mechanisms) AS m) AS mechanisms,
+                cardinality(lp.mechanisms) AS num_mechanisms,
+                jsonb_actor_subject(lp.actor) AS actor_subject
+            FROM layered_perceptions lp
+            WHERE lp.created_at >= NOW() - make_interval(mins => minutes_window)
+              AND cardinality(lp.mechanisms) > 0
+              AND COALESCE(lp.archived, false) = false
+        ) np
+    ),
+    active_worldviews AS (
+        SELECT w.id, w.core_mechanisms, w.actor_subject, w.actor_keywords
+        FROM worldviews w
+        WHERE COALESCE(w.archived, false) = false
+          AND (cardinality(w.core_mechanisms) > 0 OR w.actor_subject <> '')
+    ),
+    candidates AS (
+        -- WorldviewIndex.candidates: 메커니즘 / Actor 키워드 / 유사어를 공유하는 쌍만 (나머지는 threshold 미달)
+        SELECT p.id AS perception_id, w.id AS worldview_id
+        FROM new_perceptions p
+        INNER JOIN active_worldviews w ON w.core_mechanisms && p.mechanisms
+        UNION
+        SELECT p.id, w.id
+        FROM new_perceptions p
+        INNER JOIN active_worldviews w ON w.actor_keywords && p.actor_substrings
+        UNION
+        SELECT p.id, w.id
+        FROM new_perceptions p
+        CROSS JOIN LATERAL unnest(p.similar_terms) AS t(term)
+        INNER JOIN active_worldviews w ON strpos(w.actor_subject, t.term) > 0
+    ),
+    scored AS (
+        SELECT
+            p.id AS perception_id,
+            w.id AS worldview_id,
+            p.num_mechanisms,
+            -- Actor
+            CASE
+                WHEN p.actor_subject = '' OR w.actor_subject = '' THEN 0.0
+                WHEN w.actor_keywords && p.actor_substrings THEN 1.0
+                WHEN EXISTS (
+                    SELECT 1 FROM unnest(p.similar_terms) AS t
+                    WHERE strpos(w.actor_subject, t) > 0
+                ) THEN 0.8
+                ELSE 0.0
+            END AS actor_score,
+            -- Mechanism IoU
+            CASE
+                WHEN cardinality(w.core_mechanisms) = 0 THEN 0.0
+                ELSE (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) INTERSECT SELECT unnest(w.core_mechanisms)
+                    ) i
+                )::FLOAT / (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) UNION SELECT unnest(w.core_mechanisms)
+                    ) u
+                )
+            END AS mechanism_score
+        FROM candidates c
+        INNER JOIN new_perceptions p ON p.id = c.perception_id
+        INNER JOIN active_worldviews w ON w.id = c.worldview_id
+    ),
+    ranked AS (
+        SELECT
+            s.perception_id,
+            s.worldview_id,
+            s.total_score,
+            ROW_NUMBER() OVER (PARTITION BY s.perception_id ORDER BY s.total_score DESC, s.worldview_id) AS rank
+        FROM (
+            SELECT
+                perception_id,
+                worldview_id,
+                CASE
+                    WHEN num_mechanisms >= 4 THEN 0.3 * actor_score + 0.5 * mechanism_score
+                    ELSE 0.5 * actor_score + 0.3 * mechanism_score
+                END AS total_score
+            FROM scored
+        ) s
+        WHERE s.total_score >= min_score
+    ),
+    inserted AS (
+        INSERT INTO perception_worldview_links (perception_id, worldview_id, relevance_score)
+        SELECT r.perception_id, r.worldview_id, r.total_score
+        FROM ranked r
+        WHERE r.rank <= max_links
+        ON CONFLICT (perception_id, worldview_id) DO NOTHING
+        RETURNING perception_worldview_links.perception_id,
+                  perception_worldview_links.worldview_id,
+                  perception_worldview_links.relevance_score
+    ),
+    counted AS (
+        UPDATE worldviews w
+        SET total_perceptions = COALESCE(w.total_perceptions, 0) + c.new_links
+        FROM (SELECT i.worldview_id, COUNT(*) AS new_links FROM inserted i GROUP BY i.worldview_id) c
+        WHERE w.id = c.worldview_id
+        RETURNING w.id
+    )
+    SELECT i.perception_id, i.worldview_id, i.relevance_score FROM inserted i
+$$;
+
+COMMENT ON FUNCTION match_recent_perceptions IS 'Link perceptions created in the last N minutes to up to 3 active worldviews by actor + mechanism IoU (no logic term, so links can differ from MechanismMatcher top-3)';
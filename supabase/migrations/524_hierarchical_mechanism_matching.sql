@@ -0,0 +1,195 @@
+-- Migration 524: match_recent_perceptions에 세계관 계층 적용 (403 parent_worldview_id)
+-- Purpose: process_new_contents가 쓰는 RPC는 하위 세계관을 자기 frame만으로 평면 매칭했지만
+--          MechanismMatcher(WorldviewIndex.from_rows)는
+--            1. 하위 frame이 상위 frame을 상속 (메커니즘 합집합, Actor는 자신에게 없을 때 상위 것)
+--            2. 상위 점수가 parent_threshold 이상이거나 상위 frame이 비어 있을 때만 하위로 내려감
+--          → 같은 perception이 경로에 따라 다른 링크를 받음. RPC도 같은 상속 / 게이트 적용
+--
+-- 상위가 보관되었거나 상위 자신이 하위 세계관이면 최상위로 취급 (from_rows와 동일)
+-- 남는 차이: RPC 점수에는 Logic(20%)이 없으므로 게이트도 logic 없는 상위 점수로 판정
+--            (Python에서 logic 덕분에 게이트를 넘는 상위의 하위 세계관은 RPC에서 매칭되지 않을 수 있음)
+
+DROP FUNCTION IF EXISTS match_recent_perceptions(INTEGER, FLOAT, INTEGER);
+
+CREATE OR REPLACE FUNCTION match_recent_perceptions(
+    minutes_window INTEGER DEFAULT 10,
+    min_score FLOAT DEFAULT 0.4,
+    max_links INTEGER DEFAULT 3,
+    parent_threshold FLOAT DEFAULT NULL
+)
+RETURNS TABLE (
+    perception_id UUID,
+    worldview_id UUID,
+    relevance_score FLOAT
+)
+LANGUAGE sql
+VOLATILE
+AS $$
+    WITH similar_pairs(term1, term2) AS (
+        -- worldview_index.SIMILAR_ACTOR_PAIRS
+        VALUES ('민주', '민주당'), ('좌파', '진보'), ('중국', '중국계'),
+               ('경찰', '공권력'), ('정부', '정권'), ('언론', '미디어')
+    ),
+    new_perceptions AS (
+        SELECT
+            np.*,
+            actor_substrings(np.actor_subject) AS actor_substrings,
+            -- perception Actor에 한 term이 있을 때 세계관 Actor에서 찾을 짝 term
+            ARRAY(
+                SELECT sp.term2 FROM similar_pairs sp WHERE strpos(np.actor_subject, sp.term1) > 0
+                UNION
+                SELECT sp.term1 FROM similar_pairs sp WHERE strpos(np.actor_subject, sp.term2) > 0
+            ) AS similar_terms
+        FROM (
+            SELECT
+                lp.id,
+                ARRAY(SELECT DISTINCT m FROM unnest(lp.mechanisms) AS m) AS mechanisms,
+                cardinality(lp.mechanisms) AS num_mechanisms,
+                jsonb_actor_subject(lp.actor) AS actor_subject
+            FROM layered_perceptions lp
+            WHERE lp.created_at >= NOW() - make_interval(mins => minutes_window)
+              AND cardinality(lp.mechanisms) > 0
+              AND COALESCE(lp.archived, false) = false
+        ) np
+    ),
+    live_worldviews AS (
+        SELECT
+            w.id, w.parent_worldview_id, w.core_mechanisms, w.actor_subject, w.actor_keywords,
+            -- WorldviewFrame.is_empty: Actor / 메커니즘 / logic_pattern 모두 없음
+            (cardinality(w.core_mechanisms) = 0 AND w.actor_subject = ''
+             AND NOT COALESCE(jsonb_typeof(w.frame->'logic_pattern') = 'object' AND w.frame->'logic_pattern' <> '{}'::jsonb, false)) AS is_empty
+        FROM worldviews w
+        WHERE COALESCE(w.archived, false) = false
+    ),
+    active_worldviews AS (
+        -- WorldviewIndex.from_rows: 살아있는 최상위 상위가 있으면 그 frame을 상속
+        SELECT
+            w.id,
+            parent.id AS parent_id,
+            COALESCE(parent.is_empty, false) AS parent_is_empty,
+            CASE WHEN parent.id IS NULL THEN w.core_mechanisms
+                 ELSE ARRAY(SELECT DISTINCT m FROM unnest(w.core_mechanisms || parent.core_mechanisms) AS m)
+            END AS core_mechanisms,
+            CASE WHEN parent.id IS NULL OR w.actor_subject <> '' THEN w.actor_subject ELSE parent.actor_subject END AS actor_subject,
+            CASE WHEN parent.id IS NULL OR w.actor_subject <> '' THEN w.actor_keywords ELSE parent.actor_keywords END AS actor_keywords
+        FROM live_worldviews w
+        LEFT JOIN live_worldviews parent
+            ON parent.id = w.parent_worldview_id
+           AND parent.parent_worldview_id IS NULL
+           AND parent.id <> w.id
+    ),
+    own_candidates AS (
+        -- WorldviewIndex.candidates (자기 frame 기준, GIN &&)
+        SELECT p.id AS perception_id, w.id AS worldview_id
+        FROM new_perceptions p
+        INNER JOIN worldviews w ON w.core_mechanisms && p.mechanisms
+        WHERE COALESCE(w.archived, false) = false
+        UNION
+        SELECT p.id, w.id
+        FROM new_perceptions p
+        INNER JOIN worldviews w ON w.actor_keywords && p.actor_substrings
+        WHERE COALESCE(w.archived, false) = false
+        UNION
+        SELECT p.id, w.id
+        FROM new_perceptions p
+        CROSS JOIN LATERAL unnest(p.similar_terms) AS t(term)
+        INNER JOIN worldviews w ON strpos(w.actor_subject, t.term) > 0
+        WHERE COALESCE(w.archived, false) = false
+    ),
+    candidates AS (
+        -- 상속된 메커니즘 / Actor는 상위 frame에서 온 것 → 상위가 후보면 하위도 후보
+        SELECT oc.perception_id, oc.worldview_id FROM own_candidates oc
+        UNION
+        SELECT oc.perception_id, child.id
+        FROM own_candidates oc
+        INNER JOIN active_worldviews child ON child.parent_id = oc.worldview_id
+    ),
+    scored AS (
+        SELECT
+            p.id AS perception_id,
+            w.id AS worldview_id,
+            w.parent_id,
+            w.parent_is_empty,
+            p.num_mechanisms,
+            -- Actor
+            CASE
+                WHEN p.actor_subject = '' OR w.actor_subject = '' THEN 0.0
+                WHEN w.actor_keywords && p.actor_substrings THEN 1.0
+                WHEN EXISTS (
+                    SELECT 1 FROM unnest(p.similar_terms) AS t
+                    WHERE strpos(w.actor_subject, t) > 0
+                ) THEN 0.8
+                ELSE 0.0
+            END AS actor_score,
+            -- Mechanism IoU
+            CASE
+                WHEN cardinality(w.core_mechanisms) = 0 THEN 0.0
+                ELSE (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) INTERSECT SELECT unnest(w.core_mechanisms)
+                    ) i
+                )::FLOAT / (
+                    SELECT COUNT(*) FROM (
+                        SELECT unnest(p.mechanisms) UNION SELECT unnest(w.core_mechanisms)
+                    ) u
+                )
+            END AS mechanism_score
+        FROM candidates c
+        INNER JOIN new_perceptions p ON p.id = c.perception_id
+        INNER JOIN active_worldviews w ON w.id = c.worldview_id
+    ),
+    totals AS (
+        SELECT
+            s.perception_id,
+            s.worldview_id,
+            s.parent_id,
+            s.parent_is_empty,
+            CASE
+                WHEN s.num_mechanisms >= 4 THEN 0.3 * s.actor_score + 0.5 * s.mechanism_score
+                ELSE 0.5 * s.actor_score + 0.3 * s.mechanism_score
+            END AS total_score
+        FROM scored s
+    ),
+    gated AS (
+        -- MechanismMatcher._find_matches: 상위 점수 ≥ parent_threshold (기본: min_score) 또는 빈 상위 frame일 때만 하위
+        SELECT t.*
+        FROM totals t
+        WHERE t.parent_id IS NULL
+           OR t.parent_is_empty
+           OR EXISTS (
+               SELECT 1 FROM totals pt
+               WHERE pt.perception_id = t.perception_id
+                 AND pt.worldview_id = t.parent_id
+                 AND pt.total_score >= COALESCE(parent_threshold, min_score)
+           )
+    ),
+    ranked AS (
+        SELECT
+            g.perception_id,
+            g.worldview_id,
+            g.total_score,
+            ROW_NUMBER() OVER (PARTITION BY g.perception_id ORDER BY g.total_score DESC, g.worldview_id) AS rank
+        FROM gated g
+        WHERE g.total_score >= min_score
+    ),
+    inserted AS (
+        INSERT INTO perception_worldview_links (perception_id, worldview_id, relevance_score)
+        SELECT r.perception_id, r.worldview_id, r.total_score
+        FROM ranked r
+        WHERE r.rank <= max_links
+        ON CONFLICT (perception_id, worldview_id) DO NOTHING
+        RETURNING perception_worldview_links.perception_id,
+                  perception_worldview_links.worldview_id,
+                  perception_worldview_links.relevance_score
+    ),
+    counted AS (
+        UPDATE worldviews w
+        SET total_perceptions = COALESCE(w.total_perceptions, 0) + c.new_links
+        FROM (SELECT i.worldview_id, COUNT(*) AS new_links FROM inserted i GROUP BY i.worldview_id) c
+        WHERE w.id = c.worldview_id
+        RETURNING w.id
+    )
+    SELECT i.perception_id, i.worldview_id, i.relevance_score FROM inserted i
+$$;
+
+COMMENT ON FUNCTION match_recent_perceptions IS 'Link perceptions created in the last N minutes to up to 3 active worldviews by actor + mechanism IoU, children inheriting parent frames and gated on the parent score (no logic term, so links can differ from MechanismMatcher top-3)';